@@ -0,0 +1,45 @@
+"""
+Throughput of `load_many` / `dump_many` compared to calling `load` / `dump` per element.
+
+Usage: python -m benchmarks.bench_batch [sizes...]
+"""
+import sys
+import timeit
+from typing import List
+
+from obdictive import load, dump, load_many, dump_many
+
+from .bench_load import Child
+
+
+def make_data(records: int) -> list:
+    return [{'name': F"child{i}", 'age': i, 'pets': [{'name': F"pet{k}", 'age': k} for k in range(3)]}
+            for i in range(records)]
+
+
+def _best(func, records: int) -> float:
+    number = max(1, 10000 // records)
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or [10, 1000, 100000]
+    for records in sizes:
+        data = make_data(records)
+        objs = load_many(Child, data)
+        out = [None] * records
+        results = {
+            'load loop': _best(lambda: [load(Child, d) for d in data], records),
+            'load(List)': _best(lambda: load(List[Child], data), records),
+            'load_many': _best(lambda: load_many(Child, data), records),
+            'load_many(out)': _best(lambda: load_many(Child, data, out=out), records),
+            'dump loop': _best(lambda: [dump(o) for o in objs], records),
+            'dump_many': _best(lambda: dump_many(objs), records),
+            'dump_many(out)': _best(lambda: dump_many(objs, out=out), records),
+        }
+        for name, best in results.items():
+            print(F"{name:<15} records={records:<7} {records / best:>12,.0f} records/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Size and speed of the binary format, compared to JSON.
+
+Usage: python -m benchmarks.bench_binary [records]
+"""
+import sys
+import timeit
+from typing import List
+
+from obdictive import Obdictive, load, json_dumps, json_loads, binary_dumps, binary_loads
+
+
+class Pet(Obdictive):
+    name: str
+    age: int
+    weight: float
+
+
+class Child(Obdictive):
+    name: str
+    age: int
+    pets: List[Pet]
+
+
+class Family(Obdictive):
+    name: str
+    children: List[Child]
+
+
+def make_data(records: int) -> list:
+    return [{'name': F"family{i}",
+             'children': [{'name': F"child{j}", 'age': j,
+                           'pets': [{'name': F"pet{k}", 'age': k, 'weight': k * 1.5} for k in range(3)]}
+                          for j in range(3)]}
+            for i in range(records)]
+
+
+def _best(func) -> float:
+    return min(timeit.repeat(func, number=1, repeat=5))
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    families = load(List[Family], make_data(records))
+    text = json_dumps(families)
+    data = binary_dumps(families, List[Family])
+    results = [
+        ('json', len(text.encode()), _best(lambda: json_dumps(families)),
+         _best(lambda: json_loads(List[Family], text))),
+        ('binary', len(data), _best(lambda: binary_dumps(families, List[Family])),
+         _best(lambda: binary_loads(List[Family], data))),
+    ]
+    for name, size, dumps_time, loads_time in results:
+        print(F"{name:<6} records={records} size={size}B dumps={dumps_time * 1e3:.2f}ms loads={loads_time * 1e3:.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Cost of converting records to columns, compared to building the columns from `dump`.
+
+Usage: python -m benchmarks.bench_columns [records]
+"""
+import sys
+import timeit
+from typing import List
+
+from obdictive import Obdictive, load, dump, to_columns, from_columns
+
+
+class Pet(Obdictive):
+    name: str
+    age: int
+    weight: float
+
+
+class Child(Obdictive):
+    name: str
+    age: int
+    pet: Pet
+
+
+def make_data(records: int) -> list:
+    return [{'name': F"child{i}", 'age': i % 18, 'pet': {'name': F"pet{i}", 'age': i % 12, 'weight': i * 0.5}}
+            for i in range(records)]
+
+
+def columns_from_dump(children: List[Child]) -> dict:
+    dicts = [dump(child) for child in children]
+    return {'name': [d['name'] for d in dicts], 'age': [d['age'] for d in dicts],
+            'pet.name': [d['pet']['name'] for d in dicts], 'pet.age': [d['pet']['age'] for d in dicts],
+            'pet.weight': [d['pet']['weight'] for d in dicts]}
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    children = load(List[Child], make_data(records))
+    columns = to_columns(children)
+    results = [
+        ('dump + columns', min(timeit.repeat(lambda: columns_from_dump(children), number=1, repeat=5))),
+        ('to_columns', min(timeit.repeat(lambda: to_columns(children), number=1, repeat=5))),
+        ('from_columns', min(timeit.repeat(lambda: from_columns(Child, columns), number=1, repeat=5))),
+    ]
+    for name, best in results:
+        print(F"{name:<15} records={records} total={best * 1e3:.2f}ms per_record={best / records * 1e6:.3f}us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Per-record cost of `load` on nested lists of models.
+
+Usage: python -m benchmarks.bench_load [records]
+"""
+import sys
+import timeit
+from typing import List
+
+from obdictive import Obdictive, load, define_generic
+
+
+class Pet(Obdictive):
+    name: str
+    age: int
+
+
+class Child(Obdictive):
+    name: str
+    age: int
+    pets: List[Pet]
+
+
+class Family(Obdictive):
+    name: str
+    children: List[Child]
+
+
+define_generic(List[Pet], list, (Pet,))
+define_generic(List[Child], list, (Child,))
+define_generic(List[Family], list, (Family,))
+
+
+def make_data(records: int) -> list:
+    return [{'name': F"family{i}",
+             'children': [{'name': F"child{j}", 'age': j,
+                           'pets': [{'name': F"pet{k}", 'age': k} for k in range(3)]}
+                          for j in range(3)]}
+            for i in range(records)]
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    data = make_data(records)
+    best = min(timeit.repeat(lambda: load(List[Family], data), number=1, repeat=5))
+    print(F"load(List[Family]) records={records} total={best * 1e3:.2f}ms per_record={best / records * 1e6:.2f}us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+Per-instance memory of `Obdictive` classes, with and without `slots=True`.
+
+Usage: python -m benchmarks.bench_memory [instances]
+"""
+import sys
+import tracemalloc
+
+from obdictive import Obdictive
+
+
+class Pet(Obdictive):
+    name: str
+    age: int
+
+
+class SlottedPet(Obdictive, slots=True):
+    name: str
+    age: int
+
+
+def measure(cls: type, instances: int) -> float:
+    """The average number of bytes allocated per instance of `cls` (excluding the field values, which are shared)."""
+    name = "Whiskers"
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    pets = [cls(name=name, age=2) for _ in range(instances)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    list_size = sys.getsizeof(pets)
+    return (after - before - list_size) / instances
+
+
+def main():
+    instances = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for cls in (Pet, SlottedPet):
+        print(F"{cls.__name__:<12} {measure(cls, instances):>8.1f} bytes/instance")
+
+
+if __name__ == '__main__':
+    main()
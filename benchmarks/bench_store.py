@@ -0,0 +1,60 @@
+"""
+Opening a record store and reading records at random, compared to loading a JSON lines file.
+
+Usage: python -m benchmarks.bench_store [records]
+"""
+import os
+import random
+import sys
+import tempfile
+import timeit
+from typing import List
+
+from obdictive import Obdictive, load, dump_lines, load_lines, RecordStore
+
+
+class Pet(Obdictive):
+    name: str
+    age: int
+
+
+class Child(Obdictive):
+    name: str
+    age: int
+    pets: List[Pet]
+
+
+def make_data(records: int) -> list:
+    return [{'name': F"child{i}", 'age': i % 18, 'pets': [{'name': F"pet{k}", 'age': k} for k in range(3)]}
+            for i in range(records)]
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    children = load(List[Child], make_data(records))
+    positions = random.Random(0).sample(range(records), 100)
+    with tempfile.TemporaryDirectory() as directory:
+        lines_path = os.path.join(directory, 'children.jsonl')
+        with open(lines_path, 'w') as f:
+            dump_lines(children, f)
+        with RecordStore(os.path.join(directory, 'children.obd'), Child) as store:
+            store.extend(children)
+
+        def read_lines():
+            with open(lines_path) as f:
+                loaded = list(load_lines(Child, f))
+            return [loaded[i] for i in positions]
+
+        def read_store():
+            with RecordStore(os.path.join(directory, 'children.obd'), Child, readonly=True) as store:
+                return [store[i] for i in positions]
+
+        assert read_lines() == read_store()
+        results = [('load_lines', min(timeit.repeat(read_lines, number=1, repeat=3))),
+                   ('RecordStore', min(timeit.repeat(read_store, number=1, repeat=3)))]
+    for name, best in results:
+        print(F"{name:<12} records={records} open + 100 random reads={best * 1e3:.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
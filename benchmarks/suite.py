@@ -0,0 +1,144 @@
+"""
+The benchmark suite: times `dump`, `load`, `json_dumps`, `json_loads` and construction on the standard workloads (see
+`workloads`), and compares the results to a baseline.
+
+Usage:
+    python -m benchmarks.suite run [--output results.json] [--sizes 1,1000,100000] [--workloads flat,deep]
+    python -m benchmarks.suite compare baseline.json results.json [--threshold 0.1]
+
+`run` stores the time per record of each (workload, size, operation) in a JSON file; use it as the baseline before a
+change, and compare it to a run after the change. `compare` lists the results that are slower than the baseline by more
+than the threshold (a fraction), and exits with status 1 if there are any.
+Pass `--sizes 1,1000,1000000` to include lists of a million records (which takes several minutes).
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+from typing import Any, Callable, Dict, List, Optional
+
+import obdictive
+from obdictive import load, dump, json_dumps, json_loads
+from obdictive.default_serializers import get_annotations
+
+from .workloads import WORKLOADS, Workload, make_data
+
+SIZES = (1, 1000, 100000)
+"""The default numbers of records."""
+
+REPEAT = 3
+"""The number of measurements of each operation, of which the fastest is kept."""
+
+DEFAULT_THRESHOLD = 0.1
+"""Slowdowns of up to 10% are considered noise."""
+
+
+def operations(workload: Workload, records: int) -> Dict[str, Callable[[], Any]]:
+    """The timed operations on `records` records of `workload`."""
+    cls = workload.cls
+    list_type = List[cls]
+    data = make_data(workload, records)
+    objs = load(list_type, data)
+    text = json_dumps(objs)
+    names = list(get_annotations(cls))
+    arguments = [{name: getattr(obj, name) for name in names} for obj in objs]
+    return {
+        'construct': lambda: [cls(**kwargs) for kwargs in arguments],
+        'dump': lambda: dump(objs),
+        'load': lambda: load(list_type, data),
+        'json_dumps': lambda: json_dumps(objs),
+        'json_loads': lambda: json_loads(list_type, text),
+    }
+
+
+def measure(func: Callable[[], Any]) -> float:
+    """The best time of `func`, in seconds. Short functions are called repeatedly, for at least 0.2 seconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=REPEAT, number=number)) / number
+
+
+def run(sizes: List[int], workloads: List[str], log: Callable[[str], None] = print) -> Dict[str, Any]:
+    """
+    Run the suite.
+
+    :return: The results: `{"meta": {...}, "results": {"<workload>/<size>/<operation>": <seconds per record>}}`.
+    """
+    results = {}
+    for name in workloads:
+        for size in sizes:
+            for operation, func in operations(WORKLOADS[name], size).items():
+                key = F"{name}/{size}/{operation}"
+                results[key] = measure(func) / size
+                log(F"{key:<32} {results[key] * 1e6:10.3f}us/record")
+    meta = {'obdictive': obdictive.__version__, 'python': platform.python_version(),
+            'implementation': platform.python_implementation(), 'machine': platform.machine()}
+    return {'meta': meta, 'results': results}
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD,
+            log: Callable[[str], None] = print) -> List[str]:
+    """
+    Compare the results of two runs.
+
+    :return: The keys of the results that are slower than the baseline by more than `threshold`.
+    """
+    if baseline['meta'] != current['meta']:
+        log(F"warning: comparing runs of different environments: {baseline['meta']} and {current['meta']}")
+    regressions = []
+    for key, before in baseline['results'].items():
+        after = current['results'].get(key)
+        if after is None:
+            continue
+        change = after / before - 1
+        flag = ''
+        if change > threshold:
+            regressions.append(key)
+            flag = 'REGRESSION'
+        elif change < -threshold:
+            flag = 'improvement'
+        log(F"{key:<32} {before * 1e6:10.3f}us {after * 1e6:10.3f}us {change:+8.1%} {flag}")
+    return regressions
+
+
+def _list(value: str) -> List[str]:
+    return [item for item in value.split(',') if item]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description=__doc__.split('\n\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help="run the suite")
+    run_parser.add_argument('--output', help="the JSON file to store the results in")
+    run_parser.add_argument('--sizes', type=_list, default=[str(size) for size in SIZES])
+    run_parser.add_argument('--workloads', type=_list, default=list(WORKLOADS))
+    compare_parser = commands.add_parser('compare', help="compare results to a baseline")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        unknown = set(args.workloads) - set(WORKLOADS)
+        if unknown:
+            parser.error(F"unknown workloads: {', '.join(sorted(unknown))}")
+        results = run([int(size) for size in args.sizes], args.workloads)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(F"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+The standard workloads of the benchmark suite (see `suite`).
+
+Each workload is a model class and a function making the serialized form of one record, which is used as-is for
+`load` and as the named arguments for construction.
+"""
+import enum
+from typing import Any, Callable, Dict, List, NamedTuple
+
+from obdictive import Obdictive, OList, ODict, OTuple, serializable, serializable_enum, serializer, deserializer, \
+    load, dump
+
+
+class Workload(NamedTuple):
+    cls: type
+    make_record: Callable[[int], Dict[str, Any]]
+    """Makes the serialized form of record number `i`."""
+
+
+class Flat(Obdictive):
+    name: str
+    age: int
+    score: float
+    active: bool
+
+
+DEPTH = 8
+"""The number of nested levels of the `deep` workload."""
+
+
+def _make_levels() -> type:
+    child = type(F"Level{DEPTH - 1}", (Obdictive,), {'__annotations__': {'value': int, 'label': str}})
+    for depth in reversed(range(DEPTH - 1)):
+        child = type(F"Level{depth}", (Obdictive,), {'__annotations__': {'value': int, 'label': str, 'child': child}})
+    return child
+
+
+Deep = _make_levels()
+
+
+def _deep_record(i: int) -> Dict[str, Any]:
+    record: Dict[str, Any] = {'value': i, 'label': F"level{DEPTH - 1}"}
+    for depth in reversed(range(DEPTH - 1)):
+        record = {'value': i + depth, 'label': F"level{depth}", 'child': record}
+    return record
+
+
+WIDTH = 48
+"""The number of fields of the `wide` workload."""
+
+_WIDE_TYPES = (int, str, float)
+
+Wide = type('Wide', (Obdictive,), {'__annotations__': {F"f{j}": _WIDE_TYPES[j % 3] for j in range(WIDTH)}})
+
+
+def _wide_record(i: int) -> Dict[str, Any]:
+    values = (i, F"value{i}", i * 0.5)
+    return {F"f{j}": values[j % 3] for j in range(WIDTH)}
+
+
+class Item(Obdictive):
+    sku: str
+    count: int
+
+
+class Special(Obdictive):
+    tags: OList[str]
+    items: OList[Item]
+    stock: ODict[str, int]
+    position: OTuple[int, int, str]
+
+
+def _special_record(i: int) -> Dict[str, Any]:
+    return {'tags': [F"tag{j}" for j in range(4)], 'items': [{'sku': F"sku{j}", 'count': j} for j in range(3)],
+            'stock': {F"sku{j}": i + j for j in range(3)}, 'position': [i, -i, 'shelf']}
+
+
+@serializable_enum
+class Color(enum.Enum):
+    RED = 'red'
+    GREEN = 'green'
+    BLUE = 'blue'
+
+
+class Paint(Obdictive):
+    name: str
+    color: Color
+    mix: List[Color]
+
+
+_COLORS = [color.value for color in Color]
+
+
+def _paint_record(i: int) -> Dict[str, Any]:
+    return {'name': F"paint{i}", 'color': _COLORS[i % 3], 'mix': _COLORS}
+
+
+@serializable
+class Money:
+    def __init__(self, amount: int, currency: str):
+        self.amount = amount
+        self.currency = currency
+
+    @serializer
+    def _serializer(self):
+        return F"{self.amount} {self.currency}"
+
+    @classmethod
+    @deserializer
+    def _deserializer(cls, value):
+        amount, currency = value.split(' ')
+        return cls(int(amount), currency)
+
+
+class Invoice(Obdictive):
+    number: int
+    total: Money
+    lines: List[Money]
+
+
+def _invoice_record(i: int) -> Dict[str, Any]:
+    return {'number': i, 'total': F"{i * 3} USD", 'lines': [F"{i} USD"] * 3}
+
+
+WORKLOADS: Dict[str, Workload] = {
+    'flat': Workload(Flat, lambda i: {'name': F"name{i}", 'age': i % 90, 'score': i * 0.25, 'active': i % 2 == 0}),
+    'deep': Workload(Deep, _deep_record),
+    'wide': Workload(Wide, _wide_record),
+    'special': Workload(Special, _special_record),
+    'enums': Workload(Paint, _paint_record),
+    'custom': Workload(Invoice, _invoice_record),
+}
+
+
+def make_data(workload: Workload, records: int) -> List[Dict[str, Any]]:
+    data = [workload.make_record(i) for i in range(records)]
+    # the canonical serialized form (e.g. tuples), as produced by `dump`
+    return [dump(obj) for obj in load(List[workload.cls], data)]
@@ -15,7 +15,14 @@ from .decorators import serializable, serializer, deserializer, serializer_for,
     SERIALIZER_MARK, DESERIALIZER_MARK
 from .special_types import OList, ODict, OTuple
 from .generics import define_generic
-from .json import json_dumps, json_loads
+from .batch import load_many, dump_many, iter_load_many, iter_dump_many
+from .tracking import invalidate
+from .patch import diff, apply_patch
+from .binary import binary_dumps, binary_loads
+from .columns import to_columns, from_columns
+from .store import RecordStore
+from .instrumentation import stats, instrumented
+from .json import json_dumps, json_loads, json_dump, json_load, json_iter_load, dump_lines, load_lines
 from . import config
 
 del obdictive_class
@@ -25,3 +32,10 @@ del deserialization
 del decorators
 del special_types
 del json
+del batch
+del tracking
+del patch
+del binary
+del columns
+del store
+del instrumentation
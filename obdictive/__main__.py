@@ -0,0 +1,48 @@
+"""
+Command line interface of the obdictive package.
+
+    python -m obdictive compile <module> [-o <output file>]
+    python -m obdictive import-report <module> [--limit <number of modules and classes>]
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m obdictive")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    compile_parser = commands.add_parser(
+        'compile', help="generate a module with the serializers and deserializers of the classes in a module")
+    compile_parser.add_argument('module', help="the module to import, e.g. `mypackage.models`")
+    compile_parser.add_argument('-o', '--output', help="the file to write to (default: standard output)")
+
+    report_parser = commands.add_parser(
+        'import-report', help="import a module, and report the time spent creating its serializable classes")
+    report_parser.add_argument('module', help="the module to import, e.g. `mypackage.models`")
+    report_parser.add_argument('--limit', type=int, default=10, help="the number of slowest modules and classes")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compile':
+        from .aot import generate
+        sys.path.insert(0, '')
+        source = generate(args.module)
+        if args.output is None:
+            sys.stdout.write(source)
+        else:
+            with open(args.output, 'w') as f:
+                f.write(source)
+
+    elif args.command == 'import-report':
+        import importlib
+        from .instrumentation import time_class_creation, class_creation_report
+        sys.path.insert(0, '')
+        with time_class_creation():
+            importlib.import_module(args.module)
+        print(class_creation_report(args.limit))
+
+
+if __name__ == '__main__':
+    main()
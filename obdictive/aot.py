@@ -0,0 +1,208 @@
+"""
+Ahead-of-time generation of serializers and deserializers.
+
+`python -m obdictive compile <module>` writes a python module with the serializers and deserializers of every
+serializable class in `<module>`. Importing the generated module registers them, so no annotations are walked and no
+code is generated at runtime. Each class is registered with a fingerprint of its annotations; if the class has changed
+since the module was generated, the dynamic (de)serializers are kept instead.
+"""
+import enum
+import hashlib
+import importlib
+import typing
+import warnings
+from functools import partial
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from . import aliases
+from .codegen import Namespace, SerializerBuilder, DeserializerBuilder, is_compilable, annotation_deserializer, \
+    annotation_serializers, annotation_deserializers, obdictive_deserializers
+from .default_serializers import get_annotations, get_defaults
+from .deserialization import set_deserializer, load
+from .obdictive_enum import enum_serializer
+from .serialization import serializers_map, set_serializer, dump
+
+
+def _type_id(typ: Any) -> str:
+    if isinstance(typ, type) and not typing.get_args(typ):
+        return F"{typ.__module__}.{typ.__qualname__}"
+    return repr(typ)
+
+
+def fingerprint(cls: type) -> str:
+    """
+    A fingerprint of everything the generated (de)serializers of `cls` depend on.
+    """
+    if issubclass(cls, enum.Enum):
+        parts = [(member.name, repr(member.value)) for member in cls]
+    else:
+        defaults = get_defaults(cls)
+        parts = [(name, _type_id(typ), name in defaults) for name, typ in get_annotations(cls).items()]
+        method = annotation_deserializer(cls)
+        # the kind of deserializer rather than the function, which the generated module replaces when imported
+        parts.append((is_compilable(cls), method is not None, method in obdictive_deserializers))
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:16]
+
+
+def register_compiled(cls: type, expected_fingerprint: str,
+                      serializer: Optional[aliases.Serializer],
+                      deserializer: Optional[aliases.Deserializer]) -> Tuple[aliases.Serializer, aliases.Deserializer]:
+    """
+    Register generated (de)serializers for `cls`, if it has not changed since they were generated.
+    Called by the generated modules.
+
+    :return: The serializer and deserializer to use for `cls` from now on.
+    """
+    if fingerprint(cls) != expected_fingerprint:
+        warnings.warn(F"{cls.__qualname__} has changed since its serializers were generated, "
+                      F"using the dynamic serializers instead")
+        return dump, partial(load, cls)
+
+    # the generated (de)serializers are annotation based like the ones they replace, so that the formats which read and
+    # write objects field by field (projection, columns, binary, diffs, lazy loading) still recognize `cls`
+    if serializer is not None:
+        if is_compilable(cls):
+            annotation_serializers.add(serializer)
+        set_serializer(cls, serializer)
+    if deserializer is not None:
+        method = annotation_deserializer(cls)
+        if method is not None:
+            annotation_deserializers.add(deserializer)
+            if method in obdictive_deserializers:
+                obdictive_deserializers.add(deserializer)
+        set_deserializer(cls, deserializer)
+    return serializer or dump, deserializer or partial(load, cls)
+
+
+def find_classes(module: ModuleType) -> List[type]:
+    """
+    The classes defined in `module` which can have their (de)serializers generated.
+    """
+    classes = []
+    for obj in vars(module).values():
+        if not isinstance(obj, type) or obj.__module__ != module.__name__ \
+                or getattr(module, obj.__qualname__, None) is not obj:
+            continue
+        if serializers_map.get(obj) is enum_serializer \
+                or is_compilable(obj) or annotation_deserializer(obj) is not None:
+            classes.append(obj)
+    return classes
+
+
+_GENERIC_ALIASES = {list: 'typing.List', dict: 'typing.Dict', tuple: 'typing.Tuple'}
+
+
+def _type_source(typ: Any, imports: Set[str]) -> str:
+    """
+    A python expression evaluating to `typ`.
+
+    :raises TypeError: If `typ` cannot be referenced from another module.
+    """
+    from .special_types import OList, ODict, OTuple
+
+    if typ is Ellipsis:
+        return "..."
+
+    origin = typing.get_origin(typ)
+    if origin in _GENERIC_ALIASES:
+        imports.add("typing")
+        args = typing.get_args(typ)
+        return F"{_GENERIC_ALIASES[origin]}[{', '.join(_type_source(t, imports) for t in args)}]"
+
+    if not isinstance(typ, type):
+        raise TypeError(F"Unsupported annotation {typ!r}")
+
+    for special, params in ((OList, ('_type',)), (ODict, ('_t_key', '_t_value')), (OTuple, ('_types',))):
+        if issubclass(typ, special) and typ is not special and all(p in typ.__dict__ for p in params):
+            imports.add("obdictive")
+            args = typ._types if special is OTuple else tuple(getattr(typ, p) for p in params)
+            return F"obdictive.{special.__name__}[{', '.join(_type_source(t, imports) for t in args)}]"
+
+    if typ.__module__ == 'builtins':
+        return typ.__qualname__
+    if '<' in typ.__qualname__:
+        raise TypeError(F"{typ.__qualname__} is not importable")
+    imports.add(typ.__module__)
+    return F"{typ.__module__}.{typ.__qualname__}"
+
+
+def generate(module_name: str) -> str:
+    """
+    Generate the source of a module that registers (de)serializers for the classes in `module_name`.
+    """
+    module = importlib.import_module(module_name)
+    imports: Set[str] = {module_name}
+    namespace = Namespace()
+    functions: List[str] = []
+    registrations: List[str] = []
+    skipped: List[str] = []
+
+    classes: Dict[type, int] = {}
+    for cls in find_classes(module):
+        try:
+            for typ in get_annotations(cls).values():
+                _type_source(typ, set())
+        except TypeError as e:
+            skipped.append(F"# {cls.__qualname__}: {e}")
+            continue
+        classes[cls] = len(classes)
+
+    # generated classes call each other directly
+    for cls, i in classes.items():
+        if issubclass(cls, enum.Enum):
+            namespace.serializers[cls] = F"dump_{i}"
+            namespace.deserializers[cls] = F"load_{i}"
+        if is_compilable(cls):
+            namespace.serializers[cls] = F"dump_{i}"
+        if annotation_deserializer(cls) is not None:
+            namespace.deserializers[cls] = F"load_{i}"
+
+    for cls, i in classes.items():
+        cls_source = _type_source(cls, imports)
+        if issubclass(cls, enum.Enum):
+            functions.append(F"def dump_{i}(obj):\n    return obj.value")
+            functions.append(F"load_{i} = {namespace.name(cls)}")
+            serializer, deserializer = F"dump_{i}", F"load_{i}"
+        else:
+            serializer = deserializer = "None"
+            if is_compilable(cls):
+                functions.append(SerializerBuilder(cls, namespace).source(F"dump_{i}"))
+                serializer = F"dump_{i}"
+            if annotation_deserializer(cls) is not None:
+                functions.append(DeserializerBuilder(cls, namespace).source(F"load_{i}"))
+                deserializer = F"load_{i}"
+        registrations.append(F"{serializer}, {deserializer} = register_compiled(\n"
+                             F"    {cls_source}, {fingerprint(cls)!r}, {serializer}, {deserializer})")
+
+    names = []
+    for name, obj in namespace.objects.items():
+        if name not in ('dump', 'load', 'dump_lazy', 'config'):
+            names.append(F"{name} = {_type_source(obj, imports)}")
+    for cls, name in namespace.serializers.items():
+        if cls not in classes:
+            names.append(F"{name} = dump")
+    for cls, name in namespace.deserializers.items():
+        if cls not in classes:
+            names.append(F"{name} = partial(load, {_type_source(cls, imports)})")
+
+    lines = [
+        '"""',
+        F"Serializers and deserializers for `{module_name}`.",
+        F"Generated by `python -m obdictive compile {module_name}`, do not edit.",
+        '"""',
+        "from functools import partial",
+        "",
+        *(F"import {name}" for name in sorted(imports)),
+        "from obdictive import config, dump, load",
+        "from obdictive.aot import register_compiled",
+        "from obdictive.lazy import dump_lazy",
+        "",
+        *skipped,
+        *names,
+        "",
+    ]
+    for function in functions:
+        lines += ["", function, ""]
+    lines += ["", *registrations, ""]
+    return "\n".join(lines)
@@ -0,0 +1,246 @@
+"""
+Serialization and deserialization of batches of objects.
+
+`load_many` and `dump_many` resolve the (de)serializer once per batch (per type, for `dump_many`), instead of
+dispatching through `deserializers_map` / `serializers_map` for every element.
+With `workers=N`, the batch is split into chunks which are converted in a pool of `N` processes.
+"""
+import pickle
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional
+
+from . import aliases, config
+from .codegen import annotation_serializers, annotation_deserializer, obdictive_deserializers, compiled_serializer, \
+    get_constructor
+from .default_serializers import get_annotations, get_defaults, LAZY_FIELDS
+from .lazy import dump_lazy
+from .deserialization import get_plan, get_field_plans, deserializers_map, set_deserializer
+from .generics import generic_serializers_map, generics_map, define_generic
+from .serialization import serializers_map, dump, set_serializer
+
+DEFAULT_CHUNK_SIZE = 1000
+"""The number of elements sent to a worker process at once."""
+
+_UNDEFINED = object()
+"""An value that denotes that an attribute is not defined."""
+
+
+def load_many(cls: Any, values: Iterable[aliases.Serialized], *, out: Optional[list] = None,
+              workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list:
+    """
+    Convert each of `values` to `cls`, equivalent to `[load(cls, value) for value in values]`.
+
+    :param cls: The type of the objects.
+    :param values: The serialized values.
+    :param out: A (preallocated) list to store the results in. Its items are replaced, and it is truncated to the number
+        of results.
+    :param workers: If given, convert the values in this many worker processes (see `iter_load_many`).
+    :param chunk_size: The number of values sent to a worker process at once.
+    :return: The objects, in the order of `values` (`out` if given).
+    """
+    results = iter_load_many(cls, values, workers=workers, chunk_size=chunk_size)
+    return list(results) if out is None else _fill(out, results)
+
+
+def iter_load_many(cls: Any, values: Iterable[aliases.Serialized], *, workers: Optional[int] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Like `load_many`, but yields the objects as they are converted.
+
+    With `workers`, `values` are read in chunks of `chunk_size` and converted in a pool of `workers` processes.
+    The objects are yielded in the order of `values`, and only a few chunks per worker are in progress at a time.
+    `cls` and the values must be picklable, and `cls` must be defined in an importable module.
+    """
+    if workers is None:
+        return map(_batch_plan(cls), values)
+    return _parallel(_load_chunk, (cls,), values, workers, chunk_size)
+
+
+def dump_many(objs: Iterable[aliases.Serializable], *, out: Optional[list] = None,
+              workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list:
+    """
+    Convert each of `objs` to a dictionary, equivalent to `[dump(obj) for obj in objs]`.
+
+    :param objs: The objects, usually (but not necessarily) of the same type.
+    :param out: A (preallocated) list to store the results in. Its items are replaced, and it is truncated to the number
+        of results.
+    :param workers: If given, convert the objects in this many worker processes (see `iter_dump_many`).
+    :param chunk_size: The number of objects sent to a worker process at once.
+    :return: The serialized objects, in the order of `objs` (`out` if given).
+    """
+    results = iter_dump_many(objs, workers=workers, chunk_size=chunk_size)
+    return list(results) if out is None else _fill(out, results)
+
+
+def iter_dump_many(objs: Iterable[aliases.Serializable], *, workers: Optional[int] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[aliases.Serialized]:
+    """
+    Like `dump_many`, but yields the serialized objects as they are converted.
+
+    With `workers`, `objs` are read in chunks of `chunk_size` and converted in a pool of `workers` processes.
+    The results are yielded in the order of `objs`, and only a few chunks per worker are in progress at a time.
+    The objects must be picklable, and their classes defined in importable modules.
+    """
+    if workers is None:
+        return _serialize_all(objs)
+    return _parallel(_dump_chunk, (), objs, workers, chunk_size)
+
+
+def _serialize_all(objs: Iterable[aliases.Serializable]) -> Iterator[aliases.Serialized]:
+    last_type = None
+    method: aliases.Serializer = dump
+    for obj in objs:
+        if type(obj) is not last_type:
+            last_type = type(obj)
+            method = _batch_serializer(last_type)
+        yield method(obj)
+
+
+def _fill(out: list, values: Iterable[Any]) -> list:
+    size = len(out)
+    count = 0
+    for value in values:
+        if count < size:
+            out[count] = value
+        else:
+            out.append(value)
+        count += 1
+    del out[count:]
+    return out
+
+
+def _batch_serializer(cls: type) -> aliases.Serializer:
+    """
+    The serializer of `cls`, with its annotations resolved in advance if it is annotation based.
+    """
+    method = serializers_map.get(cls)
+    if method is None:
+        return generic_serializers_map.get(cls, dump)
+    if method not in annotation_serializers:
+        return method
+    if config.compile_serializers:
+        return compiled_serializer(cls)
+
+    names = tuple(get_annotations(cls))
+
+    def serialize(obj):
+        if getattr(obj, LAZY_FIELDS, None) is not None:
+            return dump_lazy(obj)
+        d = {}
+        for name in names:
+            value = getattr(obj, name, _UNDEFINED)
+            if value is not _UNDEFINED:
+                d[name] = dump(value)
+        return d
+
+    return serialize
+
+
+def _batch_plan(cls: Any) -> aliases.Deserializer:
+    """
+    The decoder of `cls`, with its field decoders resolved in advance if it has an annotation deserializer.
+    """
+    method = annotation_deserializer(cls)
+    if method is None or not isinstance(cls, type):
+        return get_plan(cls)
+    fields = get_field_plans(cls)
+    defaults = get_defaults(cls)
+
+    if method in obdictive_deserializers:
+        construct = get_constructor(cls)
+
+        def load_obdictive(value):
+            return construct(value, fields)
+
+        return load_obdictive
+
+    # a plain dict (the common case) is not an instance of `cls`, unless `cls` is a base of dict
+    check_dicts = issubclass(dict, cls)
+
+    def load_default(value):
+        if (check_dicts or type(value) is not dict) and isinstance(value, cls):
+            return value
+        obj = cls()
+        for name, plan in fields:
+            if name in value:
+                setattr(obj, name, plan(value[name]))
+            elif name in defaults:
+                setattr(obj, name, defaults[name])
+        return obj
+
+    return load_default
+
+
+def _parallel(func: Callable[..., list], args: tuple, items: Iterable[Any], workers: int,
+              chunk_size: int) -> Iterator[Any]:
+    """
+    Yield the results of `func(*args, chunk)` for consecutive chunks of `items`, computed in worker processes.
+    """
+    if workers < 1 or chunk_size < 1:
+        raise ValueError("workers and chunk_size must be positive")
+    it = iter(items)
+    chunks = iter(lambda: list(islice(it, chunk_size)), [])
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(_registrations(), _config())) as executor:
+        pending: Deque[Future] = deque(executor.submit(func, *args, chunk) for chunk in islice(chunks, workers * 2))
+        while pending:
+            results = pending.popleft().result()
+            for chunk in islice(chunks, 1):
+                pending.append(executor.submit(func, *args, chunk))
+            yield from results
+
+
+def _load_chunk(cls: Any, values: list) -> list:
+    return list(map(_batch_plan(cls), values))
+
+
+def _dump_chunk(objs: list) -> list:
+    return list(_serialize_all(objs))
+
+
+def _config() -> Dict[str, Any]:
+    return {name: value for name, value in vars(config).items()
+            if not name.startswith('_') and isinstance(value, (bool, int, float, str))}
+
+
+def _registrations() -> List[bytes]:
+    """
+    The registered serializers, deserializers and generics, pickled separately.
+    Registrations that cannot be pickled (e.g. of classes defined in a function) are left out.
+    """
+    entries = [(set_serializer, serializers_map), (set_deserializer, deserializers_map)]
+    registrations = []
+    for register, registered in entries:
+        for cls, method in list(registered.items()):
+            if getattr(cls, '__module__', None) == 'builtins':
+                continue
+            _add_registration(registrations, register, cls, method)
+    for instance, (generic_class, types) in list(generics_map.items()):
+        _add_registration(registrations, define_generic, instance, (generic_class, types))
+    return registrations
+
+
+def _add_registration(registrations: List[bytes], register: Callable[..., Any], cls: Any, method: Any) -> None:
+    try:
+        registrations.append(pickle.dumps((register, cls, method)))
+    except Exception:  # pickling can fail in many ways, e.g. local classes, lambdas and closures
+        pass
+
+
+def _init_worker(registrations: List[bytes], options: Dict[str, Any]) -> None:
+    """
+    Set up a worker process with the configuration and registrations of the parent process.
+    Unpickling a registration imports the modules of the class and of its hooks, which registers them as well.
+    """
+    for name, value in options.items():
+        setattr(config, name, value)
+    for registration in registrations:
+        try:
+            register, cls, method = pickle.loads(registration)
+        except Exception:  # e.g. a class defined in `__main__`, when the worker is not forked
+            continue
+        if register is define_generic:
+            define_generic(cls, *method)
+        else:
+            register(cls, method)
@@ -0,0 +1,642 @@
+"""
+A compact binary encoding of objects, driven by their annotations.
+
+`binary_dumps(obj)` writes the fields of annotation based classes by position (in the order of `get_annotations`),
+without their names: integers and lengths are varints, floats are 8 bytes and strings are UTF-8.
+Each object starts with two bitmasks (varints): the fields that are set, and the fields whose value does not match
+their annotation (e.g. `None`, or an instance of a subclass), which are written in their dumped form instead.
+Values of types with a custom serializer are written in their dumped form as well, and loaded back with `load`.
+So `binary_loads(cls, binary_dumps(obj))` gives the same result as `load(cls, dump(obj))`.
+
+The data starts with a header: `MAGIC` and a fingerprint of the schema (the annotations of the classes it contains).
+`binary_loads` refuses data written with a different schema, as the positions of the fields would not match.
+"""
+import hashlib
+import struct
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from . import deserialization, serialization
+from .codegen import _attribute
+from .default_serializers import get_annotations
+from .deserialization import load, resolve_generic
+from .generics import _list_deserializer_impl, _dict_deserializer_impl, _tuple_deserializer_impl, \
+    generic_deserializers_map
+from .obdictive_exceptions import ObdictiveSerializationException, ObdictiveDeserializationException
+from .registry import Registry, lock
+from .objects import is_object, object_constructor, identity_plans
+from .serialization import dump
+
+MAGIC = b'OBD\x01'
+"""The first bytes of the encoded data (the last one is the version of the format)."""
+
+FINGERPRINT_SIZE = 8
+"""The size of the schema fingerprint, which follows `MAGIC`."""
+
+HEADER_SIZE = len(MAGIC) + FINGERPRINT_SIZE
+
+Encoder = Callable[[Any, bytearray], None]
+"""Appends the encoding of a value to a buffer."""
+
+Decoder = Callable[[bytes, int], Tuple[Any, int]]
+"""Decodes the value starting at an index of the data, returns it and the index after it."""
+
+
+class Codec(NamedTuple):
+    """The binary encoding of a type."""
+    match: Callable[[Any], bool]
+    """Whether a value can be encoded by `encode` (otherwise, it is encoded in its dumped form)."""
+    encode: Encoder
+    decode: Decoder
+
+
+codecs: Registry[Any, Codec] = Registry()
+"""A cache of the codecs of the types encoded so far. Cleared when a serializer or a deserializer is set."""
+
+fingerprints: Registry[Any, bytes] = Registry()
+"""A cache of the schema fingerprints of the types encoded so far."""
+
+_building: Dict[Any, Codec] = {}
+"""Placeholders of the codecs being built, to support recursive classes."""
+
+_versions = (-1, -1)
+"""The versions of the registrations that `codecs` and `fingerprints` were built with."""
+
+_UNDEFINED = object()
+"""An value that denotes that an attribute is not defined."""
+
+_DOUBLE = struct.Struct('<d')
+
+# tags of the values written in their dumped form
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _LIST, _DICT = range(8)
+
+
+def binary_dumps(obj: Any, t: Any = None) -> bytes:
+    """
+    Encode `obj` in the compact binary format.
+
+    :param obj: The object.
+    :param t: The type to encode `obj` as (e.g. `List[Pet]`), `type(obj)` by default. Must be the type it is loaded as.
+    """
+    if t is None:
+        t = type(obj)
+    out = bytearray(header(t))
+    write_value(obj, t, out)
+    return bytes(out)
+
+
+def binary_loads(cls: Any, data: bytes) -> Any:
+    """
+    Decode data written by `binary_dumps` to an instance of `cls`.
+
+    :raises ObdictiveDeserializationException: If the data is corrupt, or was written with a different schema.
+    """
+    check_header(cls, data)
+    value, end = read_value(cls, data, HEADER_SIZE)
+    if end != len(data):  # a truncated string is sliced short, and detected here
+        raise ObdictiveDeserializationException(F"{'Extra' if end < len(data) else 'Truncated'} data at {end}")
+    return value
+
+
+def header(t: Any) -> bytes:
+    """The header of data of type `t`: `MAGIC` and the fingerprint of its schema."""
+    return MAGIC + get_fingerprint(t)
+
+
+def check_header(cls: Any, data: Any) -> None:
+    """
+    :raises ObdictiveDeserializationException: If `data` does not start with the header of `cls`.
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        raise ObdictiveDeserializationException("Not obdictive binary data (or of an unsupported version)")
+    if data[len(MAGIC):HEADER_SIZE] != get_fingerprint(cls):
+        raise ObdictiveDeserializationException(
+            F"The data was written with a different schema than that of {getattr(cls, '__name__', cls)}")
+
+
+def write_value(obj: Any, t: Any, out: bytearray) -> None:
+    """Append the encoding of `obj` as type `t` to `out`, without a header."""
+    codec = get_codec(t)
+    if codec.match(obj):
+        out.append(0)
+        codec.encode(obj, out)
+    else:
+        out.append(1)
+        _write_dumped(dump(obj), out)
+
+
+def read_value(cls: Any, data: Any, idx: int) -> Tuple[Any, int]:
+    """Decode the value of type `cls` written by `write_value` at index `idx` of `data`, return it and its end."""
+    try:
+        if data[idx] == 0:
+            return get_codec(cls).decode(data, idx + 1)
+        raw, end = _read_dumped(data, idx + 1)
+        return load(cls, raw), end
+    except (IndexError, UnicodeDecodeError, struct.error) as e:
+        raise ObdictiveDeserializationException("Truncated or corrupt binary data") from e
+
+
+def _check_versions() -> None:
+    global _versions
+    versions = (serialization.serializers_version, deserialization.plans_version)
+    if versions != _versions:  # the registered serializers or deserializers have changed
+        with lock:
+            codecs.clear()
+            fingerprints.clear()
+            _versions = versions
+
+
+def get_codec(t: Any) -> Codec:
+    """
+    Get the codec of type `t`, creating it on first use.
+    """
+    _check_versions()
+    try:
+        codec = codecs.get(t)
+    except TypeError:  # unhashable type annotation
+        return _build_codec(t)
+    if codec is not None:
+        return codec
+    with lock:  # codecs are built by one thread at a time, and published only once they are complete
+        codec = codecs.get(t) or _building.get(t)
+        if codec is not None:
+            return codec
+        _building[t] = Codec(lambda value: codecs[t].match(value),
+                             lambda value, out: codecs[t].encode(value, out),
+                             lambda data, idx: codecs[t].decode(data, idx))
+        try:
+            codec = _build_codec(t)
+        finally:
+            del _building[t]
+        codecs[t] = codec
+    return codec
+
+
+def get_fingerprint(t: Any) -> bytes:
+    """
+    The fingerprint of the schema of type `t`: the names and the types of its fields, recursively.
+    """
+    _check_versions()
+    try:
+        fingerprint = fingerprints.get(t)
+    except TypeError:  # unhashable type annotation
+        fingerprint = None
+    if fingerprint is None:
+        schema = repr(_schema(t, set()))
+        fingerprint = hashlib.sha1(schema.encode()).digest()[:FINGERPRINT_SIZE]
+        try:
+            fingerprints[t] = fingerprint
+        except TypeError:
+            pass
+    return fingerprint
+
+
+def _name(t: Any) -> str:
+    if isinstance(t, type):
+        return F"{t.__module__}.{t.__qualname__}"
+    return repr(t)
+
+
+def _schema(t: Any, seen: Set[Any]) -> Any:
+    generic = _generic(t)
+    if generic is not None:
+        base_cls, types = generic
+        return base_cls.__name__, tuple('...' if typ is Ellipsis else _schema(typ, seen) for typ in types)
+    if isinstance(t, type) and t in _PRIMITIVES:
+        return t.__name__
+    if is_object(t):
+        if t in seen:
+            return 'ref', _name(t)
+        seen.add(t)
+        return 'object', _name(t), tuple((name, _schema(typ, seen)) for name, typ in get_annotations(t).items())
+    return 'dumped', _name(t)
+
+
+def _generic(t: Any) -> Optional[Tuple[type, Tuple[Any, ...]]]:
+    """The generic class and the type arguments of `t`, if it is a list, tuple or dict with the default decoders."""
+    generic = resolve_generic(t)
+    if generic is None:
+        return None
+    base_cls, types = generic
+    method = generic_deserializers_map.get(base_cls)
+    if base_cls is list and method is _list_deserializer_impl and len(types) == 1:
+        return generic
+    if base_cls is dict and method is _dict_deserializer_impl and len(types) == 2:
+        return generic
+    if base_cls is tuple and method is _tuple_deserializer_impl:
+        return generic
+    return None
+
+
+def _build_codec(t: Any) -> Codec:
+    generic = _generic(t)
+    if generic is not None:
+        base_cls, types = generic
+        if base_cls is dict:
+            return _dict_codec(t, get_codec(types[0]), get_codec(types[1]))
+        if base_cls is list:
+            return _list_codec(t, get_codec(types[0]), list)
+        if len(types) == 2 and types[1] is Ellipsis:
+            return _list_codec(t, get_codec(types[0]), tuple)
+        return _tuple_codec(t, tuple(get_codec(typ) for typ in types))
+    if isinstance(t, type) and t in _PRIMITIVES:
+        return _PRIMITIVES[t]
+    if is_object(t):
+        return _object_codec(t)
+    return _dumped_codec(t)
+
+
+# varints
+
+def _write_uint(n: int, out: bytearray) -> None:
+    while n > 0x7f:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_uint(data: bytes, idx: int) -> Tuple[int, int]:
+    b = data[idx]
+    if b < 0x80:
+        return b, idx + 1
+    result = b & 0x7f
+    shift = 7
+    while True:
+        idx += 1
+        b = data[idx]
+        result |= (b & 0x7f) << shift
+        if b < 0x80:
+            return result, idx + 1
+        shift += 7
+
+
+# primitives
+
+def _write_int(value: int, out: bytearray) -> None:
+    n = value << 1 if value >= 0 else ((-value) << 1) - 1  # zigzag, for short negative numbers
+    if n < 0x80:
+        out.append(n)
+    else:
+        _write_uint(n, out)
+
+
+def _read_int(data: bytes, idx: int) -> Tuple[int, int]:
+    b = data[idx]
+    n, idx = (b, idx + 1) if b < 0x80 else _read_uint(data, idx)
+    return (n >> 1) ^ -(n & 1), idx
+
+
+def _write_bool(value: bool, out: bytearray) -> None:
+    out.append(value)
+
+
+def _read_bool(data: bytes, idx: int) -> Tuple[bool, int]:
+    return data[idx] != 0, idx + 1
+
+
+def _write_float(value: float, out: bytearray) -> None:
+    out += _DOUBLE.pack(value)
+
+
+def _read_float(data: bytes, idx: int) -> Tuple[float, int]:
+    return _DOUBLE.unpack_from(data, idx)[0], idx + 8
+
+
+def _write_str(value: str, out: bytearray) -> None:
+    encoded = value.encode()
+    n = len(encoded)
+    if n < 0x80:
+        out.append(n)
+    else:
+        _write_uint(n, out)
+    out += encoded
+
+
+def _read_str(data: bytes, idx: int) -> Tuple[str, int]:
+    n = data[idx]
+    if n < 0x80:
+        idx += 1
+    else:
+        n, idx = _read_uint(data, idx)
+    end = idx + n
+    if end > len(data):
+        raise IndexError(end)
+    return data[idx:end].decode(), end
+
+
+def _exactly(t: type) -> Callable[[Any], bool]:
+    def match(value):
+        return type(value) is t
+
+    return match
+
+
+_PRIMITIVES: Dict[Any, Codec] = {
+    int: Codec(_exactly(int), _write_int, _read_int),
+    bool: Codec(_exactly(bool), _write_bool, _read_bool),
+    float: Codec(_exactly(float), _write_float, _read_float),
+    str: Codec(_exactly(str), _write_str, _read_str),
+}
+
+
+# dumped values (of custom serializers, and values that do not match their annotation)
+
+def _write_dumped(value: Any, out: bytearray) -> None:
+    t = type(value)
+    if value is None:
+        out.append(_NONE)
+    elif t is bool:
+        out.append(_TRUE if value else _FALSE)
+    elif t is int:
+        out.append(_INT)
+        _write_int(value, out)
+    elif t is float:
+        out.append(_FLOAT)
+        _write_float(value, out)
+    elif t is str:
+        out.append(_STR)
+        _write_str(value, out)
+    elif isinstance(value, (list, tuple)):
+        out.append(_LIST)
+        _write_uint(len(value), out)
+        for item in value:
+            _write_dumped(item, out)
+    elif isinstance(value, dict):
+        out.append(_DICT)
+        _write_uint(len(value), out)
+        for key, item in value.items():
+            _write_dumped(key, out)
+            _write_dumped(item, out)
+    else:
+        raise ObdictiveSerializationException(F"Cannot encode a value of type {t.__name__}")
+
+
+def _read_dumped(data: bytes, idx: int) -> Tuple[Any, int]:
+    tag = data[idx]
+    idx += 1
+    if tag == _NONE:
+        return None, idx
+    if tag == _FALSE or tag == _TRUE:
+        return tag == _TRUE, idx
+    if tag == _INT:
+        return _read_int(data, idx)
+    if tag == _FLOAT:
+        return _read_float(data, idx)
+    if tag == _STR:
+        return _read_str(data, idx)
+    if tag == _LIST:
+        n, idx = _read_uint(data, idx)
+        items = []
+        for _ in range(n):
+            item, idx = _read_dumped(data, idx)
+            items.append(item)
+        return items, idx
+    if tag == _DICT:
+        n, idx = _read_uint(data, idx)
+        values = {}
+        for _ in range(n):
+            key, idx = _read_dumped(data, idx)
+            values[key], idx = _read_dumped(data, idx)
+        return values, idx
+    raise ObdictiveDeserializationException(F"Unknown tag {tag} at {idx - 1}")
+
+
+def _matches_all(value: Any) -> bool:
+    return True
+
+
+def _dumped_codec(t: Any) -> Codec:
+    def encode(value, out):
+        _write_dumped(dump(value), out)
+
+    def decode(data, idx):
+        raw, idx = _read_dumped(data, idx)
+        return load(t, raw), idx
+
+    return Codec(_matches_all, encode, decode)
+
+
+# containers
+# The header of a container is its length, shifted left by one. The lowest bit is set if any of its items does not
+# match its annotation, in which case all the items are written in their dumped form.
+
+def _list_codec(t: Any, item: Codec, result_type: type) -> Codec:
+    match_item, encode_item, decode_item = item
+    item_type = resolve_generic(t)[1][0]
+
+    def encode(value, out):
+        if all(map(match_item, value)):
+            _write_uint(len(value) << 1, out)
+            for x in value:
+                encode_item(x, out)
+        else:
+            _write_uint(len(value) << 1 | 1, out)
+            for x in value:
+                _write_dumped(dump(x), out)
+
+    def decode(data, idx):
+        n, idx = _read_uint(data, idx)
+        values = []
+        append = values.append
+        if n & 1:
+            for _ in range(n >> 1):
+                raw, idx = _read_dumped(data, idx)
+                append(load(item_type, raw))
+        else:
+            for _ in range(n >> 1):
+                x, idx = decode_item(data, idx)
+                append(x)
+        return (values if result_type is list else result_type(values)), idx
+
+    def match(value):
+        return isinstance(value, (list, tuple))
+
+    return Codec(match, encode, decode)
+
+
+def _tuple_codec(t: Any, items: Tuple[Codec, ...]) -> Codec:
+    types = resolve_generic(t)[1]
+
+    def encode(value, out):
+        if len(value) == len(items) and all(codec.match(x) for codec, x in zip(items, value)):
+            _write_uint(len(value) << 1, out)
+            for codec, x in zip(items, value):
+                codec.encode(x, out)
+        else:
+            _write_uint(len(value) << 1 | 1, out)
+            for x in value:
+                _write_dumped(dump(x), out)
+
+    def decode(data, idx):
+        n, idx = _read_uint(data, idx)
+        values = []
+        if n & 1:  # extra items are ignored, like `zip` does
+            for i in range(n >> 1):
+                raw, idx = _read_dumped(data, idx)
+                if i < len(types):
+                    values.append(load(types[i], raw))
+        else:
+            for codec in items:
+                x, idx = codec.decode(data, idx)
+                values.append(x)
+        return tuple(values), idx
+
+    def match(value):
+        return isinstance(value, (list, tuple))
+
+    return Codec(match, encode, decode)
+
+
+def _dict_codec(t: Any, key: Codec, item: Codec) -> Codec:
+    match_key, encode_key, decode_key = key
+    match_item, encode_item, decode_item = item
+    key_type, item_type = resolve_generic(t)[1]
+
+    def encode(value, out):
+        if all(map(match_key, value.keys())) and all(map(match_item, value.values())):
+            _write_uint(len(value) << 1, out)
+            for k, x in value.items():
+                encode_key(k, out)
+                encode_item(x, out)
+        else:
+            _write_uint(len(value) << 1 | 1, out)
+            for k, x in value.items():
+                _write_dumped(dump(k), out)
+                _write_dumped(dump(x), out)
+
+    def decode(data, idx):
+        n, idx = _read_uint(data, idx)
+        values = {}
+        if n & 1:
+            for _ in range(n >> 1):
+                k, idx = _read_dumped(data, idx)
+                raw, idx = _read_dumped(data, idx)
+                values[load(key_type, k)] = load(item_type, raw)
+        else:
+            for _ in range(n >> 1):
+                k, idx = decode_key(data, idx)
+                values[k], idx = decode_item(data, idx)
+        return values, idx
+
+    def match(value):
+        return isinstance(value, dict)
+
+    return Codec(match, encode, decode)
+
+
+# objects
+
+def _object_codec(cls: type) -> Codec:
+    annotations = get_annotations(cls)
+    fields: List[Tuple[str, Any, Codec]] = [(name, typ, get_codec(typ)) for name, typ in annotations.items()]
+    construct = object_constructor(cls)
+    plans = identity_plans(cls)
+
+    def encode(obj, out):
+        present = dumped = 0
+        values = []
+        bit = 1
+        for name, _, codec in fields:
+            value = getattr(obj, name, _UNDEFINED)
+            if value is not _UNDEFINED:
+                present |= bit
+                if not codec.match(value):
+                    dumped |= bit
+                values.append((value, codec, dumped & bit))
+            bit <<= 1
+        _write_uint(present, out)
+        _write_uint(dumped, out)
+        for value, codec, as_dumped in values:
+            if as_dumped:
+                _write_dumped(dump(value), out)
+            else:
+                codec.encode(value, out)
+
+    def decode(data, idx):
+        present, idx = _read_uint(data, idx)
+        dumped, idx = _read_uint(data, idx)
+        val = {}
+        bit = 1
+        for name, typ, codec in fields:
+            if present & bit:
+                if dumped & bit:
+                    raw, idx = _read_dumped(data, idx)
+                    val[name] = load(typ, raw)
+                else:
+                    val[name], idx = codec.decode(data, idx)
+            bit <<= 1
+        return construct(val, plans), idx
+
+    def match(value):
+        return type(value) is cls
+
+    if 0 < len(fields) < 7:  # both bitmasks are single bytes
+        encode, decode = _fast_paths(cls, fields, encode, decode, construct, plans)
+    return Codec(match, encode, decode)
+
+
+def _fast_paths(cls: type, fields: List[Tuple[str, Any, Codec]], encode: Encoder, decode: Decoder,
+                construct: Callable[[Dict[str, Any], tuple], Any], plans: tuple) -> Tuple[Encoder, Decoder]:
+    """
+    Generate the encoder and the decoder of objects whose fields are all set and all match their annotations (the
+    common case), with the fields unrolled. Other objects are passed on to `encode` and `decode`.
+    """
+    primitives = {id(codec): t for t, codec in _PRIMITIVES.items()}
+    objects: Dict[str, Any] = {'_obd_encode': encode, '_obd_decode': decode, '_obd_construct': construct,
+                               '_obd_plans': plans, '_obd_read_uint': _read_uint, '_obd_unpack': _DOUBLE.unpack_from}
+    variables = [F"v{i}" for i in range(len(fields))]
+    checks = []
+    for i, (_, _, codec) in enumerate(fields):
+        objects[F"_obd_e{i}"] = codec.encode
+        objects[F"_obd_d{i}"] = codec.decode
+        primitive = primitives.get(id(codec))
+        if primitive is not None:
+            objects[F"_obd_t{i}"] = primitive
+            checks.append(F"type(v{i}) is _obd_t{i}")
+        else:
+            objects[F"_obd_m{i}"] = codec.match
+            checks.append(F"_obd_m{i}(v{i})")
+    all_set = (1 << len(fields)) - 1
+
+    lines = ["def encode(obj, out):", "    try:"]
+    lines += [F"        v{i} = {_attribute(name)}" for i, (name, _, _) in enumerate(fields)]
+    lines += ["    except AttributeError:",
+              "        return _obd_encode(obj, out)",
+              F"    if {' and '.join(checks)}:",
+              F"        out += {bytes((all_set, 0))!r}"]
+    lines += [F"        _obd_e{i}(v{i}, out)" for i in range(len(fields))]
+    lines += ["    else:",
+              "        _obd_encode(obj, out)",
+              "",
+              "def decode(data, idx):",
+              F"    if data[idx] != {all_set} or data[idx + 1]:",
+              "        return _obd_decode(data, idx)",
+              "    idx += 2"]
+    for i, (_, _, codec) in enumerate(fields):
+        lines += _inline_read(primitives.get(id(codec)), F"v{i}", F"_obd_d{i}")
+    values = ', '.join(F"{name!r}: {variable}" for (name, _, _), variable in zip(fields, variables))
+    lines.append(F"    return _obd_construct({{{values}}}, _obd_plans), idx")
+
+    exec("\n".join(lines), objects)
+    encode, decode = objects['encode'], objects['decode']
+    encode.__qualname__ = F"{cls.__qualname__}.binary_encode"
+    decode.__qualname__ = F"{cls.__qualname__}.binary_decode"
+    return encode, decode
+
+
+def _inline_read(t: Optional[type], variable: str, decoder: str) -> List[str]:
+    """The lines of the generated decoder reading a value into `variable`, inlined for primitives."""
+    length = ["    n = data[idx]",
+              "    if n < 0x80:",
+              "        idx += 1",
+              "    else:",
+              "        n, idx = _obd_read_uint(data, idx)"]
+    if t is int:
+        return length + [F"    {variable} = (n >> 1) ^ -(n & 1)"]
+    if t is str:
+        return length + ["    end = idx + n",
+                         F"    {variable} = data[idx:end].decode()",
+                         "    idx = end"]
+    if t is float:
+        return [F"    {variable}, = _obd_unpack(data, idx)",
+                "    idx += 8"]
+    return [F"    {variable}, idx = {decoder}(data, idx)"]
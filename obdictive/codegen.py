@@ -0,0 +1,539 @@
+"""
+Generation of specialized serializers from class annotations.
+
+Instead of walking the annotations and dispatching through `serializers_map` for every field of every object,
+a function that accesses each field directly is generated (once per class) and cached.
+Enable it with `config.compile_serializers`.
+
+The same generators are used by `aot` to write the functions to a python module ahead of time.
+
+The constructors and comparison methods of `Obdictive` subclasses are generated here as well (see `generated_methods`
+and `get_constructor`).
+"""
+import keyword
+import typing
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from . import aliases, config
+from .default_serializers import _default_serializer, _default_deserializer, get_annotations, get_defaults, FROZEN, \
+    ORDER, CACHED_HASH, LAZY_FIELDS, TRACK
+from .deserialization import deserializers_map, load
+from .generics import generic_serializers_map, _list_serializer_impl
+from .lazy import dump_lazy
+from .tracking import adopt, tracked_containers
+from .registry import Registry
+from .serialization import serializers_map, compiled_serializers, echo, dump
+
+annotation_serializers: Set[Callable[..., Any]] = {_default_serializer}
+"""
+Serializers that are based solely on the class's annotations.
+Classes registered with one of these can be replaced by a generated serializer.
+"""
+
+annotation_deserializers: Set[Callable[..., Any]] = {_default_deserializer}
+"""
+Deserializers that are based solely on the class's annotations (the underlying functions of the registered methods).
+"""
+
+obdictive_deserializers: Set[Callable[..., Any]] = set()
+"""
+The annotation deserializers that construct the object by passing the values as named arguments.
+"""
+
+constructors: Registry[type, Callable[[dict, tuple], Any]] = Registry()
+"""
+A cache of the constructors used by the deserializers of `Obdictive` subclasses (see `get_constructor`).
+Cleared when annotations are reloaded.
+"""
+
+obdictive_methods: Dict[str, Callable[..., Any]] = {}
+"""
+The generic implementations of the generated `Obdictive` methods (by name), which work for any subclass.
+The generated methods fall back to them for instances of subclasses, which may have more fields.
+"""
+
+GENERATED_FOR = "_obdictive_generated_for"
+"""The attribute of generated methods that holds the class they were generated for."""
+
+obdictive_bases: Set[type] = {object}
+"""
+The classes whose methods the generated methods replace (`Obdictive` itself), as opposed to the methods of user
+classes, which are inherited.
+"""
+
+_UNSET = object()
+"""The default value of the arguments of generated constructors, denoting that an argument was not passed."""
+
+
+def compiled_serializer(cls: type) -> aliases.Serializer:
+    """
+    Get the generated serializer of `cls`, generating it on first use.
+    """
+    method = compiled_serializers.get(cls)
+    if method is None:
+        method = SerializerBuilder(cls, Namespace()).build()
+    return method
+
+
+def is_compilable(cls: Any) -> bool:
+    """
+    Whether the serializer registered for `cls` can be replaced by a generated one.
+    """
+    try:
+        return serializers_map.get(cls) in annotation_serializers
+    except TypeError:  # unhashable annotation
+        return False
+
+
+def annotation_deserializer(cls: Any) -> Any:
+    """
+    The annotation deserializer registered for `cls`, or `None` if it has a custom one.
+    """
+    try:
+        method = deserializers_map.get(cls)
+    except TypeError:  # unhashable annotation
+        return None
+    # `@serializable` registers a partial of `_default_deserializer`, and `Obdictive` a bound class method
+    method = getattr(method, 'func', None) or getattr(method, '__func__', method)
+    return method if method in annotation_deserializers else None
+
+
+def _attribute(name: str, obj: str = 'obj') -> str:
+    if name.isidentifier() and not keyword.iskeyword(name):
+        return F"{obj}.{name}"
+    return F"getattr({obj}, {name!r})"
+
+
+def _set_attribute(name: str, value: str, obj: str = 'obj') -> str:
+    if name.isidentifier() and not keyword.iskeyword(name):
+        return F"{obj}.{name} = {value}"
+    return F"setattr({obj}, {name!r}, {value})"
+
+
+def _lookup(names: Dict[type, str], typ: Any) -> Optional[str]:
+    try:
+        return names.get(typ)
+    except TypeError:  # unhashable annotation
+        return None
+
+
+class Namespace:
+    """
+    The global names used by generated functions.
+    Shared between builders when several functions are written to the same module.
+    """
+
+    def __init__(self):
+        self.objects: Dict[str, Any] = {'dump': dump, 'load': load, 'dump_lazy': dump_lazy, 'config': config}
+        self.serializers: Dict[type, str] = {}
+        self.deserializers: Dict[type, str] = {}
+        self._names: Dict[int, str] = {}
+
+    def name(self, obj: Any, prefix: str = '_t') -> str:
+        name = self._names.get(id(obj))
+        if name is None:
+            name = F"{prefix}{len(self._names)}"
+            self._names[id(obj)] = name
+            self.objects[name] = obj
+        return name
+
+
+class SerializerBuilder:
+    """
+    Generates a serializer for an annotation based class.
+    """
+
+    def __init__(self, cls: type, namespace: Namespace):
+        self.cls = cls
+        self.namespace = namespace
+
+    def _expr(self, typ: Any, var: str, depth: int) -> str:
+        """
+        A python expression serializing `var`, which is annotated as `typ`.
+        """
+        name = _lookup(self.namespace.serializers, typ)
+        if name is None and is_compilable(typ):
+            name = self.namespace.serializers.setdefault(typ, F"_dump{len(self.namespace.serializers)}")
+        if name is not None:
+            return F"{name}({var}) if type({var}) is {self.namespace.name(typ)} else dump({var})"
+
+        if isinstance(typ, type) and serializers_map.get(typ) is echo:
+            return F"{var} if type({var}) is {self.namespace.name(typ)} else dump({var})"
+
+        args = typing.get_args(typ)
+        if typing.get_origin(typ) is list and len(args) == 1 and list not in serializers_map \
+                and generic_serializers_map.get(list) is _list_serializer_impl:
+            item = F"x{depth}"
+            item_expr = self._expr(args[0], item, depth + 1)
+            if item_expr != F"dump({item})":
+                items = F"[{item_expr} for {item} in {var}]"
+                if isinstance(args[0], type) and serializers_map.get(args[0]) is echo:
+                    items = F"(dump({var}) if config.trusted_input else {items})"  # may be dumped by reference
+                return F"{items} if type({var}) is list else dump({var})"
+
+        return F"dump({var})"
+
+    def source(self, func_name: str) -> str:
+        lines: List[str] = [F"def {func_name}(obj):"]
+        if hasattr(self.cls, LAZY_FIELDS):  # may be loaded lazily
+            lines += [F"    if obj.{LAZY_FIELDS} is not None:", "        return dump_lazy(obj)"]
+        lines.append("    d = {}")
+        for name, typ in get_annotations(self.cls).items():
+            lines += [
+                "    try:",
+                F"        v = {_attribute(name)}",
+                "    except AttributeError:",
+                "        pass",
+                "    else:",
+                F"        d[{name!r}] = {self._expr(typ, 'v', 0)}",
+            ]
+        lines.append("    return d")
+        return "\n".join(lines)
+
+    def build(self) -> aliases.Serializer:
+        cls = self.cls
+        func_name = F"dump_{cls.__name__}"
+        objects = self.namespace.objects
+        exec(self.source(func_name), objects)
+        method = objects[func_name]
+        method.__qualname__ = F"{cls.__qualname__}.{func_name}"
+
+        # cache before resolving the nested serializers, to support recursive classes
+        compiled_serializers[cls] = method
+        for nested_cls, name in self.namespace.serializers.items():
+            objects[name] = compiled_serializer(nested_cls)
+        return method
+
+
+class DeserializerBuilder:
+    """
+    Generates a deserializer for a class registered with an annotation deserializer.
+    """
+
+    def __init__(self, cls: type, namespace: Namespace):
+        self.cls = cls
+        self.namespace = namespace
+
+    def _expr(self, typ: Any, var: str) -> str:
+        """
+        A python expression deserializing `var` to `typ`.
+        """
+        loader = self._loader(typ)
+        if loader is not None:
+            return F"{loader}({var})"
+
+        args = typing.get_args(typ)
+        if typing.get_origin(typ) is list and len(args) == 1:
+            loader = self._loader(args[0])
+            if loader is not None:
+                return F"list(map({loader}, {var}))"
+
+        return F"load({self.namespace.name(typ)}, {var})"
+
+    def _loader(self, typ: Any) -> Optional[str]:
+        """
+        The name of a function that deserializes directly to `typ`, if there is one.
+        """
+        name = _lookup(self.namespace.deserializers, typ)
+        if name is not None:
+            return name
+        if annotation_deserializer(typ) is not None:
+            return self.namespace.deserializers.setdefault(typ, F"_load{len(self.namespace.deserializers)}")
+        if isinstance(typ, type) and typ in (int, str, float, bool) and deserializers_map.get(typ) is typ:
+            return self.namespace.name(typ)
+        return None
+
+    def source(self, func_name: str) -> str:
+        cls_name = self.namespace.name(self.cls)
+        annotations = get_annotations(self.cls)
+        if annotation_deserializer(self.cls) in obdictive_deserializers:
+            lines = [F"def {func_name}(val):", "    kwargs = {}"]
+            for name, typ in annotations.items():
+                lines += [
+                    F"    if {name!r} in val:",
+                    F"        kwargs[{name!r}] = {self._expr(typ, F'val[{name!r}]')}",
+                ]
+            lines.append(F"    return {cls_name}(**kwargs)")
+        else:
+            lines = [
+                F"def {func_name}(val):",
+                F"    if isinstance(val, {cls_name}):",
+                "        return val",
+                F"    obj = {cls_name}()",
+            ]
+            for name, typ in annotations.items():
+                lines += [
+                    F"    if {name!r} in val:",
+                    F"        {_set_attribute(name, self._expr(typ, F'val[{name!r}]'))}",
+                ]
+                if hasattr(self.cls, name):
+                    lines += [
+                        "    else:",
+                        F"        {_set_attribute(name, _attribute(name, cls_name))}",
+                    ]
+            lines.append("    return obj")
+        return "\n".join(lines)
+
+
+def _field_names(cls: type) -> Optional[List[str]]:
+    """
+    The annotations of `cls`, if they can all be used as argument names of a generated function.
+    """
+    names = list(get_annotations(cls))
+    for name in names:
+        if not name.isidentifier() or keyword.iskeyword(name) or name == 'self' or name.startswith('_obd_'):
+            return None
+    return names
+
+
+def _assign(name: str, value: str, direct: bool, container: Optional[str] = None) -> str:
+    if container is not None:  # an `OList` / `ODict` variable of a tracked class
+        value = F"_obd_adopt({container}, {value})"
+    if direct:  # bypass the `__setattr__` that forbids assignments (frozen) or reports changes (tracked)
+        return F"_obd_set(self, {name!r}, {value})"
+    return _set_attribute(name, value, 'self')
+
+
+def _direct_assignment(cls: type, objects: Dict[str, Any]) -> Tuple[bool, Dict[str, str]]:
+    """
+    Whether the generated constructors of `cls` assign the fields with `object.__setattr__`, and the names of the
+    container types the values of tracked variables are converted to.
+    """
+    containers = {}
+    for i, (name, typ) in enumerate(tracked_containers(cls).items()):
+        objects[F"_obd_c{i}"] = typ
+        containers[name] = F"_obd_c{i}"
+    objects['_obd_adopt'] = adopt
+    return getattr(cls, FROZEN, False) or getattr(cls, TRACK, False), containers
+
+
+def _build_method(cls: type, name: str, lines: List[str], objects: Dict[str, Any]) -> Callable[..., Any]:
+    objects.update(_obd_cls=cls, _obd_set=object.__setattr__, _obd_unset=_UNSET,
+                   _obd_fallback=obdictive_methods.get(name))
+    exec("\n".join(lines), objects)
+    method = objects[name]
+    method.__qualname__ = F"{cls.__qualname__}.{name}"
+    setattr(method, GENERATED_FOR, cls)
+    return method
+
+
+def generated_methods(cls: type, lazy: bool = False) -> Dict[str, Callable[..., Any]]:
+    """
+    Generate the methods of an `Obdictive` subclass which it doesn't define itself:
+    `__init__`, `__eq__`, and depending on the class options, `__hash__` (`frozen`) and the ordering methods (`order`).
+
+    :param lazy: Return stubs that generate each method on its first call, and replace themselves with it, so that
+        defining a class does not compile methods that may never be called.
+    """
+    frozen = getattr(cls, FROZEN, False)
+    generators: Dict[str, Callable[[type], Callable[..., Any]]] = {}
+    if not _user_defined(cls, '__init__') and _field_names(cls) is not None:
+        generators['__init__'] = generated_init
+    if not _user_defined(cls, '__eq__'):
+        generators['__eq__'] = generated_eq
+    # like dataclasses, a frozen class gets a hash even if it defines `__eq__` (which sets `__hash__` to None)
+    if frozen and (not _user_defined(cls, '__hash__') or cls.__hash__ is None):
+        generators['__hash__'] = generated_hash
+    if getattr(cls, ORDER, False):
+        for name, op in (('__lt__', '<'), ('__le__', '<='), ('__gt__', '>'), ('__ge__', '>=')):
+            if not _user_defined(cls, name):
+                generators[name] = partial(generated_comparison, name=name, op=op)
+    if lazy:
+        return {name: _lazy_method(cls, name, generate) for name, generate in generators.items()}
+    return {name: generate(cls) for name, generate in generators.items()}
+
+
+def _lazy_method(cls: type, name: str, generate: Callable[[type], Callable[..., Any]]) -> Callable[..., Any]:
+    """
+    A stub of the generated method `name` of `cls`, which generates it on the first call.
+    Marked as generated for `cls` like the method itself, so that the decisions based on it (e.g. in `get_constructor`)
+    are the same before and after the first call.
+    """
+
+    def method(self, *args, **kwargs):
+        generated = generate(cls)
+        if cls.__dict__.get(name) is method:  # unless it was replaced meanwhile (e.g. the annotations were reloaded)
+            setattr(cls, name, generated)
+        return generated(self, *args, **kwargs)
+
+    method.__name__ = name
+    method.__qualname__ = F"{cls.__qualname__}.{name}"
+    setattr(method, GENERATED_FOR, cls)
+    return method
+
+
+def _user_defined(cls: type, name: str) -> bool:
+    """
+    Whether `cls` defines `name`, or inherits it from a user class (e.g. a base class or a mixin), rather than from
+    `Obdictive` or as a method generated for a base class.
+    """
+    for owner in cls.__mro__:
+        if name in owner.__dict__:
+            return owner not in obdictive_bases and getattr(owner.__dict__[name], GENERATED_FOR, None) is None
+    return False
+
+
+def generated_init(cls: type) -> Optional[Callable[..., None]]:
+    """
+    Generate an `__init__` that assigns each field directly, with the defaults baked in.
+    Like `Obdictive.__init__`, it takes the fields as named arguments, and ignores unknown ones.
+    Instances of subclasses (which may have more fields, e.g. when a subclass defines its own `__init__` and calls
+    `super().__init__()`) are passed to `Obdictive.__init__`.
+
+    :return: The constructor, or `None` if it cannot be generated (the field names are not valid argument names).
+    """
+    names = _field_names(cls)
+    if names is None:
+        return None
+    defaults = get_defaults(cls)
+    objects: Dict[str, Any] = {}
+    direct, containers = _direct_assignment(cls, objects)
+
+    params = "".join(F"{name}=_obd_unset, " for name in names)
+    lines = [
+        F"def __init__(self, *, {params}**_obd_kwargs):",
+        "    if self.__class__ is not _obd_cls:",
+    ]
+    lines += [F"        if {name} is not _obd_unset: _obd_kwargs[{name!r}] = {name}" for name in names]
+    lines.append("        return _obd_fallback(self, **_obd_kwargs)")
+    for i, name in enumerate(names):
+        if name in defaults:
+            objects[F"_obd_d{i}"] = defaults[name]
+            value = F"_obd_d{i} if {name} is _obd_unset else {name}"
+            lines.append("    " + _assign(name, value, direct, containers.get(name)))
+        else:
+            lines += [F"    if {name} is not _obd_unset:",
+                      "        " + _assign(name, name, direct, containers.get(name))]
+    return _build_method(cls, '__init__', lines, objects)
+
+
+def generated_eq(cls: type) -> Callable[[Any, Any], bool]:
+    """
+    Generate an `__eq__` comparing the fields directly, short-circuiting on identity, and for frozen classes, on
+    different cached hashes.
+    """
+    names = list(get_annotations(cls))
+    lines = [
+        "def __eq__(self, o):",
+        "    if self is o:",
+        "        return True",
+        "    if not isinstance(o, self.__class__):",
+        "        return False",
+        "    if self.__class__ is not _obd_cls:",
+        "        return _obd_fallback(self, o)",
+    ]
+    if getattr(cls, FROZEN, False):
+        lines += [
+            F"    h = getattr(self, {CACHED_HASH!r}, None)",
+            F"    if h is not None and h != getattr(o, {CACHED_HASH!r}, h):",
+            "        return False",
+        ]
+    if names:
+        comparison = " and ".join(F"{_attribute(name, 'self')} == {_attribute(name, 'o')}" for name in names)
+        lines += [
+            "    try:",
+            F"        return bool({comparison})",
+            "    except AttributeError:  # some fields are not set",
+            "        return _obd_fallback(self, o)",
+        ]
+    else:
+        lines.append("    return True")
+    return _build_method(cls, '__eq__', lines, {})
+
+
+def generated_hash(cls: type) -> Callable[[Any], int]:
+    """
+    Generate a `__hash__` for a frozen class, which hashes the fields once and caches the result on the instance.
+    """
+    values = "".join(F"getattr(self, {name!r}, _obd_unset), " for name in get_annotations(cls))
+    lines = [
+        "def __hash__(self):",
+        "    try:",
+        F"        return {_attribute(CACHED_HASH, 'self')}",
+        "    except AttributeError:",
+        "        pass",
+        "    if self.__class__ is not _obd_cls:",
+        "        return _obd_fallback(self)",
+        F"    h = hash(({values}))",
+        F"    _obd_set(self, {CACHED_HASH!r}, h)",
+        "    return h",
+    ]
+    return _build_method(cls, '__hash__', lines, {})
+
+
+def generated_comparison(cls: type, name: str, op: str) -> Callable[[Any, Any], bool]:
+    """
+    Generate an ordering method, comparing the fields as tuples (in the order of the annotations).
+    """
+    names = list(get_annotations(cls))
+    lines = [
+        F"def {name}(self, o):",
+        "    if o.__class__ is not self.__class__:",
+        "        return NotImplemented",
+        F"    return ({''.join(_attribute(n, 'self') + ', ' for n in names)}) {op} "
+        F"({''.join(_attribute(n, 'o') + ', ' for n in names)})",
+    ]
+    return _build_method(cls, name, lines, {})
+
+
+def reload_generated(cls: type) -> None:
+    """
+    Regenerate the methods and constructors of `cls` after its annotations have been reloaded.
+    """
+    constructors.clear()
+    methods = generated_methods(cls, lazy=True)
+    for name, method in list(cls.__dict__.items()):
+        if getattr(method, GENERATED_FOR, None) is cls and name not in methods:
+            delattr(cls, name)
+    for name, method in methods.items():
+        setattr(cls, name, method)
+
+
+def get_constructor(cls: type) -> Callable[[dict, tuple], Any]:
+    """
+    Get the constructor used by the deserializer of an `Obdictive` subclass, creating it on first use.
+
+    The constructor takes a serialized value and the field decoders of `cls` (`get_field_plans(cls)`).
+    If `cls` uses its generated `__init__`, the constructor creates the instance without calling it, and assigns the
+    decoded fields and the defaults directly, skipping the named arguments altogether.
+    Otherwise, it calls `cls(**kwargs)`.
+    """
+    construct = constructors.get(cls)
+    if construct is None:
+        construct = constructors.setdefault(cls, _build_constructor(cls))
+    return construct
+
+
+def _build_constructor(cls: type) -> Callable[[dict, tuple], Any]:
+    names = _field_names(cls)
+    if names is None or getattr(cls.__init__, GENERATED_FOR, None) is not cls or cls.__new__ is not object.__new__:
+        def construct(val, fields):
+            kwargs = {}
+            for name, plan in fields:
+                if name in val:  # argument is in keyword arguments
+                    kwargs[name] = plan(val[name])
+            return cls(**kwargs)
+
+        return construct
+
+    defaults = get_defaults(cls)
+    objects: Dict[str, Any] = {'_obd_cls': cls, '_obd_new': object.__new__, '_obd_set': object.__setattr__}
+    direct, containers = _direct_assignment(cls, objects)
+    lines = ["def construct(val, fields):"]
+    if names:
+        lines.append(F"    {', '.join(F'(_, _obd_p{i})' for i in range(len(names)))}, = fields")
+    lines.append("    self = _obd_new(_obd_cls)")
+    for i, name in enumerate(names):
+        container = containers.get(name)
+        lines += [F"    if {name!r} in val:",
+                  "        " + _assign(name, F"_obd_p{i}(val[{name!r}])", direct, container)]
+        if name in defaults:
+            objects[F"_obd_d{i}"] = defaults[name]
+            lines += ["    else:", "        " + _assign(name, F"_obd_d{i}", direct, container)]
+    lines.append("    return self")
+
+    exec("\n".join(lines), objects)
+    construct = objects['construct']
+    construct.__qualname__ = F"{cls.__qualname__}.construct"
+    return construct
@@ -0,0 +1,143 @@
+"""
+Columnar export and import of lists of objects.
+
+`to_columns(records)` turns a list of objects into a dict of columns, one per annotated field, read by the annotations
+of their class: `array.array`s for `int`, `float` and `bool` fields (NumPy arrays, if NumPy is installed), lists of the
+serialized values otherwise. Fields of nested annotation based classes are flattened into dotted column names (e.g.
+`"pet.age"`). Unset fields (and fields of unset nested objects) are `None`, which turns a numeric column into a list.
+`from_columns(cls, columns)` rebuilds the objects, skipping `None`s, so those fields get their defaults.
+"""
+import array
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .default_serializers import get_annotations
+from .deserialization import get_plan
+from .objects import is_object, object_constructor, identity, identity_plans
+from .serialization import dump
+
+try:
+    import numpy
+except ImportError:  # optional
+    numpy = None
+
+Columns = Dict[str, Any]
+"""Columns by their (dotted) names: `array.array`s, NumPy arrays or lists."""
+
+_ARRAY_TYPES = {int: 'q', float: 'd', bool: 'b'}
+"""The `array.array` type codes of the numeric fields."""
+
+_NUMPY_TYPES = {int: 'int64', float: 'float64', bool: 'bool'}
+"""The NumPy dtypes of the numeric fields."""
+
+
+def to_columns(records: Iterable[Any], cls: Optional[type] = None, use_numpy: Optional[bool] = None) -> Columns:
+    """
+    Convert objects to columns, by the annotations of `cls`.
+
+    :param records: The objects.
+    :param cls: Their class, the class of the first object by default.
+    :param use_numpy: Whether numeric columns are NumPy arrays (instead of `array.array`s). By default, they are if
+        NumPy is installed.
+    """
+    records = list(records)
+    if cls is None:
+        if not records:
+            raise ValueError("The class of the records must be given if there are none")
+        cls = type(records[0])
+    if not is_object(cls):
+        raise TypeError(F"{cls.__name__} is not serialized by its annotations")
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    columns: Columns = {}
+    _add_columns(cls, records, '', columns, {cls}, use_numpy)
+    return columns
+
+
+def _values(objects: List[Any], name: str) -> List[Any]:
+    try:
+        return list(map(attrgetter(name), objects))
+    except AttributeError:  # an unset field, or an unset object
+        return [getattr(obj, name, None) for obj in objects]
+
+
+def _add_columns(cls: type, objects: List[Any], prefix: str, columns: Columns, path: Set[type],
+                 use_numpy: bool) -> None:
+    for name, typ in get_annotations(cls).items():
+        values = _values(objects, name)
+        key = prefix + name
+        if isinstance(typ, type) and typ in _ARRAY_TYPES:
+            columns[key] = _numeric_column(typ, values, use_numpy)
+        elif is_object(typ) and typ not in path:  # recursive classes are not flattened
+            _add_columns(typ, values, key + '.', columns, path | {typ}, use_numpy)
+        elif typ is not str:
+            columns[key] = [None if value is None else dump(value) for value in values]
+        else:
+            columns[key] = values
+
+
+def _numeric_column(typ: type, values: List[Any], use_numpy: bool) -> Any:
+    """An array of `values`, or `values` if they do not fit one (e.g. `None`s, or big numbers)."""
+    try:
+        if use_numpy:
+            if None in values:
+                return values
+            return numpy.array(values, dtype=_NUMPY_TYPES[typ])
+        return array.array(_ARRAY_TYPES[typ], values)
+    except (TypeError, OverflowError, ValueError):
+        return values
+
+
+def from_columns(cls: type, columns: Columns) -> list:
+    """
+    Rebuild the objects converted to columns by `to_columns`.
+
+    :param cls: The class of the objects.
+    :param columns: The columns. Missing columns leave their fields unset, and unknown ones are ignored.
+    :return: The objects, as many as the length of the columns.
+    """
+    lengths = {len(column) for column in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(F"The columns have different lengths: {sorted(lengths)}")
+    count = lengths.pop() if lengths else 0
+    objects = _build_objects(cls, columns, '', count, {cls})
+    if objects is None:  # no columns of `cls`
+        construct = object_constructor(cls)
+        plans = identity_plans(cls)
+        objects = [construct({}, plans) for _ in range(count)]
+    return objects
+
+
+def _build_objects(cls: type, columns: Columns, prefix: str, count: int, path: Set[type]) -> Optional[list]:
+    """
+    The objects of `cls` built from the columns starting with `prefix`, or `None` if there are none.
+    An object whose fields are all `None` is `None` itself.
+    """
+    fields = []
+    plans = []
+    for name, typ in get_annotations(cls).items():
+        key = prefix + name
+        if is_object(typ) and typ not in path:
+            values = _build_objects(typ, columns, key + '.', count, path | {typ})
+            plan = identity
+        else:
+            column = columns.get(key)
+            values = None if column is None else (column.tolist() if hasattr(column, 'tolist') else column)
+            plan = get_plan(typ)
+        plans.append((name, plan))  # the constructors take the plans of all the fields
+        if values is not None:
+            fields.append((name, values))
+    if not fields:
+        return None
+
+    construct = object_constructor(cls)
+    field_plans = tuple(plans)
+    objects = []
+    for i in range(count):
+        val = {}
+        for name, values in fields:
+            value = values[i]
+            if value is not None:
+                val[name] = value
+        objects.append(construct(val, field_plans) if val or not prefix else None)
+    return objects
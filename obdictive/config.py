@@ -10,9 +10,28 @@ hash_dict_class: bool = True
 use_custom_list_str: bool = True
 """use a custom `str()` implementation for `list` (as the default calls `repr()` on the items instead of `str()`)."""
 
+compile_serializers: bool = False
+"""
+Generate a specialized serializer for each annotation based class on first use,
+instead of walking its annotations on every `dump()`.
+"""
+
 use_instance_annotations: bool = False
 """
 Use the annotations of the instance, so that types can be set at runtime
 (in a subclass's `__init__` before it calls `super().__init__()`).
 E.g. storing the type of a list as a separate variable in the dictionary.
 """
+
+trusted_input: bool = False
+"""
+Pass lists, tuples and dicts of primitives (`int`, `float`, `str`, `bool`) through `load` and `dump` as they are,
+instead of rebuilding them item by item, when their items already have the right types. The result then shares the
+containers with the input (modifying one modifies the other), so enable it only for input that is not modified later.
+"""
+
+check_trusted_input: bool = True
+"""
+With `trusted_input`, check the types of the items (in one pass, `set(map(type, items))`) before passing a container
+through. Disable it to pass the containers through without looking at their items, when they are known to be valid.
+"""
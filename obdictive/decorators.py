@@ -1,9 +1,13 @@
-from typing import Union, Callable, overload, Optional
+from functools import partial
+from typing import Union, Callable, overload, Optional, Tuple
+from weakref import WeakKeyDictionary
 
 from .default_serializers import _default_serializer, _default_deserializer
 from .deserialization import set_deserializer
 from . import typevars, aliases
 from .serialization import set_serializer
+from .registry import lock
+from .instrumentation import class_phase
 
 
 @overload
@@ -35,6 +39,8 @@ def serializable(cls: Optional[typevars.Class] = None, *,
         B. Any variables specified in `_ignore_annot: Set[str]` will not be included.
         C. Any annotation specified in `_add_annot: Dict[str, type]` will be added to the annotations.
         D. Any annotation specified in `_edit_annot: Dict[str, type]` will replace any existing annotation.
+        E. If `_tag` is specified, a `_tag_field` (`"type"` by default) annotation is added, holding the tag, which
+           tells the class apart from the others in a `Union`.
 
     """
 
@@ -45,16 +51,19 @@ def serializable(cls: Optional[typevars.Class] = None, *,
         found_deserializer = deserializer is not None
 
         # search for methods marked as serializer or deserializer
-        for superclass in (cls.mro() if deep_search else (cls,)):
-            for name in superclass.__dict__:  # go over all the methods
-                method = getattr(cls, name)
-                if hasattr(method, SERIALIZER_MARK) and not found_serializer:  # if it is marked as the serializer
-                    serializer = method
-                    found_serializer = True
-                elif hasattr(method,
-                             DESERIALIZER_MARK) and not found_deserializer:  # if it is marked as the deserializer
-                    deserializer = method
-                    found_deserializer = True
+        with class_phase(cls, 'marker search'):
+            for superclass in (cls.__mro__ if deep_search else (cls,)):
+                for name in _marked_names(superclass):
+                    method = getattr(cls, name)
+                    if hasattr(method, SERIALIZER_MARK) and not found_serializer:  # if it is marked as the serializer
+                        serializer = method
+                        found_serializer = True
+                    elif hasattr(method,
+                                 DESERIALIZER_MARK) and not found_deserializer:  # if it is marked as the deserializer
+                        deserializer = method
+                        found_deserializer = True
+                    if found_serializer and found_deserializer:
+                        break
                 if found_serializer and found_deserializer:
                     break
 
@@ -62,12 +71,13 @@ def serializable(cls: Optional[typevars.Class] = None, *,
             serializer = _default_serializer
 
         if not found_deserializer:
-            def deserializer(val: dict): return _default_deserializer(cls, val)
+            deserializer = partial(_default_deserializer, cls)
 
         assert serializer is not None
         assert deserializer is not None
-        set_serializer(cls, serializer)
-        set_deserializer(cls, deserializer)
+        with lock, class_phase(cls, 'registration'):  # other writers never see only one of them registered
+            set_serializer(cls, serializer)
+            set_deserializer(cls, deserializer)
 
         return cls
 
@@ -76,6 +86,22 @@ def serializable(cls: Optional[typevars.Class] = None, *,
     return decorator
 
 
+_marked_names_cache: 'WeakKeyDictionary[type, Tuple[str, ...]]' = WeakKeyDictionary()
+"""The names of the methods marked as serializer or deserializer in the `__dict__` of each class, found once."""
+
+
+def _marked_names(cls: type) -> Tuple[str, ...]:
+    names = _marked_names_cache.get(cls)
+    if names is None:
+        marked = []
+        for name, value in cls.__dict__.items():
+            value = getattr(value, '__func__', value)  # class and static methods are marked on their function
+            if hasattr(value, SERIALIZER_MARK) or hasattr(value, DESERIALIZER_MARK):
+                marked.append(name)
+        names = _marked_names_cache[cls] = tuple(marked)
+    return names
+
+
 # ------------------------ Serializer ----------------------------------
 
 SERIALIZER_MARK = "is_obdictive_serializer"
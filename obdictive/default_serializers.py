@@ -1,19 +1,38 @@
-from typing import Dict, Any
+import typing
+from types import MemberDescriptorType
+from typing import Dict, Any, Optional
 
-from . import aliases
+from . import aliases, config
 from .serialization import dump
-from .deserialization import load
+from .deserialization import get_field_plans, clear_plans
+from .serialization import compiled_serializers
+from .registry import Registry
 
 IGNORE_ANNOTATIONS = "_ignore_annot"
 EDIT_ANNOTATIONS = "_edit_annot"
 ADD_ANNOTATIONS = "_add_annot"
 SET_ANNOTATIONS = "_annotations"
+SLOT_DEFAULTS = "_slot_defaults"
+FROZEN = "_frozen"
+ORDER = "_order"
+CACHED_HASH = "_obdictive_hash"
+LAZY_FIELDS = "_obdictive_lazy"
+TRACK = "_track"
+DUMP_CACHE = "_obdictive_dump"
+PARENTS = "_obdictive_parents"
+TAG = "_tag"
+TAG_FIELD = "_tag_field"
+DEFAULT_TAG_FIELD = "type"
 
 
 def _default_serializer(self: aliases.Serializable) -> dict:
     """
     Serializes an object to a dict based on its annotations.
     """
+    if config.compile_serializers:
+        from .codegen import compiled_serializer
+        return compiled_serializer(self.__class__)(self)
+
     d: Dict[str, Any] = dict()
     for name, cls in get_annotations(self.__class__).items():
         if hasattr(self, name):
@@ -32,26 +51,28 @@ def _default_deserializer(cls: type, value: dict) -> aliases.Serializable:
 
     self = cls()
 
-    annotations = get_annotations(cls)
-
-    for name, cls in annotations.items():
+    defaults = get_defaults(cls)
+    for name, plan in get_field_plans(cls):
         if name in value:
-            current_value = value[name]
-            loaded_value = load(cls, current_value)
-            setattr(self, name, loaded_value)
-        elif hasattr(self.__class__, name):
-            setattr(self, name, getattr(self.__class__, name))
+            setattr(self, name, plan(value[name]))
+        elif name in defaults:
+            setattr(self, name, defaults[name])
 
     return self
 
 
-annotations_cache: Dict[type, dict] = {}
+annotations_cache: Registry[type, dict] = Registry()
 
 
 def get_annotations(cls: type, reload_cache=False) -> dict:
-    global annotations_cache
-    if cls in annotations_cache and not reload_cache:
-        return annotations_cache[cls]
+    if not reload_cache:
+        annotations = annotations_cache.get(cls)
+        if annotations is not None:
+            return annotations
+    else:  # the generated serializers and decoders are based on the cached annotations
+        compiled_serializers.clear()
+        clear_plans()
+        defaults_cache.pop(cls)
 
     annotations = {}
     for c in reversed(cls.mro()):
@@ -69,5 +90,56 @@ def get_annotations(cls: type, reload_cache=False) -> dict:
             if k in annot:
                 annotations[k] = v
 
-    annotations_cache[cls] = annotations
-    return annotations
+    tag = tag_field(cls)
+    if tag is not None:  # the discriminator of the class, first
+        annotations = {tag: typing.Literal[getattr(cls, TAG)], **{k: v for k, v in annotations.items() if k != tag}}
+
+    if reload_cache:
+        annotations_cache[cls] = annotations
+        from .codegen import reload_generated  # the generated constructors are based on the annotations
+        reload_generated(cls)
+        return annotations
+    # if another thread got here first, use its result so that all threads share the same dict
+    return annotations_cache.setdefault(cls, annotations)
+
+
+def tag_field(cls: type) -> Optional[str]:
+    """
+    The name of the field holding the tag of `cls` (`_tag_field`, `"type"` by default), if it has a class-level tag
+    (`_tag`). The field is added to the annotations as a `Literal` of the tag, with the tag as its default, so that the
+    classes of a `Union` can be told apart (see `unions`).
+    """
+    if getattr(cls, TAG, None) is None:
+        return None
+    return getattr(cls, TAG_FIELD, DEFAULT_TAG_FIELD)
+
+
+defaults_cache: Registry[type, dict] = Registry()
+
+
+def get_defaults(cls: type) -> dict:
+    """
+    The default values of the annotations of `cls`: the class attributes with the same names.
+    The defaults of slotted classes (whose class attributes are the slots) are kept in `_slot_defaults`.
+    """
+    defaults = defaults_cache.get(cls)
+    if defaults is not None:
+        return defaults
+
+    defaults = {}
+    tag = tag_field(cls)
+    if tag is not None:
+        defaults[tag] = getattr(cls, TAG)
+    for name in get_annotations(cls):
+        if name == tag:
+            continue
+        for c in cls.__mro__:
+            slot_defaults = c.__dict__.get(SLOT_DEFAULTS, {})
+            if name in slot_defaults:
+                defaults[name] = slot_defaults[name]
+                break
+            if name in c.__dict__:
+                if not isinstance(c.__dict__[name], MemberDescriptorType):
+                    defaults[name] = getattr(cls, name)
+                break
+    return defaults_cache.setdefault(cls, defaults)
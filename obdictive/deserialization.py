@@ -6,8 +6,9 @@ from __future__ import annotations
 import sys
 
 from .generics import _list_deserializer_impl, _dict_deserializer_impl, _tuple_deserializer_impl, generics_map, \
-    generic_deserializers_map
+    generic_deserializers_map, _trusted_type, _items_are
 from .obdictive_exceptions import ObdictiveDeserializationException
+from .registry import Registry, lock
 
 if sys.version_info >= (3, 9):
     # noinspection PyPep8Naming
@@ -16,67 +17,275 @@ else:
     # Legacy generic type annotation classes
     # Deprecated in Python 3.9
     from typing import List, Dict, Tuple, Type
-from typing import Any, cast
+from typing import Any, FrozenSet, Iterable, Optional
 
 from . import config, aliases
 
-deserializers_map: Dict[Type[Any], aliases.Deserializer] = {
+deserializers_map: Registry[Type[Any], aliases.Deserializer] = Registry({
     int: int,
     str: str,
     float: float,
     bool: bool,
-}
+})
 """
 A dictionary that defines how a value can be deserialized to a specific type.
 The `@deserializer` decorator adds to this dictionary.
 """
 
 
-def load(cls: Type[Any], value: aliases.Serialized) -> aliases.Serializable:
+plans_cache: Registry[Any, aliases.Deserializer] = Registry()
+"""
+A cache of the decoders resolved for each type (see `get_plan`).
+Cleared whenever a deserializer or generic is set, as the decoders of nested types are resolved into it.
+"""
+
+field_plans_cache: Registry[type, Tuple[Tuple[str, aliases.Deserializer], ...]] = Registry()
+"""
+A cache of the decoders of each annotation of a class (see `get_field_plans`).
+"""
+
+lazy_plans_cache: Registry[Any, aliases.Deserializer] = Registry()
+"""
+A cache of the lazy decoders of each type (see `lazy.get_lazy_plan`).
+"""
+
+projected_plans_cache: Registry[Any, aliases.Deserializer] = Registry()
+"""
+A cache of the decoders of each type and projection (see `projection.get_projected_plan`).
+"""
+
+plans_version: int = 0
+"""
+Incremented whenever the cached decoders are cleared, so that caches derived from them can be invalidated.
+"""
+
+
+def load(cls: Type[Any], value: aliases.Serialized, lazy: bool = False, only: Optional[Iterable[str]] = None,
+         exclude: Optional[Iterable[str]] = None) -> aliases.Serializable:
     """
     Convert a dictionary back to a python object.
 
     :param cls: The type of the object.
     :param value: The dictionary.
+    :param lazy: Decode the nested objects and collections of `Obdictive` instances on first access (see `lazy`).
+    :param only: Convert only these fields, given as dotted paths (e.g. `"customer.id"`). The others are left unset.
+    :param exclude: Do not convert these fields, given as dotted paths (see `projection`).
     :return: An instance of type `cls` equivalent to `value`.
     """
-    #                                          Special types in Python 3.7+                 Python 3.5-3.6
-    if config.use_special_types_black_magic and not isinstance(cls, Type) or \
-            isinstance(cls, List) or isinstance(cls, Dict) or isinstance(cls, Tuple):  # type: ignore
-        if hasattr(cls, '__origin__'):
-            cls_cast = cast(List.__class__, cls)  # type: ignore[valid-type]
-            if hasattr(cls_cast, '__extra__'):
-                ty = cls_cast.__extra__  # type: ignore[attr-defined]
-            else:
-                ty = cls_cast.__origin__  # type: ignore[attr-defined]
-            if ty == list:
-                t_item = cls_cast.__args__[0]  # type: ignore[attr-defined]
-                value_list = cast(list, value)
-                return _list_deserializer_impl(value_list, t_item)
-            if ty == dict:
-                t_key, t_value = cls_cast.__args__[0:2]  # type: ignore[attr-defined]
-                value_dict = cast(dict, value)
-                return _dict_deserializer_impl(value_dict, (t_key, t_value))
-            if ty == tuple:
-                types = cls_cast.__args__  # type: ignore[attr-defined]
-                value_tuple = cast(tuple, value)
-                return _tuple_deserializer_impl(value_tuple, types)
-        return value
-    else:
-        if cls in generics_map:
-            base_cls, types = generics_map[cls]
-            return generic_deserializers_map[base_cls](value, types)
-        elif cls in deserializers_map:
-            return deserializers_map[cls](value)
-        else:
-            # for map_type, map_method in load_map.items():
-            #     if issubclass(t, map_type):
-            #         return map_method(value)
-            raise ObdictiveDeserializationException(F"{value} is not of type {cls.__name__}, and cannot be converted")
+    if only is not None or exclude is not None:
+        if lazy:
+            raise ValueError("lazy cannot be combined with only or exclude")
+        from .projection import get_projected_plan
+        return get_projected_plan(cls, only, exclude)(value)
+    if lazy:
+        from .lazy import get_lazy_plan
+        return get_lazy_plan(cls)(value)
+    try:
+        plan = plans_cache.get(cls)
+    except TypeError:  # unhashable type annotation
+        plan = None
+    if plan is None:
+        plan = get_plan(cls)
+    return plan(value)
+
+
+def get_plan(cls: Type[Any]) -> aliases.Deserializer:
+    """
+    Resolve `cls` into a decoder: a function that converts a serialized value to `cls`.
+    Decoders of generic types (e.g. `List[T]`) call the decoders of their type arguments directly.
+    The result is cached, so the type is only inspected once.
+    """
+    try:
+        plan = plans_cache.get(cls)
+    except TypeError:  # unhashable type annotation
+        return _build_plan(cls)
+    if plan is not None:
+        return plan
+    version = plans_version
+    plan = _build_plan(cls)
+    _cache_plan(plans_cache, cls, plan, version)
+    return plan
+
+
+def get_field_plans(cls: type) -> Tuple[Tuple[str, aliases.Deserializer], ...]:
+    """
+    The `(name, decoder)` pairs of the annotations of `cls`.
+    """
+    field_plans = field_plans_cache.get(cls)
+    if field_plans is not None:
+        return field_plans
+    from .default_serializers import get_annotations
+    version = plans_version
+    field_plans = tuple((name, get_plan(typ)) for name, typ in get_annotations(cls).items())
+    _cache_plan(field_plans_cache, cls, field_plans, version)
+    return field_plans
+
+
+def _cache_plan(cache: Registry[Any, Any], cls: Any, plan: Any, version: int) -> None:
+    """
+    Cache a decoder built while the cache was at `version`, unless the cache has been cleared since (as it may be based
+    on a replaced deserializer).
+    """
+    with lock:
+        if plans_version == version:
+            cache[cls] = plan
+
+
+def clear_plans() -> None:
+    """
+    Clear the cached decoders. Must be called after modifying `deserializers_map` or `generics_map` directly.
+    """
+    global plans_version
+    with lock:
+        plans_cache.clear()
+        field_plans_cache.clear()
+        lazy_plans_cache.clear()
+        projected_plans_cache.clear()
+        plans_version += 1
+
+
+def resolve_generic(cls: Any) -> Optional[Tuple[aliases.GenericType, aliases.GenericInstanceTypes]]:
+    """
+    The generic class and the type arguments of `cls` (e.g. `(list, (int,))` for `List[int]`),
+    or `None` if `cls` is not generic or has a deserializer of its own.
+    """
+    try:
+        generic = generics_map.get(cls)
+        if generic is not None:
+            return generic
+        if deserializers_map.get(cls) is not None:
+            return None
+    except TypeError:  # unhashable type annotation
+        pass
+
+    # `__extra__` holds the origin of the legacy (Python 3.5-3.6) generic classes
+    ty = getattr(cls, '__extra__', None) or getattr(cls, '__origin__', None)
+    types = getattr(cls, '__args__', None)
+    if ty in (list, dict, tuple) and types:
+        return ty, types
+    return None
+
+
+def _build_plan(cls: Any) -> aliases.Deserializer:
+    generic = resolve_generic(cls)
+    if generic is not None:
+        return _generic_plan(*generic)
+    try:
+        method = deserializers_map.get(cls)
+    except TypeError:  # unhashable type annotation
+        method = None
+    if method is not None:
+        return method
+    from .unions import special_plan
+    plan = special_plan(cls)
+    if plan is not None:
+        return plan
+    return _unresolved_plan(cls)
+
+
+def _generic_plan(base_cls: aliases.GenericType, types: aliases.GenericInstanceTypes) -> aliases.Deserializer:
+    generic_deserializer = generic_deserializers_map[base_cls]
+    if base_cls is list and generic_deserializer is _list_deserializer_impl and len(types) == 1:
+        trusted = _trusted_type(types[0])
+        if trusted is not None:
+            return _primitive_list_plan(get_plan(types[0]), trusted)
+        return _list_plan(get_plan(types[0]))
+    if base_cls is dict and generic_deserializer is _dict_deserializer_impl and len(types) == 2:
+        keys, items = _trusted_type(types[0]), _trusted_type(types[1])
+        if keys is not None and items is not None:
+            return _primitive_dict_plan(get_plan(types[0]), get_plan(types[1]), keys, items)
+        return _dict_plan(get_plan(types[0]), get_plan(types[1]))
+    if base_cls is tuple and generic_deserializer is _tuple_deserializer_impl:
+        if len(types) == 2 and types[1] is Ellipsis:
+            trusted = _trusted_type(types[0])
+            if trusted is not None:
+                return _primitive_tuple_plan(get_plan(types[0]), trusted)
+            return _variadic_tuple_plan(get_plan(types[0]))
+        return _tuple_plan(tuple(get_plan(t) for t in types))
+
+    def generic_plan(value):
+        return generic_deserializer(value, types)
+
+    return generic_plan
+
+
+def _list_plan(item: aliases.Deserializer) -> aliases.Deserializer:
+    def list_plan(value):
+        return list(map(item, value))
+
+    return list_plan
+
+
+def _dict_plan(key: aliases.Deserializer, item: aliases.Deserializer) -> aliases.Deserializer:
+    def dict_plan(value):
+        return {key(k): item(v) for k, v in value.items()}
+
+    return dict_plan
+
+
+def _tuple_plan(items: Tuple[aliases.Deserializer, ...]) -> aliases.Deserializer:
+    def tuple_plan(value):
+        return tuple([item(v) for item, v in zip(items, value)])
+
+    return tuple_plan
+
+
+def _variadic_tuple_plan(item: aliases.Deserializer) -> aliases.Deserializer:
+    def variadic_tuple_plan(value):
+        return tuple(map(item, value))
+
+    return variadic_tuple_plan
+
+
+def _primitive_list_plan(item: aliases.Deserializer, types: FrozenSet[type]) -> aliases.Deserializer:
+    """A list decoder that returns lists of the right primitives as they are, with `config.trusted_input`."""
+
+    def primitive_list_plan(value):
+        if config.trusted_input and type(value) is list and _items_are(value, types, config.check_trusted_input):
+            return value
+        return list(map(item, value))
+
+    return primitive_list_plan
+
+
+def _primitive_dict_plan(key: aliases.Deserializer, item: aliases.Deserializer, key_types: FrozenSet[type],
+                         item_types: FrozenSet[type]) -> aliases.Deserializer:
+    """A dict decoder that returns dicts of the right primitives as they are, with `config.trusted_input`."""
+
+    def primitive_dict_plan(value):
+        if config.trusted_input and type(value) is dict and _items_are(value, key_types, config.check_trusted_input) \
+                and _items_are(value.values(), item_types, config.check_trusted_input):
+            return value
+        return {key(k): item(v) for k, v in value.items()}
+
+    return primitive_dict_plan
+
+
+def _primitive_tuple_plan(item: aliases.Deserializer, types: FrozenSet[type]) -> aliases.Deserializer:
+    """A variadic tuple decoder that returns tuples of the right primitives as they are, with `config.trusted_input`."""
+
+    def primitive_tuple_plan(value):
+        if config.trusted_input and type(value) is tuple and _items_are(value, types, config.check_trusted_input):
+            return value
+        return tuple(map(item, value))
+
+    return primitive_tuple_plan
+
+
+def _unresolved_plan(cls: Any) -> aliases.Deserializer:
+    def unresolved_plan(value):
+        if config.use_special_types_black_magic and not isinstance(cls, Type):
+            return value
+        raise ObdictiveDeserializationException(
+            F"{value} is not of type {getattr(cls, '__name__', cls)}, and cannot be converted")
+
+    return unresolved_plan
 
 
 def set_deserializer(cls: type, method: aliases.Deserializer) -> None:
     """
     Set `method` as the deserializer for type `cls`.
     """
-    deserializers_map[cls] = method
+    with lock:
+        deserializers_map[cls] = method
+        clear_plans()
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import sys
 
-from . import aliases
+from . import aliases, config
+from .registry import Registry, lock
 from .obdictive_exceptions import GenericSerializationException
 
 if sys.version_info >= (3, 9):
@@ -12,10 +13,49 @@ else:
     # Legacy generic type annotation classes
     # Deprecated in Python 3.9
     from typing import List, Dict, Tuple, Type
+from typing import Any, FrozenSet, Iterable, Optional
+
+_PRIMITIVES = frozenset((int, str, float, bool))
+"""The types that are serialized as themselves, unless their serializers or deserializers are replaced."""
+
+
+def _items_are(items: Iterable[Any], types: FrozenSet[type], check: bool = True) -> bool:
+    """
+    Whether the types of all `items` are exactly in `types`, checked in one pass (unless `check` is false).
+    """
+    return not check or set(map(type, items)) <= types
+
+
+_echoed: Tuple[int, FrozenSet[type]] = (-1, frozenset())
+
+
+def _echoed_types() -> FrozenSet[type]:
+    """The primitive types that are serialized as they are (see `config.trusted_input`)."""
+    global _echoed
+    from . import serialization
+    version, types = _echoed
+    if version != serialization.serializers_version:
+        version = serialization.serializers_version
+        types = frozenset(t for t in _PRIMITIVES if serialization.serializers_map.get(t) is serialization.echo)
+        _echoed = version, types
+    return types
+
+
+def _trusted_type(typ: Any) -> Optional[FrozenSet[type]]:
+    """`{typ}` if `typ` is a primitive type that is deserialized as it is (see `config.trusted_input`)."""
+    from .deserialization import deserializers_map
+    if isinstance(typ, type) and typ in _PRIMITIVES and deserializers_map.get(typ) is typ:
+        return frozenset((typ,))
+    return None
 
 
 def _list_serializer_impl(value: aliases.Serialized) -> list:
     from .serialization import dump
+    if config.trusted_input and type(value) is list:
+        echoed = _echoed_types()
+        # the first item rejects the lists of objects without going over all of them
+        if (not value or type(value[0]) in echoed) and _items_are(value, echoed):
+            return value
     try:
         return [dump(x) for x in value]
     except TypeError as e:
@@ -26,11 +66,19 @@ def _list_deserializer_impl(value: list, types: aliases.GenericInstanceTypes) ->
     from .deserialization import load
     if len(types) != 1:
         raise GenericSerializationException(F"List expected one type, but got {types}")
+    if config.trusted_input and type(value) is list:
+        trusted = _trusted_type(types[0])
+        if trusted is not None and _items_are(value, trusted, config.check_trusted_input):
+            return value
     return [load(types[0], x) for x in value]
 
 
 def _dict_serializer_impl(value: aliases.Serialized) -> dict:
     from .serialization import dump
+    if config.trusted_input and type(value) is dict:
+        echoed = _echoed_types()
+        if _items_are(value, echoed) and _items_are(value.values(), echoed):
+            return value
     try:
         return {dump(k): dump(v) for k, v in value.items()}
     except TypeError as e:
@@ -41,11 +89,20 @@ def _dict_deserializer_impl(value: dict, types: aliases.GenericInstanceTypes) ->
     from .deserialization import load
     if len(types) != 2:
         raise GenericSerializationException(F"Dictionary expected two types (key, value), but got {types}")
+    if config.trusted_input and type(value) is dict:
+        keys, items = _trusted_type(types[0]), _trusted_type(types[1])
+        if keys is not None and items is not None and _items_are(value, keys, config.check_trusted_input) \
+                and _items_are(value.values(), items, config.check_trusted_input):
+            return value
     return {load(types[0], k): load(types[1], v) for k, v in value.items()}
 
 
 def _tuple_serializer_impl(value: aliases.Serialized):
     from .serialization import dump
+    if config.trusted_input and type(value) is tuple:
+        echoed = _echoed_types()
+        if (not value or type(value[0]) in echoed) and _items_are(value, echoed):
+            return value
     try:
         return tuple(dump(v) for v in value)
     except TypeError as e:
@@ -57,25 +114,28 @@ def _tuple_deserializer_impl(value: tuple, types: aliases.GenericInstanceTypes):
     return tuple(load(t, v) for t, v in zip(types, value))
 
 
-generics_map: Dict[aliases.GenericInstance, Tuple[aliases.GenericType, aliases.GenericInstanceTypes]] = {
+generics_map: Registry[aliases.GenericInstance, Tuple[aliases.GenericType, aliases.GenericInstanceTypes]] = Registry({
     # List[int]: (list, (int,))  # example
-}
+})
 
-generic_serializers_map: Dict[aliases.GenericType, aliases.GenericSerializer] = {
+generic_serializers_map: Registry[aliases.GenericType, aliases.GenericSerializer] = Registry({
     list: _list_serializer_impl,
     dict: _dict_serializer_impl,
     tuple: _tuple_serializer_impl,
-}
+})
 
-generic_deserializers_map: Dict[aliases.GenericType, aliases.GenericDeserializer] = {
+generic_deserializers_map: Registry[aliases.GenericType, aliases.GenericDeserializer] = Registry({
     list: _list_deserializer_impl,
     dict: _dict_deserializer_impl,
     tuple: _tuple_deserializer_impl,
-}
+})
 
 
 def define_generic(instance: aliases.GenericInstance,
                    generic_class: aliases.GenericType,
                    types: aliases.GenericInstanceTypes):
-    if instance not in generics_map:
-        generics_map[instance] = (generic_class, types)
+    from .deserialization import clear_plans
+    with lock:
+        if instance not in generics_map:
+            generics_map[instance] = (generic_class, types)
+            clear_plans()
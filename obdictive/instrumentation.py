@@ -0,0 +1,331 @@
+"""
+Opt-in timing and call counting of `dump` and `load`, per type.
+
+While enabled (see `enable` and `instrumented`), the registered serializers are replaced by instrumented wrappers, and
+the decoders (`get_plan`) are built wrapped as well. Each wrapper counts the calls of its type, and sums their time:
+`time` includes nested values, `self_time` does not. Every `sample_every`-th call also records the nesting depth and
+the size (`len`) of the serialized value. Disabling restores the original serializers and decoders, so `dump` and
+`load` do not check whether instrumentation is enabled, and cost nothing extra when it is not.
+
+Values that are not dispatched through `dump` and `load` are not counted separately: primitives, the fields written by
+generated serializers (`config.compile_serializers`) and direct JSON encoding (`direct=True`) are included in the time
+of the enclosing object. Serializers registered while instrumentation is enabled are not instrumented.
+
+The creation of serializable classes can be timed as well, e.g. while importing the models (see `time_class_creation`
+and `class_creation_report`, or `python -m obdictive import-report <module>`).
+"""
+import threading
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+from . import deserialization, serialization
+from .codegen import annotation_serializers
+from .deserialization import clear_plans
+from .generics import generic_serializers_map
+from .registry import Registry, lock
+from .serialization import serializers_map, echo
+from .tracking import dump_tracked
+
+DEFAULT_SAMPLE_EVERY = 100
+"""Record the depth and the size of every 100th call of each type."""
+
+_PRIMITIVES = frozenset((int, str, float, bool))
+"""Types that are not instrumented, as their conversion is negligible."""
+
+
+class TypeStats:
+    """The counters of one type, in one direction (`dump` or `load`)."""
+    __slots__ = ('method', 'calls', 'time', 'self_time', 'samples', 'depth_total', 'max_depth', 'size_total',
+                 'max_size')
+
+    def __init__(self, method: Callable[..., Any]):
+        self.method = method
+        self.calls = 0
+        self.time = 0.0
+        self.self_time = 0.0
+        self.samples = 0
+        self.depth_total = 0
+        self.max_depth = 0
+        self.size_total = 0
+        self.max_size = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        samples = self.samples or 1
+        return {'method': getattr(self.method, '__qualname__', repr(self.method)), 'calls': self.calls,
+                'time': self.time, 'self_time': self.self_time, 'samples': self.samples,
+                'mean_depth': self.depth_total / samples, 'max_depth': self.max_depth,
+                'mean_size': self.size_total / samples, 'max_size': self.max_size}
+
+
+_records: Dict[str, Dict[Any, TypeStats]] = {'dump': {}, 'load': {}}
+"""The counters by direction and type."""
+
+_wrapped_serializers: List[Tuple[Registry, Dict[Any, Tuple[Callable[..., Any], Callable[..., Any]]]]] = []
+"""The `(original, wrapper)` serializers by type, of each registry (empty when disabled)."""
+
+_original_build_plan: Optional[Callable[[Any], Any]] = None
+"""The decoder builder of `deserialization`, while it is replaced."""
+
+_sample_every = DEFAULT_SAMPLE_EVERY
+
+_local = threading.local()
+
+
+def _stack() -> list:
+    """The time spent in nested calls, per call in progress in this thread."""
+    try:
+        return _local.stack
+    except AttributeError:
+        _local.stack = []
+        return _local.stack
+
+
+def _instrument(direction: str, key: Any, method: Callable[..., Any]) -> Callable[..., Any]:
+    entry = _records[direction].get(key)
+    if entry is None:
+        entry = _records[direction][key] = TypeStats(method)
+    dumping = direction == 'dump'
+    sample_every = _sample_every
+
+    def instrumented(value, *args):
+        stack = _stack()
+        stack.append(0.0)
+        start = perf_counter()
+        try:
+            result = method(value, *args)
+        finally:
+            elapsed = perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            entry.calls += 1
+            entry.time += elapsed
+            entry.self_time += elapsed - children
+        if (entry.calls - 1) % sample_every == 0:
+            depth = len(stack) + 1
+            try:
+                size = len(result if dumping else value)
+            except TypeError:
+                size = 0
+            entry.samples += 1
+            entry.depth_total += depth
+            entry.max_depth = max(entry.max_depth, depth)
+            entry.size_total += size
+            entry.max_size = max(entry.max_size, size)
+        return result
+
+    return instrumented
+
+
+def _build_plan(cls: Any) -> Any:
+    plan = _original_build_plan(cls)
+    if isinstance(cls, type) and cls in _PRIMITIVES:
+        return plan
+    return _instrument('load', cls, plan)
+
+
+def enabled() -> bool:
+    """Whether instrumentation is enabled."""
+    return _original_build_plan is not None
+
+
+def enable(sample_every: int = DEFAULT_SAMPLE_EVERY) -> None:
+    """
+    Start counting. The counters are kept from previous runs (see `reset`).
+
+    :param sample_every: Record the nesting depth and the size of every `sample_every`-th call of each type.
+    """
+    global _original_build_plan, _sample_every
+    if sample_every < 1:
+        raise ValueError("sample_every must be positive")
+    with lock:
+        if enabled():
+            return
+        _sample_every = sample_every
+        for registry in (serializers_map, generic_serializers_map):
+            originals = {cls: method for cls, method in registry.items()
+                         if method is not echo and method is not dump_tracked and cls not in _PRIMITIVES}
+            wrapped = {cls: (method, _instrument('dump', cls, method)) for cls, method in originals.items()}
+            # wrappers of annotation serializers are annotation serializers too, before they are published
+            annotation_serializers.update(wrapper for method, wrapper in wrapped.values()
+                                          if method in annotation_serializers)
+            registry.update({cls: wrapper for cls, (_, wrapper) in wrapped.items()})
+            _wrapped_serializers.append((registry, wrapped))
+        _original_build_plan = deserialization._build_plan
+        deserialization._build_plan = _build_plan
+        _invalidate()
+
+
+def disable() -> None:
+    """
+    Stop counting, and restore the original serializers and decoders. The counters are kept.
+    """
+    global _original_build_plan
+    with lock:
+        if not enabled():
+            return
+        for registry, wrapped in _wrapped_serializers:
+            # unless they were replaced meanwhile
+            registry.update({cls: method for cls, (method, wrapper) in wrapped.items() if registry.get(cls) is wrapper})
+            annotation_serializers.difference_update(wrapper for _, wrapper in wrapped.values())
+        _wrapped_serializers.clear()
+        deserialization._build_plan = _original_build_plan
+        _original_build_plan = None
+        _invalidate()
+
+
+def _invalidate() -> None:
+    """Clear the caches built from the serializers and the decoders."""
+    serialization.compiled_serializers.clear()
+    serialization.serializers_version += 1
+    clear_plans()
+
+
+def reset() -> None:
+    """
+    Reset the counters.
+    """
+    with lock:
+        for records in _records.values():
+            for entry in records.values():
+                entry.__init__(entry.method)
+
+
+def stats() -> Dict[str, Dict[Any, Dict[str, Any]]]:
+    """
+    A snapshot of the counters: `{'dump': {type: counters}, 'load': {type: counters}}`, of the types that were called.
+
+    The counters of a type are `calls`, `time` and `self_time` (excluding nested values), in seconds, the name of the
+    (de)serializer (`method`), and of the sampled calls: their number (`samples`), `mean_depth`, `max_depth`, and
+    `mean_size`, `max_size` (the `len` of the serialized value).
+    """
+    return {direction: {key: entry.as_dict() for key, entry in list(records.items()) if entry.calls}
+            for direction, records in _records.items()}
+
+
+@contextmanager
+def instrumented(sample_every: int = DEFAULT_SAMPLE_EVERY) -> Iterator[None]:
+    """
+    Count the calls in the block: resets the counters, and enables instrumentation for the block (unless it is
+    enabled already). Read the results with `stats()`, in or after the block.
+    """
+    was_enabled = enabled()
+    reset()
+    enable(sample_every)
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+
+
+# ------------------------ Class creation ----------------------------------
+
+CLASS_PHASES = ('marker search', 'registration', 'methods')
+"""
+The timed phases of class creation: searching the class and its bases for the methods marked as (de)serializer,
+registering the (de)serializers, and setting the generated methods of `Obdictive` subclasses. The rest of the time
+(creating the type, reading the annotations, slots...) is reported as `other`.
+"""
+
+_class_times: Dict[type, Dict[str, float]] = {}
+"""The creation times of the classes, by phase (and `total`)."""
+
+_timing_classes = False
+
+_NOT_TIMED = nullcontext()
+
+
+class _Phase:
+    __slots__ = ('times', 'phase', 'start')
+
+    def __init__(self, times: Dict[str, float], phase: str):
+        self.times = times
+        self.phase = phase
+
+    def __enter__(self) -> None:
+        self.start = perf_counter()
+
+    def __exit__(self, *args: Any) -> None:
+        self.times[self.phase] += perf_counter() - self.start
+
+
+def _times_of(cls: type) -> Dict[str, float]:
+    times = _class_times.get(cls)
+    if times is None:
+        times = _class_times[cls] = dict.fromkeys(CLASS_PHASES + ('total',), 0.0)
+    return times
+
+
+def class_phase(cls: type, phase: str) -> ContextManager[None]:
+    """Time a phase of the creation of `cls` (one of `CLASS_PHASES`), if class creation is timed."""
+    if not _timing_classes:
+        return _NOT_TIMED
+    return _Phase(_times_of(cls), phase)
+
+
+def class_created(cls: type, start: float) -> None:
+    """Record the total creation time of `cls`, which started at `start` (`perf_counter()`), if it is timed."""
+    if _timing_classes:
+        _times_of(cls)['total'] += perf_counter() - start
+
+
+@contextmanager
+def time_class_creation() -> Iterator[None]:
+    """
+    Time the creation of the serializable classes in the block (e.g. `import myapp.models`), replacing the previous
+    times. Read them with `class_times()` or `class_creation_report()`, in or after the block.
+    """
+    global _timing_classes
+    with lock:
+        _class_times.clear()
+        _timing_classes = True
+    try:
+        yield
+    finally:
+        _timing_classes = False
+
+
+def class_times() -> Dict[type, Dict[str, float]]:
+    """
+    The creation times of the classes created while timing (see `time_class_creation`), in seconds:
+    `{cls: {phase: time}}`, with a time for each of `CLASS_PHASES`, `other` and `total`.
+    The total of a class decorated with `@serializable` (rather than derived from `Obdictive`) is the decorator's.
+    """
+    result = {}
+    for cls, times in list(_class_times.items()):
+        times = dict(times)
+        phases = sum(times[phase] for phase in CLASS_PHASES)
+        times['total'] = max(times['total'], phases)
+        times['other'] = times['total'] - phases
+        result[cls] = times
+    return result
+
+
+def class_creation_report(limit: int = 10) -> str:
+    """
+    A report of the time spent creating classes (see `time_class_creation`): the total by phase, and the `limit`
+    slowest modules and classes.
+    """
+    times = class_times()
+    total = sum(t['total'] for t in times.values())
+    lines = [F"{len(times)} classes created in {total * 1e3:.1f}ms"]
+    for phase in CLASS_PHASES + ('other',):
+        phase_total = sum(t[phase] for t in times.values())
+        lines.append(F"  {phase:<16} {phase_total * 1e3:10.1f}ms {phase_total / (total or 1):7.1%}")
+
+    modules: Dict[str, List[float]] = {}
+    for cls, t in times.items():
+        module = modules.setdefault(cls.__module__, [0, 0.0])
+        module[0] += 1
+        module[1] += t['total']
+    lines.append("slowest modules:")
+    for name, (count, module_total) in sorted(modules.items(), key=lambda item: -item[1][1])[:limit]:
+        lines.append(F"  {name:<40} {count:6} classes {module_total * 1e3:10.1f}ms")
+    lines.append("slowest classes:")
+    for cls, t in sorted(times.items(), key=lambda item: -item[1]['total'])[:limit]:
+        # the variants of `OList` and the like have a readable repr
+        name = repr(cls) if type(cls).__repr__ is not type.__repr__ else F"{cls.__module__}.{cls.__qualname__}"
+        lines.append(F"  {name:<40} {t['total'] * 1e3:10.3f}ms")
+    return "\n".join(lines)
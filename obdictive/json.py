@@ -2,9 +2,22 @@
 JSON serialization
 """
 
+import codecs
+import io
 import json
+import re
+from functools import lru_cache, partial
+from typing import IO, Any, Callable, Iterable, Iterator, List, Optional, Union
+
+from .json_encoder import DirectEncoder
 from .serialization import dump
 from .deserialization import load
+from . import aliases
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+"""The number of characters (or bytes) read from or written to a file at a time."""
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
 
 
 def json_loads(t: type, s: str, *, cls=None, object_hook=None, parse_float=None,
@@ -49,7 +62,7 @@ def json_loads(t: type, s: str, *, cls=None, object_hook=None, parse_float=None,
 
 def json_dumps(obj, *, skipkeys=False, ensure_ascii=True, check_circular=True,
                allow_nan=True, cls=None, indent=None, separators=None,
-               default=None, sort_keys=False, **kw):
+               default=None, sort_keys=False, direct=False, only=None, exclude=None, **kw):
     """Serialize ``obj`` to a JSON formatted ``str``.
 
         If ``skipkeys`` is true then ``dict`` keys that are not basic types
@@ -89,8 +102,263 @@ def json_dumps(obj, *, skipkeys=False, ensure_ascii=True, check_circular=True,
         ``.default()`` method to serialize additional types), specify it with
         the ``cls`` kwarg; otherwise ``JSONEncoder`` is used.
 
+        If ``direct`` is true (and ``cls`` is not specified), ``obj`` is encoded
+        directly, without building the intermediate ``dump(obj)`` tree first.
+        The result is the same.
+
+        ``only`` and ``exclude`` select the fields to encode by their dotted
+        paths (e.g. ``"customer.id"``), as in ``dump``. The other fields are
+        never converted. ``direct`` is ignored when they are specified.
+
         """
-    d = dump(obj)
+    if direct and cls is None and only is None and exclude is None:
+        return _direct_encoder(skipkeys=skipkeys, ensure_ascii=ensure_ascii, check_circular=check_circular,
+                               allow_nan=allow_nan, indent=indent, separators=separators, default=default,
+                               sort_keys=sort_keys, **kw).encode(obj)
+    d = dump(obj, only=only, exclude=exclude)
     return json.dumps(d, skipkeys=skipkeys, ensure_ascii=ensure_ascii, check_circular=check_circular,
                       allow_nan=allow_nan,
                       cls=cls, indent=indent, separators=separators, default=default, sort_keys=sort_keys, **kw)
+
+
+def json_dump(obj, fp: IO, *, chunk_size: int = DEFAULT_CHUNK_SIZE, skipkeys=False, ensure_ascii=True,
+              check_circular=True, allow_nan=True, cls=None, indent=None, separators=None, default=None,
+              sort_keys=False, direct=False, **kw) -> None:
+    """Serialize ``obj`` as a JSON formatted stream to ``fp`` (a text or binary file-like object, e.g. one
+        returned by ``gzip.open``, ``bz2.open`` or ``lzma.open``).
+
+        The JSON text is written ``chunk_size`` characters at a time, instead of being built as a single string.
+        Binary files are written UTF-8 encoded.
+
+        The other arguments have the same meaning as in ``json_dumps``.
+        """
+    options = dict(skipkeys=skipkeys, ensure_ascii=ensure_ascii, check_circular=check_circular, allow_nan=allow_nan,
+                   indent=indent, separators=separators, default=default, sort_keys=sort_keys, **kw)
+    writer = _ChunkWriter(fp, chunk_size)
+    if direct and cls is None:
+        _direct_encoder(**options).write(obj, writer.write)
+    else:
+        for chunk in (cls or json.JSONEncoder)(**options).iterencode(dump(obj)):
+            writer.write(chunk)
+    writer.flush()
+
+
+def json_load(t: type, fp: IO, *, cls=None, object_hook=None, parse_float=None, parse_int=None,
+              parse_constant=None, object_pairs_hook=None, **kw):
+    """Deserialize ``fp`` (a text or binary file-like object containing a JSON document) to a Python object
+        of type ``t``.
+
+        The arguments have the same meaning as in ``json_loads``.
+        """
+    return json_loads(t, fp.read(), cls=cls, object_hook=object_hook, parse_float=parse_float,
+                      parse_int=parse_int, parse_constant=parse_constant, object_pairs_hook=object_pairs_hook, **kw)
+
+
+def dump_lines(iterable: Iterable, fp: IO, *, chunk_size: int = DEFAULT_CHUNK_SIZE, cls=None, direct=False,
+               **kw) -> int:
+    """Serialize every object in ``iterable`` to ``fp`` (a text or binary file-like object) as newline-delimited
+        JSON (NDJSON): one JSON document per line.
+
+        The lines are written ``chunk_size`` characters at a time. Binary files are written UTF-8 encoded.
+
+        The other arguments have the same meaning as in ``json_dumps``, except ``indent``, which would split the
+        documents over several lines and is rejected.
+
+        Returns the number of objects written.
+        """
+    if kw.get('indent') is not None:
+        raise TypeError("dump_lines() writes one document per line, it does not support indent")
+    if direct and cls is None:
+        encode = _direct_encoder(**kw).encode
+    else:
+        encode = (cls or json.JSONEncoder)(**kw).encode
+        encode = partial(_encode_dumped, encode)
+    writer = _ChunkWriter(fp, chunk_size)
+    count = 0
+    for obj in iterable:
+        writer.write(encode(obj))
+        writer.write('\n')
+        count += 1
+    writer.flush()
+    return count
+
+
+def _encode_dumped(encode: Callable[[Any], str], obj) -> str:
+    return encode(dump(obj))
+
+
+@lru_cache(maxsize=32)
+def _cached_direct_encoder(**options) -> DirectEncoder:
+    return DirectEncoder(**options)
+
+
+def _direct_encoder(**options) -> DirectEncoder:
+    try:
+        return _cached_direct_encoder(**options)
+    except TypeError:  # unhashable option (e.g. a list of separators)
+        return DirectEncoder(**options)
+
+
+def load_lines(t: type, fp: IO, *, cls=None, object_hook=None, parse_float=None, parse_int=None,
+               parse_constant=None, object_pairs_hook=None, **kw) -> Iterator[aliases.Serializable]:
+    """Deserialize the newline-delimited JSON (NDJSON) in ``fp`` (a text or binary file-like object), yielding
+        each line as a Python object of type ``t``. Empty lines are skipped.
+
+        The other arguments have the same meaning as in ``json_loads``.
+        """
+    if cls is None:
+        cls = json.JSONDecoder
+    decode = cls(object_hook=object_hook, parse_float=parse_float, parse_int=parse_int,
+                 parse_constant=parse_constant, object_pairs_hook=object_pairs_hook, **kw).decode
+    for line in fp:
+        if isinstance(line, bytes):
+            line = line.decode()
+        if line.strip():
+            yield load(t, decode(line))
+
+
+def json_iter_load(t: type, fp: IO[Union[str, bytes]], *, chunk_size: int = DEFAULT_CHUNK_SIZE, cls=None,
+                   object_hook=None, parse_float=None, parse_int=None, parse_constant=None, object_pairs_hook=None,
+                   **kw) -> Iterator[aliases.Serializable]:
+    """Deserialize the JSON values in the file-like object ``fp`` (text or binary) one at a time, yielding each
+        as a Python object of type ``t``.
+
+        ``fp`` may contain either a single top-level JSON array, in which case its items are yielded, or a sequence
+        of whitespace separated JSON values, such as newline-delimited JSON (NDJSON).
+        ``fp`` is read ``chunk_size`` characters at a time, so only a single value is held in memory at a time.
+
+        The other arguments have the same meaning as in ``json_loads``.
+        """
+    if cls is None:
+        cls = json.JSONDecoder
+    decoder = cls(object_hook=object_hook, parse_float=parse_float, parse_int=parse_int,
+                  parse_constant=parse_constant, object_pairs_hook=object_pairs_hook, **kw)
+    reader = _ChunkReader(fp, chunk_size)
+
+    first = reader.peek()
+    if first == '[':
+        reader.pos += 1
+        if reader.peek() == ']':
+            reader.pos += 1
+        else:
+            while True:
+                yield load(t, reader.decode(decoder))
+                separator = reader.peek()
+                reader.pos += 1
+                if separator == ']':
+                    break
+                if separator != ',':
+                    raise json.JSONDecodeError("Expecting ',' delimiter", reader.buffer, reader.pos - 1)
+        if reader.peek() is not None:
+            raise json.JSONDecodeError("Extra data", reader.buffer, reader.pos)
+    else:
+        while reader.peek() is not None:
+            yield load(t, reader.decode(decoder))
+
+
+class _ChunkReader:
+    """
+    A buffer over a file-like object that is filled on demand.
+    """
+
+    def __init__(self, fp: IO[Union[str, bytes]], chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self._decoder = None
+
+    def _read(self, size: int = 0) -> bool:
+        """
+        Read at least another chunk (or `size` characters), discarding the consumed part of the buffer.
+        Returns `False` if the end of the file was already reached.
+        """
+        if self.eof:
+            return False
+        chunk = self.fp.read(max(size, self.chunk_size, 4))  # detecting the encoding requires 4 bytes
+        if not chunk:
+            self.eof = True
+        if isinstance(chunk, bytes):
+            if self._decoder is None:
+                self._decoder = codecs.getincrementaldecoder(json.detect_encoding(chunk))()
+            chunk = self._decoder.decode(chunk, final=self.eof)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character, or `None` at the end of the file."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read():
+                return None
+
+    def decode(self, decoder: json.JSONDecoder):
+        """Decode the JSON value at the current position, reading more of the file as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # the value might continue in the next chunk; read as much as was buffered to avoid re-parsing a
+                # large value for every chunk
+                if not self._read(len(self.buffer) - self.pos):
+                    raise
+                continue
+            # a number at the end of the buffer might continue in the next chunk
+            if end < len(self.buffer) or self.eof:
+                self.pos = end
+                return value
+            self._read()
+
+
+class _ChunkWriter:
+    """
+    Collects strings and writes them to a file-like object `chunk_size` characters at a time.
+    """
+
+    def __init__(self, fp: IO, chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.binary = _is_binary(fp)
+        self.parts: List[str] = []
+        self.size = 0
+
+    def write(self, s: str) -> None:
+        self.parts.append(s)
+        self.size += len(s)
+        if self.size >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.parts:
+            return
+        data = ''.join(self.parts)
+        if self.binary:
+            self.fp.write(data.encode())
+        elif self.binary is None:  # unknown: a binary file refuses strings
+            try:
+                self.fp.write(data)
+                self.binary = False
+            except TypeError:
+                self.fp.write(data.encode())
+                self.binary = True
+        else:
+            self.fp.write(data)
+        self.parts.clear()
+        self.size = 0
+
+
+def _is_binary(fp: IO) -> Optional[bool]:
+    """Whether `fp` is a binary file-like object, or `None` if it cannot be told (e.g. a duck-typed object)."""
+    if isinstance(fp, io.TextIOBase):
+        return False
+    if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)):
+        return True
+    mode = getattr(fp, 'mode', None)
+    if isinstance(mode, str):
+        return 'b' in mode
+    return None
@@ -0,0 +1,216 @@
+"""
+Encoding objects directly to JSON, without building the intermediate dict tree of `dump`.
+"""
+import json
+from json.encoder import encode_basestring, encode_basestring_ascii, _make_iterencode, INFINITY
+from typing import Any, Callable, Dict, List, Tuple
+
+from .codegen import annotation_serializers
+from .default_serializers import get_annotations, LAZY_FIELDS
+from .generics import generic_serializers_map, _list_serializer_impl, _dict_serializer_impl, _tuple_serializer_impl
+from .serialization import serializers_map, echo, dump
+
+_UNDEFINED = object()
+
+
+class DirectEncoder:
+    """
+    Encodes objects to JSON, producing the same text as `json.dumps(dump(obj), ...)` with the same options.
+
+    Annotation based classes (e.g. `Obdictive` subclasses), lists, tuples and dicts are walked directly and written as
+    JSON fragments. Values of types with a custom serializer are converted with it, and the result is encoded as usual.
+    """
+
+    def __init__(self, *, skipkeys=False, ensure_ascii=True, check_circular=True, allow_nan=True, indent=None,
+                 separators=None, default=None, sort_keys=False):
+        encoder = json.JSONEncoder(skipkeys=skipkeys, ensure_ascii=ensure_ascii, check_circular=check_circular,
+                                   allow_nan=allow_nan, indent=indent, separators=separators, default=default,
+                                   sort_keys=sort_keys)
+        if indent is not None and not isinstance(indent, str):
+            indent = ' ' * indent
+        self.indent = indent
+        self.skipkeys = skipkeys
+        self.sort_keys = sort_keys
+        self.item_separator = encoder.item_separator
+        self.key_separator = encoder.key_separator
+        self.encode_str = encode_basestring_ascii if ensure_ascii else encode_basestring
+
+        def floatstr(o, _repr=float.__repr__, _inf=INFINITY, _neginf=-INFINITY):
+            if o != o:
+                text = 'NaN'
+            elif o == _inf:
+                text = 'Infinity'
+            elif o == _neginf:
+                text = '-Infinity'
+            else:
+                return _repr(o)
+            if not allow_nan:
+                raise ValueError("Out of range float values are not JSON compliant: " + repr(o))
+            return text
+
+        self.floatstr = floatstr
+        self._primitives: Dict[type, Callable[[Any], str]] = {
+            str: self.encode_str,
+            int: int.__repr__,
+            float: floatstr,
+            bool: lambda o: 'true' if o else 'false',
+        }
+        if indent is None:  # the output doesn't depend on the indentation level, use the (faster) encoder directly
+            self._plain = lambda o, level: encoder.iterencode(o, _one_shot=True)
+        else:
+            self._plain = _make_iterencode({} if check_circular else None, encoder.default, self.encode_str, indent,
+                                           floatstr, self.key_separator, self.item_separator, sort_keys, skipkeys,
+                                           True)
+        self._fields: Dict[type, Tuple[dict, List[Tuple[str, str]]]] = {}
+
+    def encode(self, obj: Any) -> str:
+        parts: List[str] = []
+        self.write(obj, parts.append)
+        return ''.join(parts)
+
+    def write(self, obj: Any, write: Callable[[str], Any], level: int = 0) -> None:
+        """
+        Encode `obj`, passing the JSON text to `write` in fragments.
+        """
+        t = type(obj)
+        method = serializers_map.get(t)
+        if method is echo:
+            primitive = self._primitives.get(t)
+            if primitive is not None:
+                write(primitive(obj))
+            else:
+                self._write_plain(obj, write, level)
+        elif method in annotation_serializers:
+            self._write_fields(obj, write, level)
+        elif method is not None:
+            self._write_plain(method(obj), write, level)
+        else:
+            method = generic_serializers_map.get(t)
+            if method is _list_serializer_impl or method is _tuple_serializer_impl:
+                self._write_list(obj, write, level)
+            elif method is _dict_serializer_impl:
+                self._write_dict(obj, write, level)
+            else:
+                self._write_plain(dump(obj), write, level)
+
+    def _write_plain(self, value: Any, write: Callable[[str], Any], level: int) -> None:
+        for chunk in self._plain(value, level):
+            write(chunk)
+
+    def _get_fields(self, cls: type) -> List[Tuple[str, str]]:
+        """The `(name, encoded key followed by the key separator)` pairs of the annotations of `cls`."""
+        annotations = get_annotations(cls)
+        cached = self._fields.get(cls)
+        if cached is None or cached[0] is not annotations:  # the annotations were reloaded
+            names = list(annotations)
+            if self.sort_keys:
+                names.sort()
+            cached = (annotations, [(name, self.encode_str(name) + self.key_separator) for name in names])
+            self._fields[cls] = cached
+        return cached[1]
+
+    def _write_fields(self, obj: Any, write: Callable[[str], Any], level: int) -> None:
+        first = True
+        newline_indent = None
+        separator = self.item_separator
+        lazy = getattr(obj, LAZY_FIELDS, None)
+        for name, key in self._get_fields(type(obj)):
+            # the fields of lazily loaded objects that were never accessed are written as they were loaded
+            serialized = lazy is not None and name in lazy and name not in obj.__dict__
+            value = lazy[name] if serialized else getattr(obj, name, _UNDEFINED)
+            if value is _UNDEFINED:
+                continue
+            if first:
+                first = False
+                if self.indent is not None:
+                    level += 1
+                    newline_indent = '\n' + self.indent * level
+                    separator = self.item_separator + newline_indent
+                    write('{' + newline_indent + key)
+                else:
+                    write('{' + key)
+            else:
+                write(separator + key)
+            if serialized:
+                self._write_plain(value, write, level)
+            else:
+                self.write(value, write, level)
+        if first:
+            write('{}')
+        elif newline_indent is not None:
+            write('\n' + self.indent * (level - 1) + '}')
+        else:
+            write('}')
+
+    def _write_dict(self, dct: dict, write: Callable[[str], Any], level: int) -> None:
+        items = [(dump(k), v) for k, v in dct.items()]
+        if self.sort_keys:
+            items.sort(key=lambda item: item[0])
+        first = True
+        newline_indent = None
+        separator = self.item_separator
+        for key, value in items:
+            key = self._key(key)
+            if key is _UNDEFINED:
+                continue
+            if first:
+                first = False
+                if self.indent is not None:
+                    level += 1
+                    newline_indent = '\n' + self.indent * level
+                    separator = self.item_separator + newline_indent
+                    write('{' + newline_indent)
+                else:
+                    write('{')
+            else:
+                write(separator)
+            write(key + self.key_separator)
+            self.write(value, write, level)
+        if first:
+            write('{}')
+        elif newline_indent is not None:
+            write('\n' + self.indent * (level - 1) + '}')
+        else:
+            write('}')
+
+    def _key(self, key: Any) -> Any:
+        """The encoded key, `_UNDEFINED` if it should be skipped."""
+        if isinstance(key, str):
+            return self.encode_str(key)
+        elif isinstance(key, float):
+            return self.encode_str(self.floatstr(key))
+        elif key is True:
+            return '"true"'
+        elif key is False:
+            return '"false"'
+        elif key is None:
+            return '"null"'
+        elif isinstance(key, int):
+            return self.encode_str(int.__repr__(key))
+        elif self.skipkeys:
+            return _UNDEFINED
+        raise TypeError(F'keys must be str, int, float, bool or None, not {key.__class__.__name__}')
+
+    def _write_list(self, lst, write: Callable[[str], Any], level: int) -> None:
+        if not lst:
+            write('[]')
+            return
+        if self.indent is not None:
+            level += 1
+            newline_indent = '\n' + self.indent * level
+            separator = self.item_separator + newline_indent
+            write('[' + newline_indent)
+        else:
+            newline_indent = None
+            separator = self.item_separator
+            write('[')
+        first = True
+        for value in lst:
+            if first:
+                first = False
+            else:
+                write(separator)
+            self.write(value, write, level)
+        if newline_indent is not None:
+            write('\n' + self.indent * (level - 1))
+        write(']')
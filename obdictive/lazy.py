@@ -0,0 +1,140 @@
+"""
+Lazy deserialization (`load(cls, value, lazy=True)`).
+
+A lazily loaded `Obdictive` instance decodes its primitive fields right away, and keeps the serialized values of the
+other fields (nested objects, collections, custom types) in `_obdictive_lazy`. A field is decoded the first time it is
+accessed (by `Obdictive.__getattr__`, which is only called for attributes missing from the instance), and the result is
+stored on the instance. Fields that were never accessed are dumped as the original serialized values.
+"""
+from typing import Any, Dict, Optional
+
+from . import aliases
+from .default_serializers import get_annotations, get_defaults, LAZY_FIELDS
+from .deserialization import load, get_plan, get_field_plans, resolve_generic, lazy_plans_cache, _cache_plan, \
+    _list_plan, _dict_plan, _variadic_tuple_plan
+from .generics import _list_deserializer_impl, _dict_deserializer_impl, _tuple_deserializer_impl, \
+    generic_deserializers_map
+from .serialization import dump
+from .tracking import adopt, tracked_containers
+
+_PRIMITIVES = (int, str, float, bool)
+"""Fields decoded by one of these are decoded eagerly, as keeping them for later costs about as much."""
+
+_UNDEFINED = object()
+"""An value that denotes that an attribute is not defined."""
+
+
+def get_lazy_plan(cls: Any) -> aliases.Deserializer:
+    """
+    The lazy decoder of `cls`: for `Obdictive` subclasses (see `supports_lazy`), and lists, tuples and dicts of them.
+    Other types are decoded by their usual decoder.
+    """
+    try:
+        plan = lazy_plans_cache.get(cls)
+    except TypeError:  # unhashable type annotation
+        return get_plan(cls)
+    if plan is not None:
+        return plan
+    from . import deserialization
+    version = deserialization.plans_version
+    plan = _build_lazy_plan(cls) or get_plan(cls)
+    _cache_plan(lazy_plans_cache, cls, plan, version)
+    return plan
+
+
+def supports_lazy(cls: Any) -> bool:
+    """
+    Whether `cls` can be loaded lazily: an `Obdictive` subclass with a generated constructor, whose instances have a
+    `__dict__` (i.e. not `slots=True`).
+    """
+    from .codegen import annotation_deserializer, obdictive_deserializers, GENERATED_FOR
+    return isinstance(cls, type) and annotation_deserializer(cls) in obdictive_deserializers \
+        and cls.__dictoffset__ != 0 and hasattr(cls, LAZY_FIELDS) \
+        and getattr(cls.__init__, GENERATED_FOR, None) is cls and cls.__new__ is object.__new__
+
+
+def _build_lazy_plan(cls: Any) -> Optional[aliases.Deserializer]:
+    if not supports_lazy(cls):
+        return _lazy_collection_plan(cls)
+    fields = tuple((name, plan, plan in _PRIMITIVES) for name, plan in get_field_plans(cls))
+    defaults = get_defaults(cls)
+    new = object.__new__
+
+    def load_lazy(value):
+        obj = new(cls)
+        values = obj.__dict__
+        lazy = {}
+        for name, plan, eager in fields:
+            if name in value:
+                if eager:
+                    values[name] = plan(value[name])
+                else:
+                    lazy[name] = value[name]
+            elif name in defaults:
+                values[name] = defaults[name]
+        if lazy:
+            values[LAZY_FIELDS] = lazy
+        return obj
+
+    return load_lazy
+
+
+def _lazy_collection_plan(cls: Any) -> Optional[aliases.Deserializer]:
+    """
+    Lists, variadic tuples and dicts of lazily loaded objects.
+    """
+    generic = resolve_generic(cls)
+    if generic is None:
+        return None
+    base_cls, types = generic
+    generic_deserializer = generic_deserializers_map[base_cls]
+    if base_cls is list and generic_deserializer is _list_deserializer_impl and len(types) == 1 \
+            and supports_lazy(types[0]):
+        return _list_plan(get_lazy_plan(types[0]))
+    if base_cls is tuple and generic_deserializer is _tuple_deserializer_impl and len(types) == 2 \
+            and types[1] is Ellipsis and supports_lazy(types[0]):
+        return _variadic_tuple_plan(get_lazy_plan(types[0]))
+    if base_cls is dict and generic_deserializer is _dict_deserializer_impl and len(types) == 2 \
+            and supports_lazy(types[1]):
+        return _dict_plan(get_plan(types[0]), get_lazy_plan(types[1]))
+    return None
+
+
+def decode_field(obj: Any, name: str) -> Any:
+    """
+    Decode the lazy field `name` of `obj`, and store it on the instance.
+    Nested objects are loaded lazily as well.
+    """
+    values = obj.__dict__
+    lazy: Dict[str, Any] = values[LAZY_FIELDS]
+    value = load(get_annotations(obj.__class__)[name], lazy[name], lazy=True)
+    container = tracked_containers(obj.__class__).get(name)
+    if container is not None:
+        value = adopt(container, value)
+    values[name] = value
+    # the pending fields are replaced rather than modified, as copies of `obj` share them
+    rest = {n: v for n, v in lazy.items() if n != name}
+    if rest:
+        values[LAZY_FIELDS] = rest
+    else:
+        values.pop(LAZY_FIELDS, None)
+    return value
+
+
+def dump_lazy(obj: Any) -> dict:
+    """
+    Serialize a lazily loaded object. Fields that were never accessed are returned as they were loaded.
+    """
+    values = obj.__dict__
+    lazy = values.get(LAZY_FIELDS) or {}
+    d = {}
+    for name in get_annotations(obj.__class__):
+        if name in values:
+            d[name] = dump(values[name])
+        elif name in lazy:
+            d[name] = lazy[name]
+        else:
+            value = getattr(obj, name, _UNDEFINED)
+            if value is not _UNDEFINED:
+                d[name] = dump(value)
+    return d
@@ -4,7 +4,9 @@ Obdictive class and class-oriented methods (serializable).
 from __future__ import annotations
 
 import sys
-from typing import Any, Union
+from abc import ABCMeta
+from time import perf_counter
+from typing import Any, Optional, Union
 
 from .generics import generics_map
 
@@ -16,30 +18,123 @@ else:
     from typing import List, Dict
 
 from .serialization import dump
-from .deserialization import load
+from .deserialization import get_field_plans
 from . import json, config, aliases
 from .decorators import serializable, serializer, deserializer
-from .default_serializers import get_annotations
+from .default_serializers import get_annotations, get_defaults, SET_ANNOTATIONS, IGNORE_ANNOTATIONS, \
+    ADD_ANNOTATIONS, SLOT_DEFAULTS, FROZEN, ORDER, CACHED_HASH, TRACK, DUMP_CACHE, PARENTS, TAG, TAG_FIELD, \
+    DEFAULT_TAG_FIELD
+from .lazy import decode_field, dump_lazy
+from .serialization import set_serializer
+from .tracking import dump_tracked, tracked_setattr, tracked_delattr, tracked_containers, adopt
+from .obdictive_exceptions import FrozenInstanceException
+from .registry import Registry
+from .instrumentation import class_phase, class_created
+from .codegen import generated_methods, obdictive_methods, obdictive_bases, get_constructor, compiled_serializer, \
+    annotation_serializers, annotation_deserializers, obdictive_deserializers
 
 _UNDEFINED = object()
 """An value that denotes that an attribute is not defined."""
 
 
+class ObdictiveMeta(ABCMeta):
+    """
+    The metaclass of `Obdictive`. Handles the class options that change how the class is built:
+
+    - `slots=True`: store the annotated variables in `__slots__` instead of a per-instance `__dict__`.
+    - `frozen=True`: forbid assigning and deleting variables after construction, and hash the variables (once).
+      Inherited by subclasses.
+    - `order=True`: generate `<`, `<=`, `>` and `>=`, comparing the variables in the order of the annotations.
+      Inherited by subclasses.
+    - `track=True`: keep the result of `dump`, and reuse it until the object changes (see `tracking`).
+      Inherited by subclasses.
+
+    Derives from `ABCMeta`, so that `Obdictive` subclasses can derive from `abc.ABC` too (the metaclasses would
+    conflict otherwise).
+    """
+
+    def __new__(mcs, name, bases, namespace, slots: bool = False, frozen: Optional[bool] = None,
+                order: Optional[bool] = None, track: Optional[bool] = None, **kwargs):
+        frozen_base = any(getattr(base, FROZEN, False) for base in bases)
+        tracked_base = any(getattr(base, TRACK, False) for base in bases)
+        if frozen is not None:
+            if frozen_base and not frozen:
+                raise TypeError(F"{name} derives from a frozen class, it cannot use frozen=False")
+            namespace[FROZEN] = frozen
+        if order is not None:
+            namespace[ORDER] = order
+        if track is not None:
+            namespace[TRACK] = track
+        if slots:
+            extra = (CACHED_HASH,) if frozen or frozen_base else ()
+            if track or (track is None and tracked_base):
+                extra += (DUMP_CACHE, PARENTS)
+                if not any(base.__weakrefoffset__ for base in bases):  # tracked objects are weakly referenced
+                    extra += ('__weakref__',)
+            namespace = _slotted_namespace(name, bases, namespace, extra)
+        start = perf_counter()
+        cls = super().__new__(mcs, name, bases, namespace, **kwargs)
+        class_created(cls, start)
+        return cls
+
+
+def _slotted_namespace(name: str, bases: tuple, namespace: dict, extra: tuple = ()) -> dict:
+    """
+    Add `__slots__` for the variables annotated in `namespace` (and `extra`) which are not slots of a base class
+    already.
+    Their default values are moved to `_slot_defaults`, as a slot cannot have a class attribute of the same name.
+    """
+    if '__slots__' in namespace:
+        raise TypeError(F"{name} defines __slots__, it cannot use slots=True")
+    annotations = namespace.get(SET_ANNOTATIONS, None) or namespace.get('__annotations__', {})
+    ignore = namespace.get(IGNORE_ANNOTATIONS, set())
+    names = [n for n in annotations if n not in ignore]
+    names += [n for n in namespace.get(ADD_ANNOTATIONS, {}) if n not in annotations]
+    if namespace.get(TAG) is not None:  # the tag field is set on the instances
+        names.append(namespace.get(TAG_FIELD) or next(
+            (getattr(base, TAG_FIELD) for base in bases if hasattr(base, TAG_FIELD)), DEFAULT_TAG_FIELD))
+    names += [n for n in extra if n not in names]
+
+    inherited = set()
+    for base in bases:
+        for c in base.__mro__:
+            c_slots = c.__dict__.get('__slots__', ())
+            inherited.update((c_slots,) if isinstance(c_slots, str) else c_slots)
+    slots = tuple(n for n in names if n not in inherited)
+
+    namespace = dict(namespace)
+    namespace[SLOT_DEFAULTS] = {n: namespace.pop(n) for n in slots if n in namespace and n not in extra}
+    namespace['__slots__'] = slots
+    return namespace
+
+
 @serializable
-class Obdictive:
+class Obdictive(metaclass=ObdictiveMeta):
     """
     Derive from this class to create serializable classes easily.
     Declare the variables using annotations (type hints).
 
     The following methods will be implemented:
 
-    - A constructor that takes in the variables as named arguments.
+    - A constructor that takes in the variables as named arguments. It is generated for each class, assigning the
+      variables directly, with the default values baked in.
     - serializer and deserializer based on the variables in the annotations and their types.
-    - __eq__ and __ne__ comparing the values of the variables in the annotations.
+    - __eq__ and __ne__ comparing the values of the variables in the annotations (also generated for each class).
     - __hash__ hashing the values of the variables in the annotations. If any type errors arise, will use the standard hasher instead.
+      Frozen classes hash their variables once, and keep the hash on the instance.
     - __str__ in the form of <class name>(<variable0>=<value0>, <variable1>=<value1>...).
     - __repr__ using `json_dumps`.
 
+    Subclasses can pass `slots=True` to store the variables in `__slots__` instead of a per-instance `__dict__`
+    (e.g. `class Pet(Obdictive, slots=True)`), which makes the instances much smaller.
+    Default values keep working, but are kept in `_slot_defaults` instead of class attributes.
+
+    Subclasses can pass `frozen=True` to make their instances immutable (assignments raise `FrozenInstanceException`),
+    which lets them be hashed once and used safely as dict keys, and `order=True` to make them sortable
+    (e.g. `class Version(Obdictive, frozen=True, order=True)`).
+    Subclasses can pass `track=True` to keep the result of `dump` until the instance (or an object or `OList` / `ODict`
+    in it) changes, so that only the changed branches are serialized again.
+
     Example:
 
     >>> from obdictive import *
@@ -71,19 +166,28 @@ class Obdictive:
 
     """
 
-    def __init__(self, **kwargs):
-        annotations = get_annotations(self.__class__)
-        self.__class__._sorted_annotations = sorted(annotations.keys())
+    __slots__ = ()
+    _frozen = False
+    _order = False
+    _track = False
+    _obdictive_lazy = None
 
-        for name, cls in annotations.items():
+    def __init__(self, **kwargs):
+        set_attribute = object.__setattr__ if self._frozen else setattr
+        defaults = get_defaults(self.__class__)
+        for name, cls in get_annotations(self.__class__).items():
             if name in kwargs:  # argument is in keyword arguments
                 value = kwargs[name]
-                setattr(self, name, value)
-            elif hasattr(self.__class__, name):
-                setattr(self, name, getattr(self.__class__, name))
+                set_attribute(self, name, value)
+            elif name in defaults:
+                set_attribute(self, name, defaults[name])
 
     @serializer
     def _serializer(self) -> dict:
+        if config.compile_serializers:
+            return compiled_serializer(self.__class__)(self)
+        if self._obdictive_lazy is not None:
+            return dump_lazy(self)
         d: Dict[str, Any] = dict()
         for name, cls in get_annotations(self.__class__).items():
             if hasattr(self, name):
@@ -94,13 +198,7 @@ class Obdictive:
     @classmethod
     @deserializer
     def _deserializer(cls, val):
-        kwargs = dict()
-        for name, typ in get_annotations(cls).items():
-            if name in val:  # argument is in keyword arguments
-                value = val[name]
-                loaded_value = load(typ, value)
-                kwargs[name] = loaded_value
-        return cls(**kwargs)
+        return get_constructor(cls)(val, get_field_plans(cls))
 
     @classmethod
     def __init_subclass__(cls, **kwargs):
@@ -111,6 +209,29 @@ class Obdictive:
         """
         super().__init_subclass__(**kwargs)
         serializable(cls, deep_search=True)
+        methods = {}
+        if cls._frozen or cls._track:
+            methods.update(__getstate__=_getstate, __setstate__=_setstate)
+        if cls._frozen:
+            methods.update(__setattr__=_frozen_setattr, __delattr__=_frozen_delattr)
+        elif cls._track:
+            methods.update(__setattr__=tracked_setattr, __delattr__=tracked_delattr)
+        for name, method in methods.items():
+            if name not in cls.__dict__:
+                setattr(cls, name, method)
+        if cls._track:
+            with class_phase(cls, 'registration'):
+                set_serializer(cls, dump_tracked)
+        with class_phase(cls, 'methods'):
+            for name, method in generated_methods(cls, lazy=True).items():
+                setattr(cls, name, method)
+
+    def __getattr__(self, name: str) -> Any:
+        # only called for attributes missing from the instance: decodes the fields of lazily loaded instances
+        lazy = self._obdictive_lazy
+        if lazy is None or name not in lazy:
+            raise AttributeError(F"'{self.__class__.__name__}' object has no attribute '{name}'")
+        return decode_field(self, name)
 
     def __eq__(self, o: object) -> bool:
         if o is None:
@@ -128,11 +249,11 @@ class Obdictive:
 
     def __hash__(self) -> int:
         if not config.hash_dict_class:
-            return hash(self)
+            return object.__hash__(self)
         try:
-            return hash(getattr(self, x, _UNDEFINED) for x in _get_sorted_annotations(self.__class__))
+            return hash(tuple(getattr(self, x, _UNDEFINED) for x in _get_sorted_annotations(self.__class__)))
         except TypeError:
-            return hash(self)
+            return object.__hash__(self)
 
     def __str__(self) -> str:
         attrs = []
@@ -150,6 +271,51 @@ class Obdictive:
         return json.json_dumps(self)
 
 
+annotation_serializers.add(Obdictive._serializer)
+annotation_deserializers.add(Obdictive._deserializer.__func__)
+obdictive_deserializers.add(Obdictive._deserializer.__func__)
+
+
+def _frozen_hash(self: Obdictive) -> int:
+    h = hash(tuple(getattr(self, x, _UNDEFINED) for x in get_annotations(self.__class__)))
+    object.__setattr__(self, CACHED_HASH, h)
+    return h
+
+
+obdictive_methods.update({'__init__': Obdictive.__init__, '__eq__': Obdictive.__eq__, '__hash__': _frozen_hash})
+obdictive_bases.add(Obdictive)
+
+
+def _frozen_setattr(self: Obdictive, name: str, value: Any) -> None:
+    raise FrozenInstanceException(F"cannot assign to field '{name}' of frozen {self.__class__.__name__}")
+
+
+def _frozen_delattr(self: Obdictive, name: str) -> None:
+    raise FrozenInstanceException(F"cannot delete field '{name}' of frozen {self.__class__.__name__}")
+
+
+_INTERNAL_STATE = (CACHED_HASH, DUMP_CACHE, PARENTS)
+
+
+def _getstate(self: Obdictive) -> dict:
+    # the cached hash (string hashes differ between processes) and the kept dump are left out
+    state = dict(getattr(self, '__dict__', {}))
+    for name in get_annotations(self.__class__):
+        if name not in state and hasattr(self, name):  # slots
+            state[name] = getattr(self, name)
+    for name in _INTERNAL_STATE:
+        state.pop(name, None)
+    return state
+
+
+def _setstate(self: Obdictive, state: dict) -> None:
+    containers = tracked_containers(self.__class__)
+    for name, value in state.items():
+        if name in containers:
+            value = adopt(containers[name], value)
+        object.__setattr__(self, name, value)
+
+
 def _list_str(lst: list):
     str_list = []
     for item in lst:
@@ -160,13 +326,11 @@ def _list_str(lst: list):
     return F"[{', '.join(str_list)}]"
 
 
-_sorted_annotations_cache: Dict[type, List[str]] = {}
+_sorted_annotations_cache: Registry[type, List[str]] = Registry()
 
 
 def _get_sorted_annotations(cls: type) -> list:
-    global _sorted_annotations_cache
-    if cls in _sorted_annotations_cache:
-        return _sorted_annotations_cache[cls]
-    sorted_annotations = sorted(get_annotations(cls).keys())
-    _sorted_annotations_cache[cls] = sorted_annotations
+    sorted_annotations = _sorted_annotations_cache.get(cls)
+    if sorted_annotations is None:
+        sorted_annotations = _sorted_annotations_cache.setdefault(cls, sorted(get_annotations(cls).keys()))
     return sorted_annotations
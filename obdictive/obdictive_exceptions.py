@@ -15,3 +15,7 @@ class ObdictiveDeserializationException(Exception):
 
 class GenericSerializationException(ObdictiveSerializationException):
     """An exception in obdictive generic serialization code"""
+
+
+class FrozenInstanceException(ObdictiveException, AttributeError):
+    """An attempt to assign or delete a variable of a frozen `Obdictive` instance"""
@@ -0,0 +1,47 @@
+"""
+Helpers of the formats that read and write annotation based objects field by field (`binary`, `columns`).
+"""
+from typing import Any, Callable, Dict, Tuple
+
+from .codegen import annotation_deserializer, obdictive_deserializers, get_constructor, is_compilable
+from .default_serializers import get_annotations, get_defaults
+from .serialization import serializers_map
+from .tracking import dump_tracked
+
+
+def is_object(t: Any) -> bool:
+    """Whether `t` is serialized and deserialized by its annotations."""
+    if not isinstance(t, type) or annotation_deserializer(t) is None:
+        return False
+    return is_compilable(t) or serializers_map.get(t) is dump_tracked
+
+
+def identity(value: Any) -> Any:
+    return value
+
+
+def object_constructor(cls: type) -> Callable[[Dict[str, Any], tuple], Any]:
+    """
+    Creates an instance of `cls` from its serialized fields and their decoders (e.g. `get_field_plans(cls)`, or
+    `identity_plans(cls)` for fields that are decoded already), like its deserializer does.
+    """
+    if annotation_deserializer(cls) in obdictive_deserializers:
+        return get_constructor(cls)
+
+    defaults = list(get_defaults(cls).items())
+
+    def construct_default(val, fields):
+        obj = cls()
+        for name, value in defaults:
+            setattr(obj, name, value)
+        for name, plan in fields:
+            if name in val:
+                setattr(obj, name, plan(val[name]))
+        return obj
+
+    return construct_default
+
+
+def identity_plans(cls: type) -> Tuple[Tuple[str, Callable[[Any], Any]], ...]:
+    """Field decoders for the constructors, of fields that are decoded already."""
+    return tuple((name, identity) for name in get_annotations(cls))
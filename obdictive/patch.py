@@ -0,0 +1,201 @@
+"""
+Structural diffs between objects, as JSON patches (RFC 6902).
+
+`diff(a, b)` walks two objects by their annotations and returns the operations that turn `a` into `b`:
+`{"op": "replace" | "add" | "remove", "path": "/pets/0/age", "value": <serialized value>}`.
+Unchanged values (the same object, or equal values) produce no operations, so the patch is proportional to the change.
+`apply_patch(obj, patch)` applies such a patch, deserializing the values by the annotations along each path.
+"""
+import copy
+from typing import Any, Dict, List, Optional
+
+from .codegen import annotation_serializers
+from .default_serializers import get_annotations, FROZEN, CACHED_HASH
+from .deserialization import load, resolve_generic
+from .serialization import serializers_map, dump
+from .tracking import dump_tracked
+
+Patch = List[Dict[str, Any]]
+"""A list of JSON patch operations."""
+
+_UNDEFINED = object()
+"""An value that denotes that an attribute is not defined."""
+
+
+def diff(a: Any, b: Any) -> Patch:
+    """
+    The JSON patch (RFC 6902) that turns `a` into `b`.
+
+    Objects are compared by their annotations, lists and tuples by position, dicts by key. Any other value that is not
+    equal (or of a different type) is replaced as a whole.
+    """
+    ops: Patch = []
+    _diff(a, b, [], ops)
+    return ops
+
+
+_PRIMITIVES = frozenset((int, str, float, bool, type(None)))
+"""Values compared directly, without recursing into `_diff`."""
+
+
+def _is_object(t: type) -> bool:
+    method = serializers_map.get(t)
+    return method in annotation_serializers or method is dump_tracked
+
+
+def _diff(a: Any, b: Any, keys: List[Any], ops: Patch) -> None:
+    """
+    Append the operations turning `a` into `b` to `ops`. `keys` is the path to them, and is restored before returning.
+    """
+    if a is b:
+        return
+    t = type(b)
+    if type(a) is not t:
+        ops.append({'op': 'replace', 'path': _pointer(keys), 'value': dump(b)})
+    elif _is_object(t):
+        if getattr(t, FROZEN, False):  # equal if both are hashed already, and equal (usually the case)
+            hash_a = getattr(a, CACHED_HASH, None)
+            if hash_a is not None and hash_a == getattr(b, CACHED_HASH, None) and a == b:
+                return
+        for name in get_annotations(t):
+            value_a = getattr(a, name, _UNDEFINED)
+            value_b = getattr(b, name, _UNDEFINED)
+            if value_a is value_b or (type(value_b) in _PRIMITIVES and type(value_a) is type(value_b)
+                                      and value_a == value_b):
+                continue
+            keys.append(name)
+            if value_b is _UNDEFINED:
+                ops.append({'op': 'remove', 'path': _pointer(keys)})
+            elif value_a is _UNDEFINED:
+                ops.append({'op': 'add', 'path': _pointer(keys), 'value': dump(value_b)})
+            else:
+                _diff(value_a, value_b, keys, ops)
+            keys.pop()
+    elif isinstance(b, (list, tuple)):
+        common = min(len(a), len(b))
+        for i in range(common):
+            item_a, item_b = a[i], b[i]
+            if item_a is item_b or (type(item_b) in _PRIMITIVES and type(item_a) is type(item_b) and item_a == item_b):
+                continue
+            keys.append(i)
+            _diff(item_a, item_b, keys, ops)
+            keys.pop()
+        for i in range(common, len(b)):
+            ops.append({'op': 'add', 'path': _pointer(keys + [i]), 'value': dump(b[i])})
+        for i in reversed(range(common, len(a))):
+            ops.append({'op': 'remove', 'path': _pointer(keys + [i])})
+    elif isinstance(b, dict):
+        for key, value_a in a.items():
+            value_b = b.get(key, _UNDEFINED)
+            keys.append(dump(key))
+            if value_b is _UNDEFINED:
+                ops.append({'op': 'remove', 'path': _pointer(keys)})
+            else:
+                _diff(value_a, value_b, keys, ops)
+            keys.pop()
+        for key, value_b in b.items():
+            if key not in a:
+                ops.append({'op': 'add', 'path': _pointer(keys + [dump(key)]), 'value': dump(value_b)})
+    elif a != b:
+        ops.append({'op': 'replace', 'path': _pointer(keys), 'value': dump(b)})
+
+
+def _pointer(keys: List[Any]) -> str:
+    # JSON pointer (RFC 6901) escaping
+    return "".join(F"/{str(key).replace('~', '~0').replace('/', '~1')}" for key in keys)
+
+
+def _split(path: str) -> List[str]:
+    if not path:
+        return []
+    if not path.startswith('/'):
+        raise ValueError(F"Invalid JSON pointer {path!r}")
+    return [part.replace('~1', '/').replace('~0', '~') for part in path[1:].split('/')]
+
+
+def apply_patch(obj: Any, patch: Patch) -> Any:
+    """
+    Apply a JSON patch (as returned by `diff`) to `obj`.
+
+    Objects, lists and dicts along the paths are modified in place; only frozen objects and tuples are rebuilt (copied
+    with the change), along with the values containing them. The values are deserialized by the annotations.
+
+    :return: `obj`, or its replacement if it was rebuilt.
+    """
+    for op in patch:
+        if op['op'] not in ('add', 'remove', 'replace'):
+            raise ValueError(F"Unsupported patch operation {op['op']!r}")
+        obj = _apply(obj, type(obj), _split(op['path']), op)
+    return obj
+
+
+def _apply(target: Any, t: Any, keys: List[str], op: Dict[str, Any]) -> Any:
+    """
+    Apply `op` at `keys` under `target` (annotated as `t`), and return the new value of `target`.
+    """
+    if not keys:
+        if op['op'] == 'remove':
+            raise ValueError("Cannot remove the patched object itself")
+        return _load(t, op['value'])
+    key, rest = keys[0], keys[1:]
+
+    if _is_object(type(target)):
+        annotations = get_annotations(type(target))
+        if key not in annotations:
+            raise ValueError(F"{type(target).__name__} has no field {key!r}")
+        if getattr(type(target), FROZEN, False):
+            target = copy.copy(target)  # the cached hash is not copied
+            set_attribute, delete_attribute = object.__setattr__, object.__delattr__
+        else:
+            set_attribute, delete_attribute = setattr, delattr
+        if not rest and op['op'] == 'remove':
+            delete_attribute(target, key)
+        else:
+            # assigned even if changed in place, so that tracked objects see the change
+            set_attribute(target, key, _apply(getattr(target, key, None), annotations[key], rest, op))
+        return target
+
+    if isinstance(target, (list, tuple)):
+        items = list(target) if isinstance(target, tuple) else target
+        index = len(items) if key == '-' else int(key)
+        item_type = _item_type(t, index)
+        if rest:
+            items[index] = _apply(items[index], item_type, rest, op)
+        elif op['op'] == 'remove':
+            del items[index]
+        elif op['op'] == 'add':
+            items.insert(index, _load(item_type, op['value']))
+        else:
+            items[index] = _load(item_type, op['value'])
+        return type(target)(items) if isinstance(target, tuple) else items
+
+    if isinstance(target, dict):
+        generic = resolve_generic(t)
+        key_type, value_type = generic[1] if generic is not None and len(generic[1]) == 2 else (None, None)
+        k = _load(key_type, key)
+        if rest:
+            target[k] = _apply(target[k], value_type, rest, op)
+        elif op['op'] == 'remove':
+            del target[k]
+        else:
+            target[k] = _load(value_type, op['value'])
+        return target
+
+    raise ValueError(F"Cannot patch {type(target).__name__} at {key!r}")
+
+
+def _load(t: Any, value: Any) -> Any:
+    # values of unknown types (e.g. the items of an unannotated `list`) are kept as they are
+    return value if t is None else load(t, value)
+
+
+def _item_type(t: Any, index: int) -> Optional[Any]:
+    generic = resolve_generic(t)
+    if generic is None:
+        return None
+    types = generic[1]
+    if len(types) == 2 and types[1] is Ellipsis:
+        return types[0]
+    if len(types) == 1:
+        return types[0]
+    return types[index] if index < len(types) else None
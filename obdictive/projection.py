@@ -0,0 +1,234 @@
+"""
+Projections: loading and dumping only some of the fields of objects (`only=` / `exclude=`).
+
+The fields are selected by dotted paths through the annotations (e.g. `"customer.id"`). Paths go through lists, tuples
+and dicts, applying to each of their items (e.g. `"pets.name"` for `pets: List[Pet]`), and through the variants of
+unions that have fields (e.g. `Optional[Customer]`, whose `None` is kept). The fields that are not selected are skipped
+entirely: they are never converted, and are left unset on loaded objects.
+"""
+import typing
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from . import aliases
+from .codegen import annotation_deserializer, annotation_serializers, obdictive_deserializers, GENERATED_FOR
+from .default_serializers import get_annotations, get_defaults, FROZEN
+from .deserialization import get_plan, resolve_generic, projected_plans_cache, _cache_plan, _list_plan, _dict_plan, \
+    _tuple_plan, _variadic_tuple_plan
+from .generics import generic_deserializers_map, _list_deserializer_impl, _dict_deserializer_impl, \
+    _tuple_deserializer_impl
+from .registry import Registry
+from .serialization import serializers_map, dump
+from .tracking import dump_tracked
+from .unions import union_plan, _UNION_TYPES
+
+Tree = Dict[str, Optional['Tree']]
+"""Field names mapped to the selected paths under them, or to `None` if the whole field is selected."""
+
+_UNDEFINED = object()
+"""An value that denotes that an attribute is not defined."""
+
+
+class Projection:
+    """
+    A compiled set of `only` and `exclude` paths.
+    """
+
+    def __init__(self, only: Optional[Tree], exclude: Optional[Tree]):
+        self.only = only
+        self.exclude = exclude
+        self._fields: Dict[type, Tuple[dict, List[Tuple[str, Optional['Projection']]]]] = {}
+
+    def fields(self, cls: type) -> List[Tuple[str, Optional['Projection']]]:
+        """
+        The selected annotations of `cls`, each with the projection of its value (`None` if it is selected as a whole).
+
+        :raises ValueError: If a path names a field `cls` doesn't have.
+        """
+        annotations = get_annotations(cls)
+        cached = self._fields.get(cls)
+        if cached is None or cached[0] is not annotations:  # the annotations were reloaded
+            for tree in (self.only, self.exclude):
+                for name in tree or ():
+                    if name not in annotations:
+                        raise ValueError(F"{cls.__name__} has no field {name!r}")
+            cached = (annotations, [field for field in map(self._select, annotations) if field is not None])
+            self._fields[cls] = cached
+        return cached[1]
+
+    def _select(self, name: str) -> Optional[Tuple[str, Optional['Projection']]]:
+        only = exclude = None
+        if self.only is not None:
+            if name not in self.only:
+                return None
+            only = self.only[name]
+        if self.exclude is not None and name in self.exclude:
+            exclude = self.exclude[name]
+            if exclude is None:  # excluded as a whole
+                return None
+        return name, None if only is None and exclude is None else Projection(only, exclude)
+
+
+_projections: Registry[tuple, Projection] = Registry()
+"""A cache of the compiled projections, by their paths."""
+
+
+def get_projection(only: Optional[Iterable[str]], exclude: Optional[Iterable[str]]) -> Projection:
+    """
+    Compile `only` and `exclude` (dotted field paths) to a `Projection`.
+    """
+    key = (None if only is None else tuple(only), None if exclude is None else tuple(exclude))
+    projection = _projections.get(key)
+    if projection is None:
+        projection = _projections.setdefault(key, Projection(_tree(key[0]), _tree(key[1])))
+    return projection
+
+
+def _tree(paths: Optional[Tuple[str, ...]]) -> Optional[Tree]:
+    if paths is None:
+        return None
+    tree: Tree = {}
+    for path in paths:
+        node = tree
+        *parents, last = path.split('.')
+        for name in parents:
+            if name in node and node[name] is None:  # the whole field is already selected
+                break
+            node = node.setdefault(name, {})
+        else:
+            node[last] = None
+    return tree
+
+
+# ------------------------- Loading -----------------------
+
+
+def get_projected_plan(cls: Any, only: Optional[Iterable[str]], exclude: Optional[Iterable[str]]) \
+        -> aliases.Deserializer:
+    """
+    A decoder of `cls` that converts only the fields selected by `only` and `exclude`.
+    """
+    projection = get_projection(only, exclude)
+    key = (cls, projection)
+    try:
+        plan = projected_plans_cache.get(key)
+    except TypeError:  # unhashable type annotation
+        return _projected_plan(cls, projection)
+    if plan is not None:
+        return plan
+    from . import deserialization
+    version = deserialization.plans_version
+    plan = _projected_plan(cls, projection)
+    _cache_plan(projected_plans_cache, key, plan, version)
+    return plan
+
+
+def _projected_plan(cls: Any, projection: Optional[Projection]) -> aliases.Deserializer:
+    if projection is None:
+        return get_plan(cls)
+
+    generic = resolve_generic(cls)
+    if generic is not None:
+        base_cls, types = generic
+        generic_deserializer = generic_deserializers_map[base_cls]
+        if base_cls is list and generic_deserializer is _list_deserializer_impl and len(types) == 1:
+            return _list_plan(_projected_plan(types[0], projection))
+        if base_cls is dict and generic_deserializer is _dict_deserializer_impl and len(types) == 2:
+            return _dict_plan(get_plan(types[0]), _projected_plan(types[1], projection))
+        if base_cls is tuple and generic_deserializer is _tuple_deserializer_impl:
+            if len(types) == 2 and types[1] is Ellipsis:
+                return _variadic_tuple_plan(_projected_plan(types[0], projection))
+            return _tuple_plan(tuple(_projected_plan(t, projection) for t in types))
+    elif annotation_deserializer(cls) is not None:
+        return _object_plan(cls, projection)
+    elif typing.get_origin(cls) in _UNION_TYPES:
+        return _union_plan(typing.get_args(cls), projection)
+    raise ValueError(F"Cannot select the fields of {getattr(cls, '__name__', cls)}")
+
+
+def _union_plan(variants: Tuple[Any, ...], projection: Projection) -> aliases.Deserializer:
+    """The paths apply to the variants that have fields (e.g. `Customer` of `Optional[Customer]`)."""
+    def plan_of(variant):
+        if _selectable(variant):
+            return _projected_plan(variant, projection)
+        return get_plan(variant)
+
+    if not any(map(_selectable, variants)):
+        raise ValueError(F"Cannot select the fields of {variants}")
+    return union_plan(variants, plan_of)
+
+
+def _selectable(cls: Any) -> bool:
+    return annotation_deserializer(cls) is not None or resolve_generic(cls) is not None \
+        or typing.get_origin(cls) in _UNION_TYPES
+
+
+def _object_plan(cls: type, projection: Projection) -> aliases.Deserializer:
+    annotations = get_annotations(cls)
+    fields = tuple((name, _projected_plan(annotations[name], sub)) for name, sub in projection.fields(cls))
+    defaults = get_defaults(cls)
+
+    if annotation_deserializer(cls) in obdictive_deserializers:
+        if getattr(cls.__init__, GENERATED_FOR, None) is not cls or cls.__new__ is not object.__new__:
+            def load_with_init(value):
+                return cls(**{name: plan(value[name]) for name, plan in fields if name in value})
+
+            return load_with_init
+
+        new = object.__new__
+        # `object.__setattr__` for frozen classes, the class's `__setattr__` for tracked ones
+        set_attribute = object.__setattr__ if getattr(cls, FROZEN, False) else setattr
+
+        def load_obdictive(value):
+            obj = new(cls)
+            for name, plan in fields:
+                if name in value:
+                    set_attribute(obj, name, plan(value[name]))
+                elif name in defaults:
+                    set_attribute(obj, name, defaults[name])
+            return obj
+
+        return load_obdictive
+
+    def load_default(value):
+        if isinstance(value, cls):
+            return value
+        obj = cls()
+        for name, plan in fields:
+            if name in value:
+                setattr(obj, name, plan(value[name]))
+            elif name in defaults:
+                setattr(obj, name, defaults[name])
+        return obj
+
+    return load_default
+
+
+# ------------------------- Dumping -----------------------
+
+
+def dump_projected(obj: aliases.Serializable, only: Optional[Iterable[str]],
+                   exclude: Optional[Iterable[str]]) -> aliases.Serialized:
+    """
+    Serialize only the fields of `obj` selected by `only` and `exclude`.
+    """
+    return _dump(obj, get_projection(only, exclude))
+
+
+def _dump(obj: Any, projection: Projection) -> aliases.Serialized:
+    if obj is None:  # of an `Optional` field
+        return None
+    t = type(obj)
+    method = serializers_map.get(t)
+    if method in annotation_serializers or method is dump_tracked:
+        d = {}
+        for name, sub in projection.fields(t):
+            value = getattr(obj, name, _UNDEFINED)
+            if value is not _UNDEFINED:
+                d[name] = dump(value) if sub is None else _dump(value, sub)
+        return d
+
+    if isinstance(obj, (list, tuple)):
+        return [_dump(value, projection) for value in obj]
+    if isinstance(obj, dict):
+        return {dump(key): _dump(value, projection) for key, value in obj.items()}
+    raise ValueError(F"Cannot select the fields of {t.__name__}")
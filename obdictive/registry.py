@@ -0,0 +1,155 @@
+"""
+Thread-safe registries with lock-free reads.
+
+The registries (`serializers_map`, `deserializers_map`, `generics_map`, the annotation and decoder caches...) are read
+on every `dump` and `load`, and written only when a class is registered or a cache is filled.
+A `Registry` never modifies a published snapshot: merging changes builds a new dictionary under `lock` and publishes it
+with a single assignment (copy-on-write). Writes are first added to a pending table, which is modified in place (under
+`lock`) until it is merged, and read without a lock before the snapshot (see `Registry`). Each read is a single
+`dict` operation, so a reader sees every key either as it was before a write or after it, never a partial update of
+the registry's structure; a burst of writes becomes visible key by key rather than all at once.
+Only the copying is batched: the writes themselves are not deferred, and `set_serializer` and `set_deserializer` still
+clear the caches derived from the registries on every registration.
+"""
+import threading
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, ItemsView, KeysView, ValuesView
+
+from .typevars import K, V
+
+lock = threading.RLock()
+"""
+The lock taken by all registry writes.
+Hold it to make several registrations atomic with respect to other writers (e.g. registering both the serializer and
+the deserializer of a class before publishing it).
+"""
+
+
+class Registry(Mapping[K, V]):
+    """
+    A mapping that is replaced (copy-on-write) on every change, so that reads never take a lock.
+
+    `get` is the `get` method of the current snapshot (a plain `dict`), so it is as fast as reading a `dict`.
+    Prefer it over `in` and `[]` on hot paths.
+
+    Copying the snapshot on every write makes a burst of writes (e.g. defining thousands of classes, each registered
+    in several registries) quadratic. So writes are added to a pending table instead, and `get` and `in` read it
+    before the snapshot until it is merged (in one copy): when the registry is iterated, or once it has been read
+    about as many times as the copy costs, which keeps reads after the burst as fast as before.
+    """
+
+    get: Callable[..., Any]
+    """`get` of the current snapshot, or a lookup of the pending table and then the snapshot."""
+
+    def __init__(self, items: Optional[Mapping[K, V]] = None):
+        self._pending: Dict[K, V] = {}
+        self._reads = 0
+        self._publish(dict(items or {}))
+
+    def _publish(self, snapshot: Dict[K, V]) -> None:
+        self._snapshot = snapshot
+        self.get = snapshot.get
+
+    @property
+    def snapshot(self) -> Dict[K, V]:
+        """The current contents. Never modified, replaced on every change."""
+        if self._pending:
+            self.flush()
+        return self._snapshot
+
+    def flush(self) -> None:
+        """
+        Merge the pending writes into a new snapshot.
+        """
+        with lock:
+            if self._pending:
+                snapshot = dict(self._snapshot)
+                snapshot.update(self._pending)
+                self._publish(snapshot)  # before dropping the pending table, for concurrent readers
+                self._pending = {}
+
+    def _pending_get(self, key: K, default: Any = None) -> Any:
+        self._reads += 1
+        if self._reads > (len(self._snapshot) >> 3) + _MIN_READS:
+            self.flush()
+            return self._snapshot.get(key, default)
+        value = self._pending.get(key, _MISSING)
+        if value is _MISSING:
+            return self._snapshot.get(key, default)
+        return value
+
+    def __getitem__(self, key: K) -> V:
+        value = self._pending.get(key, _MISSING)
+        if value is _MISSING:
+            return self._snapshot[key]
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._pending or key in self._snapshot
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self.snapshot)
+
+    def __len__(self) -> int:
+        return len(self.snapshot)
+
+    def __repr__(self) -> str:
+        return F"{self.__class__.__name__}({self.snapshot!r})"
+
+    def keys(self) -> KeysView[K]:
+        return self.snapshot.keys()
+
+    def values(self) -> ValuesView[V]:
+        return self.snapshot.values()
+
+    def items(self) -> ItemsView[K, V]:
+        return self.snapshot.items()
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self.update({key: value})
+
+    def __delitem__(self, key: K) -> None:
+        with lock:
+            snapshot = dict(self.snapshot)
+            del snapshot[key]
+            self._publish(snapshot)
+
+    def update(self, items: Mapping[K, V]) -> None:
+        with lock:
+            self._pending.update(items)
+            self._reads = 0
+            self.get = self._pending_get
+
+    def setdefault(self, key: K, default: V) -> V:
+        """
+        Set `key` to `default` unless it is already set, atomically.
+
+        :return: The value of `key`.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with lock:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            self.update({key: default})
+            return default
+
+    def pop(self, key: K, default: Any = None) -> Any:
+        with lock:
+            if key not in self.snapshot:
+                return default
+            value = self._snapshot[key]
+            del self[key]
+            return value
+
+    def clear(self) -> None:
+        with lock:
+            self._publish({})
+            self._pending = {}
+
+
+_MISSING: Any = object()
+
+_MIN_READS = 32
+"""The number of reads of a registry with pending writes after which they are merged, in addition to 1/8 of its size."""
@@ -1,33 +1,53 @@
-from typing import Dict
+from typing import Iterable, Optional
 
 from . import typevars, aliases
 from .generics import generic_serializers_map
+from .registry import Registry, lock
 
 
 def echo(x: typevars.T) -> typevars.T: return x
 
 
-serializers_map: Dict[type, aliases.Serializer] = {
+serializers_map: Registry[type, aliases.Serializer] = Registry({
     int: echo,
     str: echo,
     float: echo,
     bool: echo,
-}
+})
 """
 A dictionary that defines how an object can be serialized into a dict.
 The `@serializer` decorator adds to this dictionary.
 """
 
+compiled_serializers: Registry[type, aliases.Serializer] = Registry()
+"""
+A cache of the serializers generated from class annotations (see `codegen`).
+Cleared whenever a serializer is set, as the generated code inlines the registered serializers.
+"""
+
+serializers_version: int = 0
+"""Incremented whenever a serializer is set, to invalidate caches built from the registered serializers."""
 
-def dump(obj: aliases.Serializable) -> aliases.Serialized:
+
+def dump(obj: aliases.Serializable, only: Optional[Iterable[str]] = None,
+         exclude: Optional[Iterable[str]] = None) -> aliases.Serialized:
     """
     Convert an object to a dictionary.
-    """
-    if type(obj) in serializers_map:
-        return serializers_map[type(obj)](obj)
 
-    elif type(obj) in generic_serializers_map:
-        return generic_serializers_map[type(obj)](obj)
+    :param obj: The object.
+    :param only: Include only these fields, given as dotted paths (e.g. `"customer.id"`).
+    :param exclude: Leave out these fields, given as dotted paths (see `projection`).
+    """
+    if only is not None or exclude is not None:
+        from .projection import dump_projected
+        return dump_projected(obj, only, exclude)
+    method = serializers_map.get(type(obj))
+    if method is not None:
+        return method(obj)
+
+    method = generic_serializers_map.get(type(obj))
+    if method is not None:
+        return method(obj)
     return None
 
 
@@ -35,4 +55,8 @@ def set_serializer(cls: type, method: aliases.Serializer) -> None:
     """
     Set `method` as the serializer for type `cls`.
     """
-    serializers_map[cls] = method
+    global serializers_version
+    with lock:
+        serializers_map[cls] = method
+        compiled_serializers.clear()
+        serializers_version += 1
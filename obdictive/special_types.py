@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import sys
+from time import perf_counter
 from typing import Union, overload, Generic, TypeVar
 
 from .typevars import K, V, T, T1, T2
@@ -14,9 +15,12 @@ else:
     from typing import List, Dict, Tuple, Type
 
 from .decorators import serializer, deserializer
-from .generics import _list_deserializer_impl, _dict_deserializer_impl, _tuple_deserializer_impl, _list_serializer_impl, \
-    _dict_serializer_impl, _tuple_serializer_impl
+from .generics import _list_deserializer_impl, _dict_deserializer_impl, _tuple_deserializer_impl, \
+    _list_serializer_impl, _dict_serializer_impl, _tuple_serializer_impl, define_generic
 from .obdictive_class import serializable
+from .registry import Registry, lock
+from .instrumentation import class_created
+from .tracking import changed, link
 from . import typevars
 
 
@@ -32,8 +36,66 @@ class _OMeta(type):  # type: ignore[misc]
         return self._my_repr
 
 
+def _tracked(method):
+    """
+    Wrap a mutating method of `list` / `dict`, reporting the change to the tracked objects containing the container.
+    """
+
+    def mutate(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        changed(self)
+        return result
+
+    mutate.__name__ = method.__name__
+    mutate.__qualname__ = method.__qualname__
+    mutate.__doc__ = method.__doc__
+    return mutate
+
+
+_LIST_MUTATORS = ('__setitem__', '__delitem__', '__iadd__', '__imul__', 'append', 'extend', 'insert', 'pop', 'remove',
+                  'clear', 'sort', 'reverse')
+_DICT_MUTATORS = ('__setitem__', '__delitem__', '__ior__', 'clear', 'pop', 'popitem', 'setdefault', 'update')
+
+_tracked_variants: Registry[type, type] = Registry()
+
+
+def tracked_variant(cls: type) -> type:
+    """
+    The subclass of the `OList` / `ODict` variant `cls` (e.g. `OList[Pet]`) whose mutations are reported to the tracked
+    objects containing it. The variables of `track=True` classes hold it (see `tracking.adopt`), so that the other
+    `OList`s and `ODict`s stay plain `list` / `dict` subclasses.
+    """
+    variant = _tracked_variants.get(cls)
+    if variant is not None:
+        return variant
+    with lock:
+        variant = _tracked_variants.get(cls)
+        if variant is not None:
+            return variant
+        base, mutators = (list, _LIST_MUTATORS) if issubclass(cls, list) else (dict, _DICT_MUTATORS)
+        namespace = {name: _tracked(getattr(base, name)) for name in mutators if hasattr(base, name)}
+        namespace.update(_track=True, _obdictive_dump=None, _obdictive_parents=None, _my_repr=repr(cls))
+        variant = serializable(_OMeta(F"Tracked{cls.__name__}", (cls,), namespace), deep_search=True)
+        _tracked_variants[cls] = variant
+    return variant
+
+
+def _olist(single_type, items):
+    return OList[single_type](items)
+
+
+def _odict(key_type, value_type, items):
+    return ODict[key_type, value_type](items)
+
+
 class OList(list, Generic[T]):
-    _cache: Dict[type, Type[list]] = {}
+    _cache: Registry[type, Type[list]] = Registry()
+
+    def __reduce__(self):
+        # the classes are created on demand, and the kept dump of tracking is left out
+        if not hasattr(self, '_type'):
+            return list.__reduce_ex__(self, 2)
+        return _olist, (self._type, list(self))
 
     @classmethod
     def __class_getitem__(cls, single_type: Union[Type[typevars.T], Tuple[Type[typevars.T]]]) -> Type[List[typevars.T]]:
@@ -42,20 +104,32 @@ class OList(list, Generic[T]):
                 raise TypeError(f"Too many arguments for {cls.__qualname__}: actual {len(single_type)}, expected 1")
             single_type = single_type[0]
 
-        if single_type in cls._cache:
-            return cls._cache[single_type]
+        cached = cls._cache.get(single_type)
+        if cached is not None:
+            return cached
+
+        # the class is registered under the lock and published last, so other threads never see it half-built
+        with lock:
+            cached = cls._cache.get(single_type)
+            if cached is not None:
+                return cached
+
+            start = perf_counter()
 
-        @serializable(deep_search=True)
-        class OListVar(OList, metaclass=_OMeta):
-            _type = single_type
-            _my_repr = F"{_full_name(cls)}[{_full_name(single_type)}]"
-            pass
+            @serializable(deep_search=True)
+            class OListVar(OList, metaclass=_OMeta):
+                _type = single_type
+                _my_repr = F"{_full_name(cls)}[{_full_name(single_type)}]"
+                pass
 
-        cls._cache[single_type] = OListVar
+            define_generic(OListVar, list, (single_type,))
+            cls._cache[single_type] = OListVar
+            class_created(OListVar, start)
         return OListVar
 
     @serializer
     def _serializer(self: list):  # self is 'list' NOT 'OList'!
+        link(self)
         return _list_serializer_impl(self)
 
     @classmethod
@@ -65,11 +139,17 @@ class OList(list, Generic[T]):
             raise TypeError(F"{cls.__qualname__} cannot be used as a type annotation directly!")
         # noinspection PyUnresolvedReferences
         # As we just verified that type exists.
-        return _list_deserializer_impl(value, cls._type)
+        return _list_deserializer_impl(value, (cls._type,))
 
 
 class ODict(dict, Generic[K, V]):
-    _cache: Dict[Tuple[type, type], Type[dict]] = {}
+    _cache: Registry[Tuple[type, type], Type[dict]] = Registry()
+
+    def __reduce__(self):
+        # the classes are created on demand, and the kept dump of tracking is left out
+        if not hasattr(self, '_t_key'):
+            return dict.__reduce_ex__(self, 2)
+        return _odict, (self._t_key, self._t_value, dict(self))
 
     @classmethod
     def __class_getitem__(cls, type_pair: Tuple[Type[typevars.K], Type[typevars.V]]) -> Type[
@@ -78,21 +158,33 @@ class ODict(dict, Generic[K, V]):
             length = 1 if not isinstance(type_pair, tuple) else len(type_pair)
             raise TypeError(f"Wrong number of arguments for {cls.__qualname__}: actual {length}, expected 2")
 
-        if type_pair in cls._cache:
-            return cls._cache[type_pair]
+        cached = cls._cache.get(type_pair)
+        if cached is not None:
+            return cached
+
+        # the class is registered under the lock and published last, so other threads never see it half-built
+        with lock:
+            cached = cls._cache.get(type_pair)
+            if cached is not None:
+                return cached
+
+            start = perf_counter()
 
-        @serializable(deep_search=True)
-        class ODictVar(ODict, metaclass=_OMeta):
-            _t_key = type_pair[0]
-            _t_value = type_pair[1]
-            _my_repr = F"{_full_name(cls)}[{_full_name(type_pair[0])}, {_full_name(type_pair[1])}]"
-            pass
+            @serializable(deep_search=True)
+            class ODictVar(ODict, metaclass=_OMeta):
+                _t_key = type_pair[0]
+                _t_value = type_pair[1]
+                _my_repr = F"{_full_name(cls)}[{_full_name(type_pair[0])}, {_full_name(type_pair[1])}]"
+                pass
 
-        cls._cache[type_pair] = ODictVar
+            define_generic(ODictVar, dict, type_pair)
+            cls._cache[type_pair] = ODictVar
+            class_created(ODictVar, start)
         return ODictVar
 
     @serializer
     def _serializer(self: dict):  # self is 'dict' NOT 'ODict'!
+        link(self)
         return _dict_serializer_impl(self)
 
     @classmethod
@@ -106,7 +198,7 @@ class ODict(dict, Generic[K, V]):
 
 
 class OTuple(tuple):
-    _cache: Dict[Tuple[type, ...], Type[tuple]] = {}
+    _cache: Registry[Tuple[type, ...], Type[tuple]] = Registry()
 
     @overload
     def __class_getitem__(cls, types: Tuple[
@@ -165,16 +257,27 @@ class OTuple(tuple):
         if not isinstance(types, tuple):
             types = (types,)
 
-        if types in cls._cache:
-            return cls._cache[types]
+        cached = cls._cache.get(types)
+        if cached is not None:
+            return cached
+
+        # the class is registered under the lock and published last, so other threads never see it half-built
+        with lock:
+            cached = cls._cache.get(types)
+            if cached is not None:
+                return cached
+
+            start = perf_counter()
 
-        @serializable(deep_search=True)
-        class OTupleVar(OTuple, metaclass=_OMeta):
-            _types = types
-            _my_repr = F"{_full_name(cls)}[{', '.join(_full_name(t) for t in types)}]"
-            pass
+            @serializable(deep_search=True)
+            class OTupleVar(OTuple, metaclass=_OMeta):
+                _types = types
+                _my_repr = F"{_full_name(cls)}[{', '.join(_full_name(t) for t in types)}]"
+                pass
 
-        cls._cache[types] = OTupleVar
+            define_generic(OTupleVar, tuple, types)
+            cls._cache[types] = OTupleVar
+            class_created(OTupleVar, start)
         return OTupleVar
 
     @serializer
@@ -188,4 +291,4 @@ class OTuple(tuple):
             raise TypeError(F"{cls.__qualname__} cannot be used as a type annotation directly!")
         # noinspection PyUnresolvedReferences
         # As we just verified that _types exists
-        return _tuple_deserializer_impl(value, *cls._types)
+        return _tuple_deserializer_impl(value, cls._types)
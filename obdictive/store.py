@@ -0,0 +1,256 @@
+"""
+Append-only files of records, with random access through an index of offsets.
+
+A `RecordStore` keeps its records in a data file, one after the other, and the end offset of each record in a side
+index file (`<path>.idx`, 8 bytes per record). Both files are read through `mmap`, so opening a store does not read
+them, and reading a record decodes only its own bytes.
+
+The records are in the binary format (see `binary`) by default: the data file starts with the header of the class
+(the schema fingerprint), and each record is its encoded value. With `format='json'`, the data file is a JSON lines
+file (see `dump_lines`).
+"""
+import mmap
+import os
+import struct
+from typing import Any, Generic, Iterable, Iterator, List, Optional, Union, overload
+
+from . import typevars
+from .binary import header, check_header, write_value, read_value, HEADER_SIZE, MAGIC
+from .json import json_dumps, json_loads
+from .obdictive_exceptions import ObdictiveDeserializationException
+
+INDEX_SUFFIX = '.idx'
+"""The suffix of the index file, added to the path of the data file."""
+
+FORMATS = ('binary', 'json')
+
+_OFFSET = struct.Struct('<Q')
+
+
+class RecordStore(Generic[typevars.T]):
+    """
+    An append-only file of records of type `cls`, with random access.
+
+    `store[i]` and `store[i:j]` read records by position, and iterating reads them in order. `append` and `extend` add
+    records at the end. The index is written after the data of each record, so a record whose write was interrupted is
+    dropped (and its data truncated) the next time the store is opened.
+    A store must not be written by more than one `RecordStore` (or thread) at a time.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], cls: Any, format: Optional[str] = None,
+                 readonly: bool = False):
+        """
+        Open the store at `path`, creating it if it does not exist (unless `readonly`).
+        A store without an index (e.g. a JSON lines file) is indexed when opened: the index is written next to it,
+        or if `readonly`, kept in memory.
+
+        :param path: The path of the data file.
+        :param cls: The type of the records.
+        :param format: `'binary'` or `'json'`. By default, the format of the existing store, or `'binary'`.
+        :raises ObdictiveDeserializationException: If the store exists with a different format or schema.
+        """
+        if format is not None and format not in FORMATS:
+            raise ValueError(F"Unknown format {format!r}, expected one of {FORMATS}")
+        self.path = os.fspath(path)
+        self.index_path = self.path + INDEX_SUFFIX
+        self.cls = cls
+        self.readonly = readonly
+        indexed = os.path.exists(self.index_path)
+        self._data = open(self.path, 'rb' if readonly else 'a+b')
+        self._index = open(self.index_path, 'rb' if readonly else 'a+b') if indexed or not readonly else None
+        self._data_map: Optional[mmap.mmap] = None
+        self._index_map: Optional[Union[mmap.mmap, bytes]] = None
+        self._dirty = False
+        try:
+            self._count = os.fstat(self._index.fileno()).st_size // _OFFSET.size if self._index else 0
+            self.format = self._open_format(format)
+            self._start = HEADER_SIZE if self.format == 'binary' else 0
+            if not readonly:
+                self._recover(indexed)
+            elif not indexed:
+                self._index_map = bytes(self._scan())
+                self._count = len(self._index_map) // _OFFSET.size
+        except BaseException:
+            self.close()
+            raise
+
+    def _open_format(self, format: Optional[str]) -> str:
+        size = os.fstat(self._data.fileno()).st_size
+        self._data.seek(0)
+        start = self._data.read(HEADER_SIZE)
+        if size == 0:  # a new store
+            format = format or 'binary'
+            if format == 'binary' and not self.readonly:
+                self._data.write(header(self.cls))
+                self._data.flush()
+            return format
+        detected = 'binary' if start.startswith(MAGIC) else 'json'
+        if format is not None and format != detected:
+            raise ObdictiveDeserializationException(F"{self.path} is a {detected} store, not {format}")
+        if detected == 'binary':
+            check_header(self.cls, start)
+        return detected
+
+    def _recover(self, indexed: bool) -> None:
+        """
+        Truncate the index after the last whole offset of a record whose data was written, and the data after the last
+        indexed record.
+        If there is no index, build it by scanning the data (e.g. of a JSON lines file written by `dump_lines`).
+        """
+        size = os.fstat(self._data.fileno()).st_size
+        if not indexed and size > self._start:
+            self._build_index()
+        while self._count and self._end(self._count - 1) > size:  # the data did not reach the file
+            self._count -= 1
+        if isinstance(self._index_map, mmap.mmap):  # of the index before it is truncated
+            self._index_map.close()
+            self._index_map = None
+        index_size = self._count * _OFFSET.size
+        if os.fstat(self._index.fileno()).st_size != index_size:
+            self._index.truncate(index_size)
+        end = self._end(self._count - 1) if self._count else self._start
+        if size > end:
+            self._data.truncate(end)
+
+    def _build_index(self) -> None:
+        offsets = self._scan()
+        self._index.write(offsets)
+        self._index.flush()
+        self._count = len(offsets) // _OFFSET.size
+
+    def _scan(self) -> bytearray:
+        """The index of the data: the end offsets of its whole records."""
+        offsets = bytearray()
+        if os.fstat(self._data.fileno()).st_size <= self._start:
+            return offsets
+        with mmap.mmap(self._data.fileno(), 0, access=mmap.ACCESS_READ) as data_map:
+            idx = self._start
+            while idx < len(data_map):
+                if self.format == 'json':
+                    end = data_map.find(b'\n', idx) + 1
+                    if not end:  # an incomplete last line
+                        break
+                else:
+                    try:
+                        _, end = read_value(self.cls, data_map, idx)
+                    except ObdictiveDeserializationException:  # an incomplete last record
+                        break
+                offsets += _OFFSET.pack(end)
+                idx = end
+        return offsets
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _end(self, i: int) -> int:
+        """The end offset of record `i`."""
+        if self._dirty:
+            self._flush()
+        index_map = self._index_map
+        if index_map is None or len(index_map) < (i + 1) * _OFFSET.size:
+            index_map = self._index_map = self._remap(self._index, self._index_map)
+        return _OFFSET.unpack_from(index_map, i * _OFFSET.size)[0]
+
+    def _record(self, i: int) -> bytes:
+        """The bytes of record `i`."""
+        start = self._end(i - 1) if i else self._start
+        end = self._end(i)
+        data_map = self._data_map
+        if data_map is None or len(data_map) < end:
+            data_map = self._data_map = self._remap(self._data, self._data_map)
+        return data_map[start:end]
+
+    @staticmethod
+    def _remap(file: Any, old: Optional[mmap.mmap]) -> mmap.mmap:
+        if old is not None:
+            old.close()
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _decode(self, record: bytes) -> typevars.T:
+        if self.format == 'json':
+            return json_loads(self.cls, record)
+        value, end = read_value(self.cls, record, 0)
+        if end != len(record):
+            raise ObdictiveDeserializationException(F"Corrupt record in {self.path}")
+        return value
+
+    @overload
+    def __getitem__(self, item: int) -> typevars.T: ...
+
+    @overload
+    def __getitem__(self, item: slice) -> List[typevars.T]: ...
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._decode(self._record(i)) for i in range(*item.indices(self._count))]
+        i = item.__index__()
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("record index out of range")
+        return self._decode(self._record(i))
+
+    def __iter__(self) -> Iterator[typevars.T]:
+        for i in range(self._count):
+            yield self._decode(self._record(i))
+
+    def append(self, obj: typevars.T) -> None:
+        """
+        Add a record at the end of the store.
+        """
+        self.extend((obj,))
+
+    def extend(self, objs: Iterable[typevars.T]) -> None:
+        """
+        Add records at the end of the store, writing their data and then their offsets in one write each.
+        The data is flushed before the offsets are written, so the index never points past the data in the file.
+        """
+        if self.readonly:
+            raise ValueError(F"{self.path} is open for reading only")
+        end = self._end(self._count - 1) if self._count else self._start
+        data = bytearray()
+        offsets = bytearray()
+        count = 0
+        for obj in objs:
+            if self.format == 'json':
+                data += json_dumps(obj, direct=True).encode()
+                data += b'\n'
+            else:
+                write_value(obj, self.cls, data)
+            offsets += _OFFSET.pack(end + len(data))
+            count += 1
+        self._data.write(data)
+        self._data.flush()
+        self._index.write(offsets)
+        self._count += count
+        self._dirty = True
+
+    def _flush(self) -> None:
+        self._data.flush()
+        self._index.flush()
+        self._dirty = False
+
+    def flush(self) -> None:
+        """
+        Write the appended records to the files.
+        """
+        if self._dirty:
+            self._flush()
+
+    def close(self) -> None:
+        for data_map in (self._data_map, self._index_map):
+            if isinstance(data_map, mmap.mmap):
+                data_map.close()
+        self._data_map = self._index_map = None
+        for file in (self._data, self._index):
+            if file is not None:
+                file.close()
+
+    def __enter__(self) -> 'RecordStore[typevars.T]':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return F"{self.__class__.__name__}({self.path!r}, {getattr(self.cls, '__name__', self.cls)}, {self.format!r})"
@@ -0,0 +1,166 @@
+"""
+Change tracking and incremental serialization (`class Child(Obdictive, track=True)`).
+
+A tracked object keeps the dict `dump` returned for it, and returns it again until the object changes. Assigning or
+deleting a variable of a tracked object, and mutating an `OList` / `ODict` variable of a tracked object, discards the
+kept dict of the object and of every tracked object (or container) whose kept dict contains it, so the next `dump`
+re-serializes only the changed branches and reuses the kept dicts of the rest. Tracked values reached through plain
+containers or objects that are not tracked (e.g. a `List[Pet]` variable) report their changes to the nearest tracked
+object containing them.
+
+Only the `OList` / `ODict` variables of tracked classes report their mutations (see `adopt`), other `OList`s and
+`ODict`s are as fast as lists and dicts. Mutations that cannot be seen (e.g. of a plain `list`, or of an object or
+container that is not tracked) must be reported with `invalidate`.
+"""
+import threading
+import weakref
+from typing import Any, Dict
+
+from .default_serializers import get_annotations, TRACK, DUMP_CACHE, PARENTS
+from .registry import Registry
+from .serialization import dump
+
+_UNDEFINED = object()
+"""An value that denotes that an attribute is not defined."""
+
+_containers_cache: Registry[type, tuple] = Registry()
+"""The `OList` / `ODict` annotations of each tracked class, by name (with the annotations they were found in)."""
+
+_dumping = threading.local()
+"""The innermost tracked object being serialized by `dump_tracked` (`parent`), per thread."""
+
+
+def dump_tracked(obj: Any) -> dict:
+    """
+    The serializer of tracked classes: returns the kept dict of `obj`, or serializes it and keeps the result.
+    The returned dicts are shared with the kept ones, and must not be modified.
+    """
+    enclosing = getattr(_dumping, 'parent', None)
+    if enclosing is not None:
+        link(obj)
+    cached = getattr(obj, DUMP_CACHE, None)
+    if cached is not None:
+        return cached
+    _dumping.parent = obj
+    try:
+        d = {}
+        for name in get_annotations(obj.__class__):
+            value = getattr(obj, name, _UNDEFINED)
+            if value is not _UNDEFINED:
+                d[name] = _dump_value(value, obj)
+    finally:
+        _dumping.parent = enclosing
+    object.__setattr__(obj, DUMP_CACHE, d)
+    return d
+
+
+def link(value: Any) -> None:
+    """
+    Make the tracked object being serialized (if any) a parent of the tracked `value`, so that the changes of `value`
+    discard its kept dict even if `value` was reached through a plain container or an object that is not tracked.
+    """
+    parent = getattr(_dumping, 'parent', None)
+    if parent is not None and parent is not value and getattr(type(value), TRACK, False):
+        _add_parent(value, parent)
+
+
+def _dump_value(value: Any, parent: Any) -> Any:
+    if not getattr(type(value), TRACK, False):
+        return dump(value)
+    cached = getattr(value, DUMP_CACHE, None)
+    parents = getattr(value, PARENTS, None)
+    if cached is not None and parents is not None and id(parent) in parents:  # unchanged
+        return cached
+    _add_parent(value, parent)
+    if not isinstance(value, (list, dict)):
+        return dump(value)
+
+    if cached is None:  # an `OList` or `ODict`
+        if isinstance(value, dict):
+            cached = {dump(k): _dump_value(v, value) for k, v in value.items()}
+        else:
+            cached = [_dump_value(v, value) for v in value]
+        value.__dict__[DUMP_CACHE] = cached
+    return cached
+
+
+def _add_parent(value: Any, parent: Any) -> None:
+    # weakly, so that a shared value does not keep alive every object it was dumped in (a dead parent is dropped, and
+    # its id can be reused by another object)
+    parents = getattr(value, PARENTS, None)
+    if parents is None:
+        parents = weakref.WeakValueDictionary()
+        object.__setattr__(value, PARENTS, parents)
+    parents[id(parent)] = parent
+
+
+def changed(obj: Any) -> None:
+    """
+    Discard the kept dict of `obj`, and of every object (or container) whose kept dict contains it.
+    """
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        parents = getattr(obj, PARENTS, None)
+        if getattr(obj, DUMP_CACHE, None) is None and parents is None:
+            continue
+        object.__setattr__(obj, DUMP_CACHE, None)
+        object.__setattr__(obj, PARENTS, None)
+        if parents:
+            stack.extend(list(parents.values()))  # the live ones
+
+
+def invalidate(obj: Any) -> None:
+    """
+    Report a change to `obj` that could not be tracked (e.g. a plain `list` field was modified, or an object that is not
+    tracked was changed), so that the next `dump` of `obj`, and of the objects containing it, serializes it again.
+    """
+    changed(obj)
+
+
+def _containers(cls: type) -> Dict[str, type]:
+    annotations = get_annotations(cls)
+    cached = _containers_cache.get(cls)
+    if cached is None or cached[0] is not annotations:  # the annotations were reloaded
+        from .special_types import OList, ODict, tracked_variant
+        containers = {name: tracked_variant(typ) for name, typ in annotations.items()
+                      if isinstance(typ, type) and issubclass(typ, (OList, ODict))}
+        cached = (annotations, containers)
+        _containers_cache[cls] = cached
+    return cached[1]
+
+
+def adopt(typ: type, value: Any) -> Any:
+    """
+    Make the list or dict assigned to an `OList` / `ODict` variable of a tracked class an instance of `typ` (see
+    `special_types.tracked_variant`), so that its mutations are tracked: a plain list or dict is converted, and an
+    `OList` / `ODict` of the variable's type becomes tracked in place.
+    """
+    value_type = type(value)
+    if value_type is typ:
+        return value
+    if value_type in (list, dict):
+        return typ(value)
+    if value_type is typ.__base__:
+        value.__class__ = typ
+    return value
+
+
+def tracked_containers(cls: type) -> Dict[str, type]:
+    """
+    The variables of `cls` whose values are converted by `adopt` (empty if it is not tracked).
+    """
+    return _containers(cls) if getattr(cls, TRACK, False) else {}
+
+
+def tracked_setattr(self: Any, name: str, value: Any) -> None:
+    typ = _containers(self.__class__).get(name)
+    if typ is not None:
+        value = adopt(typ, value)
+    object.__setattr__(self, name, value)
+    changed(self)
+
+
+def tracked_delattr(self: Any, name: str) -> None:
+    object.__delattr__(self, name)
+    changed(self)
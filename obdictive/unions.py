@@ -0,0 +1,231 @@
+"""
+Decoders of `Union` (and `Optional`) and `Literal` annotations.
+
+A union decodes a value by the type of its serialized form, through a table built once per union: `None` for
+`Optional`, `int`, `float`, `str` and `bool` for the primitive variants, lists and tuples for the list and tuple
+variants, and dicts for the annotation based classes (and the dict variants).
+Several classes are told apart by a discriminator: a field that each of them annotates as a `Literal` of different
+values (e.g. `kind: Literal["circle"] = "circle"`, or the class-level `_tag = "circle"`, see `get_annotations`), which
+selects the class through a table of the tags. Without one, the class is chosen by the keys of the value (the class
+that has the most of them as fields, and the fewest missing fields without defaults), and the choice is cached per
+set of keys. Only the variants whose serialized form is unknown (e.g. with custom deserializers) are tried in turn.
+"""
+import types
+import typing
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import aliases
+from .codegen import annotation_deserializer
+from .default_serializers import get_annotations, get_defaults
+from .deserialization import get_plan, resolve_generic, deserializers_map
+from .obdictive_exceptions import ObdictiveDeserializationException
+from .serialization import dump
+
+_UNION_TYPES = tuple(t for t in (typing.Union, getattr(types, 'UnionType', None)) if t is not None)
+"""`Union[A, B]`, and `A | B` (Python 3.10+)."""
+
+_PRIMITIVES = (int, float, str, bool)
+
+MAX_SHAPES = 1024
+"""The number of sets of keys whose chosen class is cached, per union."""
+
+
+def special_plan(cls: Any) -> Optional[aliases.Deserializer]:
+    """
+    The decoder of `cls` if it is a `Union` (including `Optional`) or a `Literal`, otherwise `None`.
+    """
+    origin = typing.get_origin(cls)
+    if origin in _UNION_TYPES:
+        return union_plan(typing.get_args(cls))
+    if origin is getattr(typing, 'Literal', None):
+        return literal_plan(typing.get_args(cls))
+    return None
+
+
+def literal_plan(values: Tuple[Any, ...]) -> aliases.Deserializer:
+    """
+    A decoder that accepts the (serialized) `values` only.
+    """
+    table = {dump(value): value for value in values}
+
+    def literal(value):
+        try:
+            return table[value]
+        except (KeyError, TypeError):
+            raise ObdictiveDeserializationException(F"{value!r} is not one of {values}") from None
+
+    return literal
+
+
+def union_plan(variants: Tuple[Any, ...],
+               plan_of: Callable[[Any], aliases.Deserializer] = get_plan) -> aliases.Deserializer:
+    """
+    A decoder of the union of `variants`.
+
+    :param plan_of: Gets the decoders of the variants (e.g. of only some of their fields, see `projection`).
+    """
+    by_type: Dict[type, List[aliases.Deserializer]] = {}
+    classes = []
+    others = []
+    for variant in variants:
+        if variant is type(None):
+            by_type.setdefault(type(None), []).append(_none)
+            continue
+        if _is_object(variant):
+            classes.append(variant)
+            continue
+        serialized = _serialized_types(variant, variants)
+        if not serialized:
+            others.append(plan_of(variant))
+        for typ in serialized:
+            by_type.setdefault(typ, []).append(plan_of(variant))
+    if classes:
+        by_type.setdefault(dict, []).insert(0, _objects_plan(classes, dict in by_type, plan_of))
+
+    table = {typ: plans[0] if len(plans) == 1 else _first_plan(plans) for typ, plans in by_type.items()}
+    other = None if not others else others[0] if len(others) == 1 else _first_plan(others)
+    name = F"Union[{', '.join(getattr(v, '__name__', repr(v)) for v in variants)}]"
+
+    def union(value):
+        plan = table.get(type(value))
+        if plan is None:
+            plan = _subclass_plan(table, value) or other
+            if plan is None:
+                raise ObdictiveDeserializationException(F"{value!r} is not of type {name}")
+        return plan(value)
+
+    return union
+
+
+def _none(value: None) -> None:
+    return None
+
+
+def _is_object(variant: Any) -> bool:
+    """Whether `variant` is deserialized from a dict by its annotations."""
+    return isinstance(variant, type) and annotation_deserializer(variant) is not None
+
+
+def _serialized_types(variant: Any, variants: Tuple[Any, ...]) -> Tuple[type, ...]:
+    """The types of the serialized values of `variant`, if they are known."""
+    if isinstance(variant, type) and variant in _PRIMITIVES and deserializers_map.get(variant) is variant:
+        if variant is float and int not in variants:  # JSON numbers without a fraction
+            return float, int
+        return variant,
+    generic = resolve_generic(variant)
+    if generic is not None:
+        base_cls = generic[0]
+        return (dict,) if base_cls is dict else (list, tuple)
+    return ()
+
+
+def _subclass_plan(table: Dict[type, aliases.Deserializer], value: Any) -> Optional[aliases.Deserializer]:
+    """The decoder of a base of the type of `value` (e.g. of `dict` for an `OrderedDict`), if any."""
+    for typ, plan in table.items():
+        if isinstance(value, typ) and not (typ is int and isinstance(value, bool)):
+            return plan
+    return None
+
+
+def _first_plan(plans: List[aliases.Deserializer]) -> aliases.Deserializer:
+    """A decoder trying `plans` in turn, for the variants whose serialized forms cannot be told apart."""
+
+    def first(value):
+        for plan in plans[:-1]:
+            try:
+                return plan(value)
+            except Exception:
+                pass
+        return plans[-1](value)
+
+    return first
+
+
+def _objects_plan(classes: List[type], fallback: bool,
+                  plan_of: Callable[[Any], aliases.Deserializer]) -> aliases.Deserializer:
+    """
+    A decoder of the dicts of several annotation based classes: by their discriminator if they have one, otherwise by
+    the keys of the value.
+
+    :param fallback: Whether there are dict variants too, which the dicts that share no keys with any class are left to.
+    """
+    if len(classes) == 1 and not fallback:
+        return plan_of(classes[0])
+    shapes = _shapes_plan(classes, fallback, plan_of)
+    discriminator = _discriminator(classes) if len(classes) > 1 else None
+    if discriminator is None:
+        return shapes
+    field, tags = discriminator
+    plans = {tag: plan_of(cls) for tag, cls in tags.items()}
+
+    def tagged(value):
+        tag = value.get(field, _MISSING)
+        if tag is _MISSING:
+            return shapes(value)
+        try:
+            plan = plans[tag]
+        except (KeyError, TypeError):
+            raise ObdictiveDeserializationException(
+                F"Unknown {field} {tag!r}, expected one of {list(plans)}") from None
+        return plan(value)
+
+    return tagged
+
+
+_MISSING: Any = object()
+
+
+def _discriminator(classes: List[type]) -> Optional[Tuple[str, Dict[Any, type]]]:
+    """
+    The first field that all `classes` annotate as a `Literal`, with different values, and the classes by the
+    serialized values.
+    """
+    literal = getattr(typing, 'Literal', None)
+    for field in get_annotations(classes[0]):
+        tags: Dict[Any, type] = {}
+        for cls in classes:
+            typ = get_annotations(cls).get(field)
+            if typing.get_origin(typ) is not literal:
+                break
+            values = [dump(value) for value in typing.get_args(typ)]
+            if any(value in tags for value in values):
+                break
+            tags.update(dict.fromkeys(values, cls))
+        else:
+            return field, tags
+    return None
+
+
+def _shapes_plan(classes: List[type], fallback: bool,
+                 plan_of: Callable[[Any], aliases.Deserializer]) -> aliases.Deserializer:
+    """A decoder choosing the class of a dict by its keys, caching the choice per set of keys."""
+    shapes = []
+    for cls in classes:
+        fields = frozenset(get_annotations(cls))
+        shapes.append((fields, fields - frozenset(get_defaults(cls)), plan_of(cls)))
+    cache: Dict[Tuple[str, ...], Optional[aliases.Deserializer]] = {}
+
+    def choose(keys: Tuple[str, ...]) -> Optional[aliases.Deserializer]:
+        present = frozenset(keys)
+        best: Optional[Tuple[Tuple[int, int], aliases.Deserializer]] = None
+        for fields, required, plan in shapes:
+            score = (len(present & fields) - len(present - fields), -len(required - present))
+            if best is None or score > best[0]:
+                best = score, plan
+        if fallback and present and not any(present & fields for fields, _, _ in shapes):
+            return None  # a dict variant
+        return best[1]
+
+    def by_keys(value):
+        keys = tuple(value)
+        try:
+            plan = cache[keys]
+        except KeyError:
+            plan = choose(keys)
+            if len(cache) < MAX_SHAPES:
+                cache[keys] = plan
+        if plan is None:
+            raise ObdictiveDeserializationException(F"{value!r} matches none of {[cls.__name__ for cls in classes]}")
+        return plan(value)
+
+    return by_keys
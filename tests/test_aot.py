@@ -0,0 +1,86 @@
+import enum
+import types
+from typing import List
+
+import pytest
+
+import obdictive.deserialization as dto
+import obdictive.serialization as otd
+from obdictive import Obdictive, serializable_enum, dump, load
+from obdictive.aot import generate, fingerprint
+
+
+@serializable_enum
+class Color(enum.Enum):
+    RED = 'r'
+    BLUE = 'b'
+
+
+class Pet(Obdictive):
+    name: str
+    color: Color
+
+
+class Child(Obdictive):
+    name: str
+    pets: List[Pet]
+    age: int = 7
+
+
+@pytest.fixture(autouse=True)
+def restore_registrations():
+    classes = (Color, Pet, Child)
+    serializers = [otd.serializers_map[cls] for cls in classes]
+    deserializers = [dto.deserializers_map[cls] for cls in classes]
+    yield
+    for cls, serializer, deserializer in zip(classes, serializers, deserializers):
+        otd.set_serializer(cls, serializer)
+        dto.set_deserializer(cls, deserializer)
+
+
+def _import_generated(source: str) -> types.ModuleType:
+    module = types.ModuleType('generated')
+    exec(compile(source, 'generated.py', 'exec'), module.__dict__)
+    return module
+
+
+def test_generate():
+    child = Child(name="Sarah", pets=[Pet(name="Whiskers", color=Color.RED)])
+    expected = dump(child)
+
+    source = generate(__name__)
+    assert repr(fingerprint(Child)) in source
+    module = _import_generated(source)
+    assert otd.serializers_map[Child] is module.dump_2
+    assert dto.deserializers_map[Child] is module.load_2
+    assert dump(child) == expected
+    assert load(Child, expected) == child
+
+
+def test_fingerprint_mismatch():
+    source = generate(__name__).replace(repr(fingerprint(Pet)), repr('0' * 16))
+    orig = otd.serializers_map[Pet]
+    with pytest.warns(UserWarning, match="Pet has changed"):
+        module = _import_generated(source)
+    assert otd.serializers_map[Pet] is orig
+    assert module.dump_1 is dump
+    assert otd.serializers_map[Child] is module.dump_2
+    child = Child(name="Sarah", pets=[Pet(name="Whiskers", color=Color.RED)])
+    assert load(Child, dump(child)) == child
+
+
+def test_generated_formats():
+    from obdictive import to_columns, from_columns, diff, binary_dumps, binary_loads, json_dumps
+
+    child = Child(name="Sarah", pets=[Pet(name="Whiskers", color=Color.RED)])
+    source = generate(__name__)
+    _import_generated(source)
+    module = _import_generated(source)  # imported again, e.g. reloaded
+    assert otd.serializers_map[Child] is module.dump_2
+    assert json_dumps(child, only=['name']) == '{"name": "Sarah"}'
+    assert load(Child, dump(child), exclude=['pets.color']).pets[0].name == "Whiskers"
+    assert from_columns(Pet, to_columns(child.pets)) == child.pets
+    assert diff(child, Child(name="Bob", pets=child.pets)) == [{'op': 'replace', 'path': '/name', 'value': 'Bob'}]
+    assert binary_loads(Child, binary_dumps(child)) == child
+    lazy = load(Child, dump(child), lazy=True)
+    assert lazy.pets == child.pets and dump(lazy) == dump(child)
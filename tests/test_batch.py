@@ -0,0 +1,106 @@
+from typing import List
+
+from obdictive import Obdictive, serializable, serializer_for, deserializer_for, load, dump, load_many, dump_many, \
+    iter_load_many, set_serializer, set_deserializer
+from obdictive import batch
+
+
+class Pet(Obdictive):
+    name: str
+    age: int = 1
+
+
+class Child(Obdictive):
+    name: str
+    pets: List[Pet]
+
+
+class NamedChild(Child):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.upper = self.name.upper()
+
+
+@serializable
+class Toy:
+    name: str
+    price: float = 0.5
+
+
+_CHILDREN = [{'name': F"child{i}", 'pets': [{'name': F"pet{j}", 'age': j} for j in range(i)]} for i in range(5)]
+
+
+def test_load_many():
+    assert load_many(Child, _CHILDREN) == [load(Child, d) for d in _CHILDREN]
+    assert load_many(Pet, [{'name': 'a'}]) == [Pet(name='a', age=1)]
+    assert [c.upper for c in load_many(NamedChild, _CHILDREN)] == [d['name'].upper() for d in _CHILDREN]
+    assert load_many(List[int], iter([[1, 2], []])) == [[1, 2], []]
+    assert load_many(Pet, []) == []
+
+
+def test_load_many_default_deserializer():
+    toy = Toy()
+    toys = load_many(Toy, [{'name': 'ball'}, toy])
+    assert (toys[0].name, toys[0].price) == ('ball', 0.5)
+    assert toys[1] is toy
+
+
+def test_dump_many():
+    children = load_many(Child, _CHILDREN)
+    objs = [*children, Pet(name='a'), 1, 'b', [Pet(name='c')], None]
+    assert dump_many(objs) == [dump(obj) for obj in objs]
+    assert dump_many(iter(children)) == _CHILDREN
+
+
+def test_out():
+    out = [None] * 10
+    assert load_many(Child, _CHILDREN, out=out) is out
+    assert out == load_many(Child, _CHILDREN)
+    out = [None] * 2
+    assert dump_many(load_many(Child, _CHILDREN), out=out) is out
+    assert out == _CHILDREN
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def __eq__(self, other):
+        return (self.x, self.y) == (other.x, other.y)
+
+
+@serializer_for(Point)
+def _point_serializer(p: Point):
+    return F"{p.x},{p.y}"
+
+
+@deserializer_for(Point)
+def _point_deserializer(value: str):
+    x, y = value.split(',')
+    return Point(int(x), int(y))
+
+
+class Path(Obdictive):
+    points: List[Point]
+
+
+def test_workers():
+    children = [{'name': F"child{i}", 'pets': [{'name': 'pet', 'age': i}]} for i in range(100)]
+    assert load_many(Child, children, workers=2, chunk_size=7) == load_many(Child, children)
+    assert list(iter_load_many(Child, iter(children), workers=2, chunk_size=7)) == load_many(Child, children)
+    assert dump_many(load_many(Child, children), workers=2, chunk_size=7) == children
+    assert load_many(Child, [], workers=2) == []
+
+    paths = [{'points': [F"{i},{j}" for j in range(i)]} for i in range(20)]
+    assert load_many(Path, paths, workers=2, chunk_size=3) == load_many(Path, paths)
+    assert dump_many(load_many(Path, paths), workers=2, chunk_size=3) == paths
+
+
+def test_worker_registrations():
+    registrations = batch._registrations()
+    set_serializer(Point, dump)
+    set_deserializer(Point, dump)
+    batch._init_worker(registrations, {})
+    assert dump(Point(1, 2)) == "1,2"
+    assert load(Point, "1,2") == Point(1, 2)
@@ -0,0 +1,104 @@
+import enum
+from typing import Dict, List, Tuple
+
+import pytest
+
+from obdictive import Obdictive, OList, serializable, serializable_enum, serializer_for, deserializer_for, load, dump, \
+    json_dumps, binary_dumps, binary_loads
+from obdictive.obdictive_exceptions import ObdictiveDeserializationException
+
+
+@serializable_enum
+class Color(enum.Enum):
+    RED = 'red'
+    BLUE = 'blue'
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def __eq__(self, other):
+        return (self.x, self.y) == (other.x, other.y)
+
+
+@serializer_for(Point)
+def _point_serializer(p: Point):
+    return [p.x, p.y]
+
+
+@deserializer_for(Point)
+def _point_deserializer(value: list):
+    return Point(*value)
+
+
+class Pet(Obdictive):
+    name: str
+    age: int = 1
+    weight: float = 1.5
+    color: Color = Color.RED
+
+
+class Child(Obdictive):
+    name: str
+    pets: OList[Pet]
+    toys: Dict[str, int]
+    position: Tuple[int, str]
+    scores: Tuple[float, ...]
+    home: Point
+    good: bool = True
+
+
+@serializable
+class Toy:
+    name: str
+    price: float = 0.5
+
+
+class Box(Obdictive):
+    toys: List[Toy]
+    ids: Dict[int, List[int]]
+
+
+_CHILD = {'name': 'Jimmy', 'pets': [{'name': 'Tiger', 'age': -300, 'color': 'blue'}, {'name': 'Rex', 'weight': 2e10}],
+          'toys': {'ball': 2**70}, 'position': [1, 'a'], 'scores': [0.5, -1.0], 'home': [3, 4]}
+
+
+def test_round_trip():
+    child = load(Child, _CHILD)
+    data = binary_dumps(child)
+    assert binary_loads(Child, data) == child
+    assert len(data) < len(json_dumps(child)) / 2
+
+    box = Box(toys=[load(Toy, {'name': 'car'})], ids={1: [2, 3], -4: []})
+    assert dump(binary_loads(Box, binary_dumps(box))) == dump(box)
+    assert binary_loads(List[Pet], binary_dumps(child.pets, List[Pet])) == child.pets
+
+
+def test_unset_and_mismatched_fields():
+    child = load(Child, _CHILD)
+    del child.good
+    child.name = None
+    child.pets[0].age = '4'
+    child.pets[1] = load(type('BigPet', (Pet,), {'__annotations__': {'size': int}}), {'name': 'Big', 'size': 3})
+    child.toys[5] = 5
+    # the same result as going through the dumped form
+    assert binary_loads(Child, binary_dumps(child)) == load(Child, dump(child))
+
+
+def test_schema_fingerprint():
+    data = binary_dumps(load(Pet, {'name': 'Tiger'}))
+
+    class Pet2(Obdictive):
+        name: str
+        age: int = 1
+
+    with pytest.raises(ObdictiveDeserializationException):
+        binary_loads(Pet2, data)
+    with pytest.raises(ObdictiveDeserializationException):
+        binary_loads(Pet, data[:-3])
+    with pytest.raises(ObdictiveDeserializationException):
+        binary_loads(Pet, data + b'\0')
+    with pytest.raises(ObdictiveDeserializationException):
+        binary_loads(Pet, b'{}' + data)
@@ -0,0 +1,143 @@
+from typing import List
+
+import obdictive.serialization as otd
+from obdictive import Obdictive, dump, load, config, serializer_for
+from obdictive.codegen import compiled_serializer, GENERATED_FOR
+from obdictive.default_serializers import get_annotations
+
+
+class Pet(Obdictive):
+    name: str
+    age: int
+
+
+class Child(Obdictive):
+    name: str
+    pet: Pet
+    pets: List[Pet]
+    score: float = 1.5
+
+
+class Node(Obdictive):
+    value: int
+    next: 'Node'
+
+
+def _child():
+    return Child(name="Sarah", pet=Pet(name="Whiskers", age=2), pets=[Pet(name="Tiger", age=4)])
+
+
+def test_compiled_matches_dynamic():
+    expected = dump(_child())
+    config.compile_serializers = True
+    try:
+        assert dump(_child()) == expected
+        assert compiled_serializer(Child)(_child()) == expected
+    finally:
+        config.compile_serializers = False
+
+
+def test_compiled_skips_unset():
+    assert compiled_serializer(Pet)(Pet(name="Whiskers")) == {'name': 'Whiskers'}
+
+
+def test_compiled_recursive():
+    n = Node(value=1)
+    n.next = Node(value=2)
+    assert compiled_serializer(Node)(n) == {'value': 1, 'next': {'value': 2}}
+
+
+def test_compiled_respects_registered_serializers():
+    orig = otd.serializers_map[int]
+
+    @serializer_for(int)
+    def serializer(i: int):
+        return str(i)
+
+    try:
+        assert compiled_serializer(Pet)(Pet(name="Whiskers", age=2)) == {'name': 'Whiskers', 'age': '2'}
+    finally:
+        otd.set_serializer(int, orig)
+
+    assert compiled_serializer(Pet)(Pet(name="Whiskers", age=2)) == {'name': 'Whiskers', 'age': 2}
+
+
+class NamedChild(Child):
+    nickname: str = ""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.upper = self.name.upper()
+
+
+class Odd(Obdictive):
+    _add_annot = {'not-an-identifier': int}
+    value: int = 0
+
+
+def test_generated_init():
+    assert getattr(Child.__init__, GENERATED_FOR) is Child
+    child = Child(name="Sarah", unknown=1)
+    assert (child.name, child.score) == ("Sarah", 1.5)
+    assert not hasattr(child, 'pet')
+    assert load(Child, {'name': "Sarah"}) == child
+
+    named = NamedChild(name="John", nickname="J")
+    assert (named.nickname, named.upper, named.score) == ("J", "JOHN", 1.5)
+    assert load(NamedChild, {'name': "John"}).upper == "JOHN"
+
+    assert getattr(Odd.__init__, GENERATED_FOR, None) is None
+    odd = load(Odd, {'not-an-identifier': 1})
+    assert (getattr(odd, 'not-an-identifier'), odd.value) == (1, 0)
+
+
+class NamedGrandchild(NamedChild):
+    pass
+
+
+class Greeter:
+    def __init__(self, **kwargs):
+        self.greeting = F"Hello {kwargs.get('name')}"
+        super().__init__(**kwargs)
+
+
+class GreetedPet(Greeter, Pet):
+    pass
+
+
+def test_inherited_init():
+    assert '__init__' not in NamedGrandchild.__dict__
+    assert NamedGrandchild(name="John").upper == "JOHN"
+    assert load(NamedGrandchild, {'name': "John"}).upper == "JOHN"
+
+    pet = load(GreetedPet, {'name': "Tiger", 'age': 4})
+    assert (pet.greeting, pet.name, pet.age) == ("Hello Tiger", "Tiger", 4)
+    assert GreetedPet(name="Tiger").greeting == "Hello Tiger"
+
+
+def test_generated_init_reload():
+    class Reloaded(Obdictive):
+        a: int = 1
+
+    Reloaded.__annotations__['b'] = int
+    Reloaded.b = 2
+    get_annotations(Reloaded, reload_cache=True)
+    assert dump(Reloaded()) == {'a': 1, 'b': 2}
+    assert load(Reloaded, {'a': 3}) == Reloaded(a=3)
+
+
+def test_lazy_generated_methods():
+    class Lazy(Obdictive, frozen=True, order=True):
+        a: int
+        b: str = 'b'
+
+    stub = Lazy.__dict__['__init__']
+    assert getattr(stub, GENERATED_FOR) is Lazy
+    first = Lazy(a=1)
+    generated = Lazy.__dict__['__init__']
+    assert generated is not stub and getattr(generated, GENERATED_FOR) is Lazy
+    assert (first.a, first.b) == (1, 'b')
+    assert first == Lazy(a=1) and first != Lazy(a=2) and first < Lazy(a=2)
+    assert hash(first) == hash(load(Lazy, {'a': 1}))
+    for name in ('__eq__', '__hash__', '__lt__'):
+        assert Lazy.__dict__[name].__code__ is not stub.__code__
@@ -0,0 +1,84 @@
+import array
+import enum
+from typing import List
+
+import pytest
+
+from obdictive import Obdictive, serializable, serializable_enum, load, dump, to_columns, from_columns
+
+
+class Pet(Obdictive):
+    name: str
+    age: int = 1
+    weight: float = 1.5
+    good: bool = True
+
+
+class Child(Obdictive):
+    name: str
+    pet: Pet
+    toys: List[str]
+
+
+@serializable
+class Toy:
+    name: str
+    price: float = 0.5
+
+
+@serializable_enum
+class Color(enum.Enum):
+    RED = 'red'
+    BLUE = 'blue'
+
+
+@serializable
+class Kennel:
+    color: Color
+    pets: List[Pet]
+
+
+_CHILDREN = [{'name': F"child{i}", 'pet': {'name': F"pet{i}", 'age': i, 'good': i % 2 == 0}, 'toys': ['ball'] * i}
+             for i in range(4)]
+
+
+def test_to_columns():
+    columns = to_columns(load(List[Child], _CHILDREN), use_numpy=False)
+    assert list(columns) == ['name', 'pet.name', 'pet.age', 'pet.weight', 'pet.good', 'toys']
+    assert columns['name'] == ['child0', 'child1', 'child2', 'child3']
+    assert columns['pet.age'] == array.array('q', [0, 1, 2, 3])
+    assert columns['pet.weight'] == array.array('d', [1.5] * 4)
+    assert columns['pet.good'].tolist() == [1, 0, 1, 0]
+    assert columns['toys'] == [[], ['ball'], ['ball', 'ball'], ['ball'] * 3]
+    assert to_columns([], Toy, use_numpy=False) == {'name': [], 'price': array.array('d')}
+
+    with pytest.raises(TypeError):
+        to_columns([1, 2])
+
+
+def test_round_trip():
+    children = load(List[Child], _CHILDREN)
+    del children[1].pet
+    children[2].pet.age = 2 ** 70
+    columns = to_columns(children, use_numpy=False)
+    assert columns['pet.age'] == [0, None, 2 ** 70, 3]  # does not fit an array
+    assert [dump(child) for child in from_columns(Child, columns)] == [dump(child) for child in children]
+
+    toys = from_columns(Toy, {'name': ['a', 'b']})
+    assert [(toy.name, toy.price) for toy in toys] == [('a', 0.5), ('b', 0.5)]
+    with pytest.raises(ValueError):
+        from_columns(Toy, {'name': ['a', 'b'], 'price': [1.0]})
+
+    kennel = Kennel()
+    kennel.color, kennel.pets = Color.BLUE, [Pet(name='Rex')]
+    columns = to_columns([kennel], use_numpy=False)
+    assert columns == {'color': ['blue'], 'pets': [[{'name': 'Rex', 'age': 1, 'weight': 1.5, 'good': True}]]}
+    rebuilt, = from_columns(Kennel, columns)
+    assert rebuilt.color is Color.BLUE and rebuilt.pets == [Pet(name='Rex')]
+
+
+def test_numpy():
+    numpy = pytest.importorskip('numpy')
+    columns = to_columns(load(List[Child], _CHILDREN))
+    assert isinstance(columns['pet.age'], numpy.ndarray) and columns['pet.age'].sum() == 6
+    assert from_columns(Child, columns) == load(List[Child], _CHILDREN)
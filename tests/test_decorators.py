@@ -42,3 +42,34 @@ def test_serializable_variables():
     assert otd.serializers_map[ExampleClass1] == _serializer
     assert dto.deserializers_map[ExampleClass1] == _deserializer
 
+
+def test_serializable_marks_inherited():
+    @serializable
+    class Base:
+        def __init__(self, i: int):
+            self.i = i
+
+        @serializer
+        def _serializer(self):
+            return self.i
+
+        @staticmethod
+        @deserializer
+        def _deserializer(value):
+            return Base(value)
+
+    class Derived(Base):
+        def _serializer(self):  # no longer the serializer
+            return -self.i
+
+    serializable(Derived, deep_search=True)
+    assert otd.serializers_map[Derived] is not Derived._serializer
+    assert dto.deserializers_map[Derived] is Base._deserializer
+
+    class Marked(Derived):
+        @serializer
+        def _dump(self):
+            return str(self.i)
+
+    serializable(Marked, deep_search=True)
+    assert dump(Marked(1)) == '1'
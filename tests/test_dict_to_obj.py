@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Dict, Tuple, List
 
 import obdictive.deserialization as dto
 import obdictive.generics
@@ -74,3 +74,32 @@ def test_load():
 
     assert dto.load(ComplexExampleClass, {'t': (1, 'a', {'i': 2, 's': 'b'}), 'ec': {'i': 3, 's': 'c'}}) == \
            ComplexExampleClass((1, 'a', ExampleClass(2, 'b')), ExampleClass(3, 'c'))
+
+
+def test_load_generic_aliases():
+    assert dto.load(List[int], ['1', 2]) == [1, 2]
+    assert dto.load(list[ExampleClass], [{'i': 1, 's': 'a'}]) == [ExampleClass(1, 'a')]
+    assert dto.load(Dict[str, List[int]], {'a': [1, '2']}) == {'a': [1, 2]}
+    assert dto.load(Tuple[int, ...], [1, '2', 3]) == (1, 2, 3)
+    assert dto.load(tuple[int, str], ['1', 2]) == (1, '2')
+
+
+def test_load_special_types():
+    from obdictive import OList, ODict, OTuple
+
+    assert dto.load(OList[int], ['1', 2]) == [1, 2]
+    assert dto.load(ODict[str, ExampleClass], {'a': {'i': 1, 's': 'a'}}) == {'a': ExampleClass(1, 'a')}
+    assert dto.load(OTuple[int, str], ['1', 2]) == (1, '2')
+
+
+def test_plans_follow_registration():
+    class Late:
+        def __init__(self, v):
+            self.v = v
+
+    plan = dto.get_plan(List[Late])
+    assert dto.get_plan(List[Late]) is plan
+
+    dto.set_deserializer(Late, Late)
+    assert dto.get_plan(List[Late]) is not plan
+    assert [x.v for x in dto.load(List[Late], [1, 2])] == [1, 2]
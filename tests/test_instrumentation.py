@@ -0,0 +1,85 @@
+from typing import List
+
+import obdictive.deserialization as dto
+import obdictive.serialization as otd
+from obdictive import Obdictive, OList, load, dump, json_dumps, json_loads, binary_dumps, binary_loads, \
+    serializer_for, deserializer_for, instrumented, stats
+from obdictive import instrumentation
+
+
+class Point:
+    def __init__(self, x):
+        self.x = x
+
+
+@serializer_for(Point)
+def _point_serializer(p: Point):
+    return str(p.x)
+
+
+@deserializer_for(Point)
+def _point_deserializer(value: str):
+    return Point(int(value))
+
+
+class Pet(Obdictive):
+    name: str
+    age: int = 1
+    home: Point = None
+
+
+class Child(Obdictive):
+    name: str
+    pets: List[Pet]
+
+
+_CHILDREN = [{'name': F"child{i}", 'pets': [{'name': 'pet', 'home': '3'}] * 3} for i in range(10)]
+
+
+def test_counters():
+    serializers = dict(otd.serializers_map)
+    with instrumented(sample_every=1):
+        children = load(List[Child], _CHILDREN)
+        assert dump(json_loads(List[Child], json_dumps(children))) == dump(children)
+        snapshot = stats()
+    assert not instrumentation.enabled()
+    assert dict(otd.serializers_map) == serializers
+    assert dto.get_plan(Point) is _point_deserializer
+
+    loaded, dumped = snapshot['load'], snapshot['dump']
+    assert loaded[Child]['calls'] == 20 and loaded[Pet]['calls'] == 60 and loaded[Point]['calls'] == 60
+    assert loaded[List[Child]]['calls'] == 2 and loaded[List[Child]]['max_size'] == 10
+    assert loaded[Point]['method'] == '_point_deserializer'
+    assert dumped[Pet]['calls'] == 90 and dumped[Point]['calls'] == 90 and dumped[Pet]['max_depth'] == 4
+    assert loaded[Child]['time'] >= loaded[Child]['self_time'] > 0
+    assert int not in loaded
+
+    load(Child, _CHILDREN[0])  # not counted when disabled
+    assert stats()['load'][Child]['calls'] == 20
+
+
+def test_unchanged_behavior():
+    children = load(List[Child], _CHILDREN)
+    data = binary_dumps(children[0])
+    with instrumented():
+        assert binary_dumps(children[0]) == data
+        assert dump(children[0], only=['pets.name']) == {'pets': [{'name': 'pet'}] * 3}
+    assert binary_loads(Child, data).name == 'child0'
+
+
+def test_class_creation_times():
+    pets = OList[Pet]
+    with instrumentation.time_class_creation():
+        Timed = type('Timed', (Obdictive,), {'__annotations__': {'name': str, 'pets': pets}, '__module__': __name__})
+        OList[Timed]
+        OList[Pet]
+    times = instrumentation.class_times()
+    assert Timed in times and OList[Timed] in times and pets not in times  # created before
+    for phase in instrumentation.CLASS_PHASES:
+        assert times[Timed][phase] > 0
+    assert times[Timed]['total'] >= sum(times[Timed][phase] for phase in instrumentation.CLASS_PHASES)
+
+    report = instrumentation.class_creation_report()
+    assert report.startswith("2 classes created in") and 'tests.test_instrumentation.Timed' in report
+    type('Untimed', (Obdictive,), {})
+    assert len(instrumentation.class_times()) == 2
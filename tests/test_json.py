@@ -0,0 +1,119 @@
+import bz2
+import gzip
+import io
+import json
+import lzma
+from typing import Dict, List, Tuple
+
+import pytest
+
+from obdictive import Obdictive, json_iter_load, json_dump, json_load, json_dumps, dump_lines, load_lines, \
+    serializer_for
+
+
+class ExampleClass(Obdictive):
+    i: int
+    s: str
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+@serializer_for(Point)
+def _point_serializer(p: Point):
+    return (p.x, p.y)
+
+
+class Nested(Obdictive):
+    name: str
+    records: List[ExampleClass]
+    scores: Dict[int, float]
+    pair: Tuple[bool, str]
+    point: Point
+    unset: int
+
+
+_RECORDS = [ExampleClass(i=i, s=str(i) * i) for i in range(50)]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1024])
+def test_iter_load_array(chunk_size):
+    data = json.dumps([{'i': x.i, 's': x.s} for x in _RECORDS], indent=2)
+    assert list(json_iter_load(ExampleClass, io.StringIO(data), chunk_size=chunk_size)) == _RECORDS
+    assert list(json_iter_load(ExampleClass, io.BytesIO(data.encode()), chunk_size=chunk_size)) == _RECORDS
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1024])
+def test_iter_load_ndjson(chunk_size):
+    data = "\n".join(json.dumps({'i': x.i, 's': x.s}) for x in _RECORDS) + "\n"
+    assert list(json_iter_load(ExampleClass, io.StringIO(data), chunk_size=chunk_size)) == _RECORDS
+    assert list(json_iter_load(int, io.StringIO("1\n22\n333"), chunk_size=chunk_size)) == [1, 22, 333]
+
+
+def test_iter_load_empty():
+    assert list(json_iter_load(ExampleClass, io.StringIO(""))) == []
+    assert list(json_iter_load(ExampleClass, io.StringIO(" [ ] "))) == []
+
+
+def test_iter_load_invalid():
+    with pytest.raises(json.JSONDecodeError):
+        list(json_iter_load(int, io.StringIO("[1 2]")))
+    with pytest.raises(json.JSONDecodeError):
+        list(json_iter_load(int, io.StringIO("[1, 2")))
+
+
+def test_dump_load_file():
+    text = io.StringIO()
+    json_dump(_RECORDS[3], text, chunk_size=4, indent=2)
+    assert text.getvalue() == json_dumps(_RECORDS[3], indent=2)
+    text.seek(0)
+    assert json_load(ExampleClass, text) == _RECORDS[3]
+
+
+@pytest.mark.parametrize('compression', [gzip, bz2, lzma])
+def test_lines_compressed(compression):
+    raw = io.BytesIO()
+    with compression.open(raw, 'wb') as f:
+        assert dump_lines(_RECORDS, f, chunk_size=100) == len(_RECORDS)
+    raw.seek(0)
+    with compression.open(raw, 'rb') as f:
+        assert list(load_lines(ExampleClass, f)) == _RECORDS
+
+
+def test_lines_text():
+    text = io.StringIO()
+    dump_lines(_RECORDS[:3], text)
+    assert text.getvalue() == '{"i": 0, "s": ""}\n{"i": 1, "s": "1"}\n{"i": 2, "s": "22"}\n'
+    text.seek(0)
+    assert list(load_lines(ExampleClass, text)) == _RECORDS[:3]
+    with pytest.raises(TypeError):
+        dump_lines(_RECORDS, text, indent=2)
+
+
+class _BinaryWriter:  # a file-like object that is not an io class
+    def __init__(self):
+        self.data = b''
+
+    def write(self, data: bytes) -> int:
+        self.data += memoryview(data).tobytes()
+        return len(data)
+
+
+def test_lines_duck_typed():
+    writer = _BinaryWriter()
+    dump_lines(_RECORDS[:3], writer, chunk_size=10)
+    json_dump(_RECORDS[0], writer)
+    assert writer.data == b'{"i": 0, "s": ""}\n{"i": 1, "s": "1"}\n{"i": 2, "s": "22"}\n{"i": 0, "s": ""}'
+
+
+@pytest.mark.parametrize('options', [{}, {'indent': 2}, {'indent': '\t', 'sort_keys': True},
+                                     {'separators': (',', ':'), 'ensure_ascii': False}])
+def test_dumps_direct(options):
+    obj = Nested(name="\u05e9\"\n", records=_RECORDS[:3], scores={2: 0.5, 1: float('inf')}, pair=(True, ''),
+                 point=Point(1, 2.5))
+    for value in (obj, [obj, {'a': obj}], Nested(), [], 1.5, None):
+        assert json_dumps(value, direct=True, **options) == json_dumps(value, **options)
+
@@ -0,0 +1,99 @@
+import copy
+import json
+import pickle
+from typing import Dict, List, Tuple
+
+import pytest
+
+from obdictive import Obdictive, load, dump, dump_many, json_dumps, config
+
+
+class Pet(Obdictive):
+    name: str
+    age: int = 1
+
+
+class Child(Obdictive):
+    name: str
+    pet: Pet
+    pets: List[Pet]
+    scores: Dict[str, float] = {}
+
+
+class SlottedChild(Obdictive, slots=True):
+    name: str
+    pets: List[Pet]
+
+
+class FrozenChild(Obdictive, frozen=True):
+    name: str
+    pets: Tuple[Pet, ...]
+
+
+_CHILD = {'name': 'Sarah', 'pet': {'name': 'Whiskers', 'age': 2},
+          'pets': [{'name': 'Tiger'}, {'name': 'Rex', 'age': 5}]}
+
+
+def test_lazy_load():
+    child = load(Child, _CHILD, lazy=True)
+    assert vars(child)['name'] == 'Sarah' and vars(child)['scores'] == {}
+    assert 'pets' not in vars(child) and 'pet' not in vars(child)
+
+    assert child.pets == [Pet(name='Tiger'), Pet(name='Rex', age=5)]
+    assert 'pets' in vars(child)
+    assert child.pets is child.pets
+    assert child.pet == Pet(name='Whiskers', age=2)
+    assert child == load(Child, _CHILD)
+    assert child._obdictive_lazy is None
+
+    with pytest.raises(AttributeError):
+        child.unknown
+
+
+def test_lazy_nested():
+    child = load(Child, _CHILD, lazy=True)
+    assert child.pet.name == 'Whiskers'
+    family = load(Family, {'children': [_CHILD]}, lazy=True)
+    assert 'pets' not in vars(family.children[0])
+    assert family.children[0].pets[0].name == 'Tiger'
+    assert load(List[Child], [_CHILD], lazy=True) == [load(Child, _CHILD)]
+
+
+class Family(Obdictive):
+    children: List[Child]
+
+
+@pytest.mark.parametrize('compile_serializers', [False, True])
+def test_lazy_dump(compile_serializers, monkeypatch):
+    monkeypatch.setattr(config, 'compile_serializers', compile_serializers)
+    child = load(Child, _CHILD, lazy=True)
+    d = dump(child)
+    assert d == {**_CHILD, 'scores': {}}
+    assert d['pets'] is _CHILD['pets']
+    assert json_dumps(child, direct=True) == json.dumps(d)
+    assert dump_many([child]) == [d]
+
+    child.pets.append(Pet(name='Bob'))
+    assert dump(child)['pets'][-1] == {'name': 'Bob', 'age': 1}
+    assert dump(child)['pet'] is _CHILD['pet']
+    assert json_dumps(child, direct=True) == json.dumps(dump(child))
+
+
+def test_lazy_copies():
+    child = load(Child, _CHILD, lazy=True)
+    copied = copy.copy(child)
+    assert copied.pets == child.pets
+    del copied.pets
+    assert not hasattr(copied, 'pets')
+    assert child.pet == copied.pet
+    assert pickle.loads(pickle.dumps(load(Child, _CHILD, lazy=True))) == child
+
+
+def test_lazy_unsupported():
+    slotted = load(SlottedChild, _CHILD, lazy=True)
+    assert slotted.pets == [Pet(name='Tiger'), Pet(name='Rex', age=5)]
+
+    frozen = load(FrozenChild, _CHILD, lazy=True)
+    assert 'pets' not in vars(frozen)
+    assert hash(frozen) == hash(load(FrozenChild, _CHILD))
+    assert frozen.pets[1].age == 5
@@ -1,4 +1,12 @@
-from obdictive import Obdictive, json_loads
+import abc
+import copy
+import pickle
+from typing import List, Tuple
+
+import pytest
+
+from obdictive import Obdictive, json_loads, json_dumps, load, dump, load_many
+from obdictive.obdictive_exceptions import FrozenInstanceException
 
 
 class ExampleClass(Obdictive):
@@ -10,5 +18,176 @@ def test_deserialize():
     assert json_loads(ExampleClass, '{"i": 1, "s": "123"}') == ExampleClass(i=1, s="123")
 
 
+class SlottedPet(Obdictive, slots=True):
+    name: str
+    age: int = 1
+
+
+class SlottedChild(SlottedPet, slots=True):
+    pets: List[SlottedPet]
+
+
+class UnslottedChild(SlottedPet):
+    toys: List[str] = []
+
+
+def test_slots():
+    pet = SlottedPet(name="Whiskers")
+    assert not hasattr(pet, '__dict__')
+    assert SlottedPet.__slots__ == ('name', 'age')
+    assert SlottedChild.__slots__ == ('pets',)
+    assert (pet.name, pet.age) == ("Whiskers", 1)
+    with pytest.raises(AttributeError):
+        pet.color = "black"
+
+    child = SlottedChild(name="Sarah", pets=[pet])
+    assert not hasattr(child, '__dict__')
+    assert dump(child) == {'name': "Sarah", 'age': 1, 'pets': [{'name': "Whiskers", 'age': 1}]}
+    assert load(SlottedChild, {'name': "Sarah", 'pets': [{'name': "Whiskers"}]}) == child
+    assert load_many(SlottedChild, [dump(child)]) == [child]
+    assert json_loads(SlottedChild, json_dumps(child)) == child
+    assert str(child) == "SlottedChild(age=1, name=Sarah, pets=[SlottedPet(age=1, name=Whiskers)])"
+    assert child != SlottedChild(name="Sarah", pets=[])
+    assert dump(SlottedPet()) == {'age': 1}
+
+    unslotted = UnslottedChild(name="John")
+    assert unslotted.toys == [] and unslotted.age == 1 and hasattr(unslotted, '__dict__')
+
+
+def test_slots_conflict():
+    with pytest.raises(TypeError):
+        class Conflict(Obdictive, slots=True):
+            __slots__ = ('i',)
+            i: int
+
+
+class Version(Obdictive, slots=True, frozen=True, order=True):
+    major: int
+    minor: int = 0
+
+
+class Release(Version, slots=True):
+    tags: Tuple[str, ...] = ()
+
+
+class Package(Obdictive, frozen=True):
+    name: str
+    versions: List[Version]
+
+
+def test_frozen():
+    version = Version(major=1)
+    with pytest.raises(FrozenInstanceException):
+        version.major = 2
+    with pytest.raises(AttributeError):
+        del version.minor
+    assert (version.major, version.minor) == (1, 0)
+
+    assert hash(version) == hash(Version(major=1, minor=0)) == version._obdictive_hash
+    assert version == Version(major=1) and version != Version(major=1, minor=1) and version != Release(major=1)
+    assert {version: 'a'}[load(Version, {'major': 1})] == 'a'
+    assert len({Version(major=1), Version(major=1), Version(major=2)}) == 2
+
+    package = json_loads(Package, '{"name": "a", "versions": [{"major": 1}, {"major": 2, "minor": 1}]}')
+    assert dump(package) == {'name': 'a', 'versions': [{'major': 1, 'minor': 0}, {'major': 2, 'minor': 1}]}
+    assert load_many(Package, [dump(package)]) == [package]
+    assert pickle.loads(pickle.dumps(package)) == package
+    assert copy.deepcopy(version) == version
+
+
+def test_frozen_slots():
+    release = Release(major=1, tags=("stable",))
+    assert not hasattr(release, '__dict__')
+    with pytest.raises(FrozenInstanceException):
+        release.tags = ()
+    assert hash(release) == hash(load(Release, dump(release)))
+    assert pickle.loads(pickle.dumps(release)) == release
+
+    with pytest.raises(TypeError):
+        class Unfrozen(Version, frozen=False):
+            pass
+
+
+def test_order():
+    versions = [Version(major=2), Version(major=1, minor=3), Version(major=1)]
+    assert sorted(versions) == [Version(major=1), Version(major=1, minor=3), Version(major=2)]
+    assert Version(major=1) <= Version(major=1) < Version(major=1, minor=1)
+    assert Version(major=2) > Version(major=1, minor=5) >= Version(major=1, minor=5)
+    with pytest.raises(TypeError):
+        Version(major=1) < Release(major=2)
+
+
+def test_hash():
+    assert hash(ExampleClass(i=1, s="a")) == hash(ExampleClass(i=1, s="a"))
+    assert hash(ExampleClass(i=1, s="a")) != hash(ExampleClass(i=2, s="a"))
+    unhashable = ExampleClass(i=[1], s="a")
+    assert hash(unhashable) == object.__hash__(unhashable)
+
+
+class CaseInsensitive(Obdictive):
+    name: str
+
+    def __eq__(self, o):
+        return isinstance(o, CaseInsensitive) and self.name.lower() == o.name.lower()
+
+    def __lt__(self, o):
+        return self.name.lower() < o.name.lower()
+
+    def __hash__(self):
+        return hash(self.name.lower())
+
+
+class CaseInsensitiveChild(CaseInsensitive, order=True):
+    pass
+
+
+class FrozenCaseInsensitive(CaseInsensitive, frozen=True):
+    pass
+
+
+class EqualByName(Obdictive):  # defining __eq__ sets __hash__ to None
+    name: str
+    age: int = 0
+
+    def __eq__(self, o):
+        return isinstance(o, EqualByName) and self.name == o.name
+
+
+class FrozenEqualByName(EqualByName, frozen=True):
+    pass
+
+
+def test_inherited_methods():
+    assert CaseInsensitiveChild(name='A') == CaseInsensitiveChild(name='a')
+    assert CaseInsensitiveChild(name='a') < CaseInsensitiveChild(name='B')
+    assert hash(FrozenCaseInsensitive(name='A')) == hash(FrozenCaseInsensitive(name='a'))
+    assert FrozenCaseInsensitive(name='A') == FrozenCaseInsensitive(name='a')
+    assert FrozenEqualByName(name='a', age=1) == FrozenEqualByName(name='a', age=2)
+    assert hash(FrozenEqualByName(name='a')) == hash(FrozenEqualByName(name='a'))
+
+
+class Shape(Obdictive, abc.ABC):
+    name: str
+
+    @abc.abstractmethod
+    def area(self) -> float:
+        pass
+
+
+class Square(Shape):
+    side: float
+
+    def area(self) -> float:
+        return self.side ** 2
+
+
+def test_abc():
+    with pytest.raises(TypeError):
+        Shape(name='shape')
+    square = load(Square, {'name': 'a', 'side': 2})
+    assert square.area() == 4 and isinstance(square, Shape)
+    assert dump(square) == {'name': 'a', 'side': 2.0}
+
+
 if __name__ == '__main__':
     test_deserialize()
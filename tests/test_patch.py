@@ -0,0 +1,100 @@
+import json
+from typing import Dict, List, Tuple
+
+import pytest
+
+from obdictive import Obdictive, OList, load, dump, diff, apply_patch
+
+
+class Pet(Obdictive):
+    name: str
+    age: int = 1
+
+
+class Tag(Obdictive, frozen=True):
+    name: str
+    weight: float = 1.0
+
+
+class Child(Obdictive):
+    name: str
+    pet: Pet
+    pets: List[Pet]
+    scores: Dict[int, float]
+    tags: Tuple[Tag, ...] = ()
+
+
+class TrackedChild(Obdictive, track=True):
+    name: str
+    pets: OList[Pet]
+
+
+_CHILD = {'name': 'Sarah', 'pet': {'name': 'Whiskers', 'age': 2}, 'pets': [{'name': 'Tiger'}, {'name': 'Rex'}],
+          'scores': {1: 0.5, 2: 1.0}, 'tags': [{'name': 'a/b'}]}
+
+
+def _changed(**changes):
+    return load(Child, {**_CHILD, **changes})
+
+
+def test_diff():
+    a = load(Child, _CHILD)
+    assert diff(a, a) == [] and diff(a, load(Child, _CHILD)) == []
+    assert diff(a, _changed(pet={'name': 'Whiskers', 'age': 3})) == [{'op': 'replace', 'path': '/pet/age', 'value': 3}]
+    assert diff(a, _changed(pets=[{'name': 'Tiger'}])) == [{'op': 'remove', 'path': '/pets/1'}]
+    assert diff(a, _changed(pets=[*_CHILD['pets'], {'name': 'Bob', 'age': 4}])) == \
+           [{'op': 'add', 'path': '/pets/2', 'value': {'name': 'Bob', 'age': 4}}]
+    assert diff(a, _changed(scores={1: 0.5, 3: 2.0})) == \
+           [{'op': 'remove', 'path': '/scores/2'}, {'op': 'add', 'path': '/scores/3', 'value': 2.0}]
+    assert diff(a, _changed(tags=[{'name': 'a/b', 'weight': 2.0}])) == \
+           [{'op': 'replace', 'path': '/tags/0/weight', 'value': 2.0}]
+
+    b = load(Child, _CHILD)
+    del b.pet
+    assert diff(a, b) == [{'op': 'remove', 'path': '/pet'}]
+    assert diff(b, a) == [{'op': 'add', 'path': '/pet', 'value': {'name': 'Whiskers', 'age': 2}}]
+    assert diff(Child(name='a'), Pet(name='a')) == [{'op': 'replace', 'path': '', 'value': {'name': 'a', 'age': 1}}]
+    assert diff({'a/b~': 1}, {'a/b~': 2}) == [{'op': 'replace', 'path': '/a~1b~0', 'value': 2}]
+
+
+def test_diff_hashed():
+    a, b = Tag(name='x'), Tag(name='x')
+    assert hash(a) == hash(b) and diff(a, b) == []
+    assert diff(a, Tag(name='y')) == [{'op': 'replace', 'path': '/name', 'value': 'y'}]
+
+
+@pytest.mark.parametrize('changes', [
+    {'pet': {'name': 'Max', 'age': 3}}, {'pets': []}, {'pets': [{'name': 'Tiger'}, {'name': 'Rex'}, {'name': 'Bob'}]},
+    {'scores': {2: 3.0, 4: 1.0}}, {'tags': [{'name': 'c', 'weight': 0.5}, {'name': 'd'}]}, {'name': 'John'},
+])
+def test_apply_patch(changes):
+    a, b = load(Child, _CHILD), _changed(**changes)
+    pets, tags = a.pets, a.tags
+    patch = json.loads(json.dumps(diff(a, b)))
+    assert apply_patch(a, patch) is a
+    assert a == b
+    assert a.pets is pets
+    if 'tags' not in changes:
+        assert a.tags is tags
+
+
+def test_apply_patch_frozen():
+    tag = Tag(name='a')
+    hash(tag)
+    patched = apply_patch(tag, [{'op': 'replace', 'path': '/weight', 'value': 2}])
+    assert patched == Tag(name='a', weight=2) and tag == Tag(name='a')
+    assert hash(patched) == hash(Tag(name='a', weight=2))
+
+    with pytest.raises(ValueError):
+        apply_patch(tag, [{'op': 'replace', 'path': '/unknown', 'value': 2}])
+    with pytest.raises(ValueError):
+        apply_patch(tag, [{'op': 'move', 'path': '/name', 'from': '/weight'}])
+
+
+def test_apply_patch_tracked():
+    child = load(TrackedChild, {'name': 'a', 'pets': [{'name': 'Tiger'}]})
+    dump(child)
+    apply_patch(child, [{'op': 'add', 'path': '/pets/-', 'value': {'name': 'Rex'}}])
+    assert dump(child)['pets'] == [{'name': 'Tiger', 'age': 1}, {'name': 'Rex', 'age': 1}]
+    apply_patch(child, [{'op': 'replace', 'path': '/pets/0/age', 'value': 5}])
+    assert dump(child)['pets'][0]['age'] == 5
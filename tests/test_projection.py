@@ -0,0 +1,97 @@
+from typing import Dict, List, Optional, Union
+
+import pytest
+
+from obdictive import Obdictive, serializable, load, dump, json_dumps
+
+
+class Customer(Obdictive):
+    id: int
+    name: str
+    email: str = ""
+
+
+class Item(Obdictive):
+    sku: str
+    price: float
+    count: int = 1
+
+
+class Order(Obdictive, frozen=True):
+    customer: Customer
+    items: List[Item]
+    tags: Dict[str, Item] = {}
+    total: float
+
+
+class Gift(Obdictive):
+    to: Optional[Customer] = None
+    items: Union[Item, List[Item], str]
+
+
+@serializable
+class Note:
+    text: str
+    order: Order
+
+
+_ORDER = {'customer': {'id': 7, 'name': 'Sarah'}, 'items': [{'sku': 'a', 'price': 1.5}, {'sku': 'b', 'price': 2.0}],
+          'tags': {'gift': {'sku': 'c', 'price': 0.0}}, 'total': 3.5}
+
+
+def test_load_only():
+    order = load(Order, _ORDER, only=["customer.id", "total"])
+    assert order.customer.id == 7 and order.total == 3.5
+    assert set(vars(order)) == {'customer', 'total'} and vars(order.customer) == {'id': 7}
+
+    order = load(Order, _ORDER, only=["items.sku", "tags.sku", "customer", "customer.id"])
+    assert [item.sku for item in order.items] == ['a', 'b']
+    assert vars(order.items[0]) == {'sku': 'a'}
+    assert order.customer == load(Customer, _ORDER['customer'])
+    assert vars(order.tags["gift"]) == {"sku": "c"}
+
+    note = load(Note, {'text': 'hi', 'order': _ORDER}, only=["order.total"])
+    assert not hasattr(note, 'text') and vars(note.order) == {'total': 3.5}
+
+
+def test_load_exclude():
+    order = load(Order, _ORDER, exclude=["items.price", "tags", "customer.name"])
+    assert [(item.sku, item.count) for item in order.items] == [('a', 1), ('b', 1)]
+    assert 'price' not in vars(order.items[0]) and 'tags' not in vars(order)
+    assert vars(order.customer) == {'id': 7, 'email': ""}
+
+    order = load(Order, _ORDER, only=["customer"], exclude=["customer.email"])
+    assert vars(order.customer) == {'id': 7, 'name': 'Sarah'}
+
+
+def test_invalid_paths():
+    with pytest.raises(ValueError):
+        load(Order, _ORDER, only=["customer.unknown"])
+    with pytest.raises(ValueError):
+        load(Order, _ORDER, only=["total.value"])
+    with pytest.raises(ValueError):
+        load(Order, _ORDER, only=["total"], lazy=True)
+
+
+def test_dump_only():
+    order = load(Order, _ORDER)
+    assert dump(order, only=["customer.id", "total"]) == {'customer': {'id': 7}, 'total': 3.5}
+    assert dump(order, exclude=["items", "tags", "customer"]) == {'total': 3.5}
+    assert dump([order], only=["items.sku"]) == [{'items': [{'sku': 'a'}, {'sku': 'b'}]}]
+    assert json_dumps(order, only=["tags.price"], direct=True) == '{"tags": {"gift": {"price": 0.0}}}'
+    with pytest.raises(ValueError):
+        dump(order, only=["total.value"])
+
+
+def test_optional_fields():
+    order = Order(customer=None, items=[], total=0.0)
+    assert dump(order, only=['customer.id']) == {'customer': None}
+    assert json_dumps(order, exclude=['customer.name', 'items']) == '{"customer": null, "tags": {}, "total": 0.0}'
+
+    gift = load(Gift, {'to': _ORDER['customer'], 'items': _ORDER['items']}, only=['to.id', 'items.sku'])
+    assert vars(gift.to) == {'id': 7} and [vars(item) for item in gift.items] == [{'sku': 'a'}, {'sku': 'b'}]
+    gift = load(Gift, {'to': None, 'items': 'none'}, exclude=['to.name', 'items.price'])
+    assert gift.to is None and gift.items == 'none'
+    gift = load(Gift, {'items': {'sku': 'a', 'price': 1.0}}, exclude=['items.price'])
+    assert vars(gift.items) == {'sku': 'a', 'count': 1}
+    assert dump(gift, only=['to.id']) == {'to': None}
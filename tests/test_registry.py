@@ -0,0 +1,120 @@
+import sys
+import threading
+from typing import List
+
+import obdictive.default_serializers as ds
+import obdictive.deserialization as dto
+import obdictive.serialization as otd
+from obdictive import Obdictive, OList, load, dump
+from obdictive.registry import Registry
+
+
+class Pet(Obdictive):
+    name: str
+    age: int = 1
+
+
+class Child(Obdictive):
+    name: str
+    pets: OList[Pet]
+    toys: List[str]
+
+
+_CHILDREN = [{'name': F"child{i}", 'pets': [{'name': F"pet{j}", 'age': j} for j in range(i % 4)], 'toys': ['ball']}
+             for i in range(20)]
+
+
+def test_copy_on_write():
+    registry = Registry({1: 'a'})
+    snapshot = registry.snapshot
+    registry[2] = 'b'
+    assert snapshot == {1: 'a'}
+    assert dict(registry) == {1: 'a', 2: 'b'}
+    assert registry.setdefault(2, 'c') == 'b'
+    assert registry.setdefault(3, 'c') == 'c'
+    del registry[1]
+    assert registry.pop(2) == 'b'
+    assert list(registry.items()) == [(3, 'c')]
+    registry.clear()
+    assert len(registry) == 0 and registry.get(3) is None
+
+
+def test_batched_writes():
+    registry = Registry({i: i for i in range(1000)})
+    snapshot = registry.snapshot
+    for i in range(1000, 1100):
+        registry[i] = i  # pending, not copied
+        assert registry.get(i) == i and i in registry and registry[i] == i
+    assert registry.get(0) == 0 and registry.get(-1) is None
+    assert registry.setdefault(1050, 0) == 1050
+    assert registry.snapshot is not snapshot and len(snapshot) == 1000
+    assert type(registry.get) is type({}.get)
+
+    registry[-1] = -1
+    for _ in range(1000):
+        assert registry.get(-1) == -1
+    assert type(registry.get) is type({}.get)  # merged after enough reads
+    assert len(registry) == 1101
+
+    registry[-2] = -2
+    registry.clear()
+    assert registry.get(-2) is None and -2 not in registry and len(registry) == 0
+
+
+def test_reads_are_dict_reads():
+    for registry in (otd.serializers_map, dto.deserializers_map, dto.plans_cache, ds.annotations_cache):
+        registry.flush()  # or read it enough times
+        assert type(registry.get) is type({}.get)
+
+    # the hot path reads through an instance attribute holding the `get` of a plain dict, like reading a dict stored
+    # in an attribute
+    registry = Registry({int: 1})
+    assert vars(registry)['get'].__self__ is registry.snapshot and type(registry.snapshot) is dict
+
+
+def test_concurrent_registration():
+    expected = [load(Child, d) for d in _CHILDREN]
+    errors = []
+    stop = threading.Event()
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+
+    def read():
+        try:
+            while not stop.is_set():
+                children = [load(Child, d) for d in _CHILDREN]
+                assert children == expected
+                assert [dump(c) for c in children] == _CHILDREN
+        except BaseException as e:
+            errors.append(e)
+
+    created = []
+
+    def write(n):
+        try:
+            for i in range(50):
+                cls = type(F"Pet{n}_{i}", (Pet,), {'__annotations__': {'color': str}})
+                created.append((cls, OList[cls], OList[Pet]))
+                loaded = load(OList[cls], [{'name': 'a', 'color': 'red'}])
+                assert dump(loaded) == [{'name': 'a', 'age': 1, 'color': 'red'}]
+        except BaseException as e:
+            errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    writers = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+    try:
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+    finally:
+        stop.set()
+        for thread in readers:
+            thread.join()
+        sys.setswitchinterval(switch_interval)
+
+    assert not errors, errors
+    assert len({id(o_list) for _, _, o_list in created}) == 1
+    for cls, o_list, _ in created:
+        assert OList[cls] is o_list
+        assert cls in otd.serializers_map and cls in dto.deserializers_map
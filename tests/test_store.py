@@ -0,0 +1,90 @@
+import os
+from typing import List
+
+import pytest
+
+from obdictive import Obdictive, load, dump_lines, RecordStore
+from obdictive.store import INDEX_SUFFIX
+from obdictive.obdictive_exceptions import ObdictiveDeserializationException
+
+
+class Pet(Obdictive):
+    name: str
+    age: int = 1
+
+
+class Child(Obdictive):
+    name: str
+    pets: List[Pet]
+
+
+_CHILDREN = [{'name': F"child{i}", 'pets': [{'name': F"pet{j}", 'age': j} for j in range(i % 3)]} for i in range(10)]
+
+
+@pytest.mark.parametrize('format', ['binary', 'json'])
+def test_random_access(tmp_path, format):
+    children = load(List[Child], _CHILDREN)
+    path = tmp_path / 'children'
+    with RecordStore(path, Child, format) as store:
+        store.append(children[0])
+        store.extend(children[1:])
+        assert len(store) == 10
+        assert store[3] == children[3] and store[-1] == children[-1]
+        assert store[2:8:2] == children[2:8:2]
+        assert list(store) == children
+        with pytest.raises(IndexError):
+            store[10]
+
+    with RecordStore(path, Child, readonly=True) as store:
+        assert store.format == format
+        assert store[5] == children[5]
+        with pytest.raises(ValueError):
+            store.append(children[0])
+
+
+def test_recovery(tmp_path):
+    children = load(List[Child], _CHILDREN)
+    path = tmp_path / 'children'
+    with RecordStore(path, Child) as store:
+        store.extend(children[:5])
+    with open(path, 'ab') as f:  # an interrupted append
+        f.write(b'\x00\x05')
+    with RecordStore(path, Child) as store:
+        store.append(children[5])
+        assert list(store) == children[:6]
+
+    with open(path, 'r+b') as f:  # the offsets of the last record were written, but not all of its data
+        f.truncate(os.path.getsize(path) - 1)
+    with RecordStore(path, Child) as store:
+        assert list(store) == children[:5]
+        store.append(children[5])
+    with RecordStore(path, Child) as store:
+        assert list(store) == children[:6]
+
+    with pytest.raises(ObdictiveDeserializationException):
+        RecordStore(path, Pet)
+    with pytest.raises(ObdictiveDeserializationException):
+        RecordStore(path, Child, 'json')
+
+
+def test_json_lines_file(tmp_path):
+    children = load(List[Child], _CHILDREN)
+    path = tmp_path / 'children.jsonl'
+    with open(path, 'w') as f:
+        dump_lines(children, f)
+    with RecordStore(path, Child, readonly=True) as store:  # the index is built in memory
+        assert store.format == 'json' and len(store) == 10 and store[4] == children[4]
+    assert not os.path.exists(str(path) + INDEX_SUFFIX)
+    with RecordStore(path, Child) as store:  # the index is built from the lines
+        assert store.format == 'json'
+        assert list(store) == children
+    assert os.path.exists(str(path) + INDEX_SUFFIX)
+
+
+def test_json_values(tmp_path):
+    for i, (cls, values) in enumerate(((List[int], [[1, 2], []]), (str, ["a", "b\nc"]), (int, [1, 2]))):
+        path = tmp_path / F"values{i}"
+        with RecordStore(path, cls, 'json') as store:
+            store.extend(values)
+        with RecordStore(path, cls) as store:
+            assert store.format == 'json' and list(store) == values
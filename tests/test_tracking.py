@@ -0,0 +1,160 @@
+import copy
+import gc
+import pickle
+import weakref
+from typing import List
+
+from obdictive import Obdictive, OList, ODict, load, dump, json_dumps, invalidate
+
+
+class Pet(Obdictive, track=True):
+    name: str
+    age: int = 1
+
+
+class Toy(Obdictive):
+    name: str
+
+
+class Child(Obdictive, track=True):
+    name: str
+    pet: Pet
+    pets: OList[Pet]
+    friends: ODict[str, Pet]
+    toys: List[Toy] = []
+
+
+class Box(Obdictive):
+    pet: Pet
+    pets: OList[Pet] = OList[Pet]()
+
+
+class Holder(Obdictive, track=True):
+    pets: List[Pet]
+    box: Box
+
+
+class SlottedChild(Obdictive, slots=True, track=True):
+    name: str
+    pets: OList[Pet]
+    nickname: str = ""
+
+
+_CHILD = {'name': 'Sarah', 'pet': {'name': 'Whiskers', 'age': 2}, 'pets': [{'name': 'Tiger', 'age': 1}],
+          'friends': {'bob': {'name': 'Rex', 'age': 3}}, 'toys': [{'name': 'ball'}]}
+
+
+def test_dump_is_kept():
+    child = load(Child, _CHILD)
+    assert isinstance(child.pets, OList) and isinstance(child.friends, ODict)
+    d = dump(child)
+    assert d == _CHILD
+    assert dump(child) is d
+    assert json_dumps(child) == json_dumps(load(Child, _CHILD))
+
+
+def test_changes():
+    child = load(Child, _CHILD)
+    d = dump(child)
+
+    child.pet.age = 3
+    changed = dump(child)
+    assert changed is not d and changed['pet'] == {'name': 'Whiskers', 'age': 3}
+    assert changed['pets'] is d['pets'] and changed['friends'] is d['friends']
+
+    child.pets.append(Pet(name='Bob'))
+    assert dump(child)['pets'] == [{'name': 'Tiger', 'age': 1}, {'name': 'Bob', 'age': 1}]
+    child.pets[1].age = 4
+    assert dump(child)['pets'][1] == {'name': 'Bob', 'age': 4}
+    child.friends['alice'] = Pet(name='Spot')
+    assert set(dump(child)['friends']) == {'bob', 'alice'}
+    child.friends['bob'].name = 'Max'
+    assert dump(child)['friends']['bob']['name'] == 'Max'
+    del child.pet
+    assert 'pet' not in dump(child)
+
+    child.pets = [Pet(name='Rex')]
+    assert isinstance(child.pets, OList)
+    child.pets.pop()
+    assert dump(child)['pets'] == []
+
+
+def test_shared_values():
+    pet = Pet(name='Tiger')
+    first = Child(name='a', pets=OList[Pet]([pet]))
+    second = Child(name='b', pet=pet)
+    dump(first), dump(second)
+    pet.age = 5
+    assert dump(first)['pets'][0]['age'] == 5 and dump(second)['pet']['age'] == 5
+
+
+def test_parents_are_not_kept_alive():
+    pet = Pet(name='Tiger')
+    holders = weakref.WeakSet()
+    for i in range(1000):
+        child = Child(name=str(i), pet=pet)
+        holders.add(child)
+        dump(child)
+    del child
+    gc.collect()
+    assert len(holders) == 0 and len(pet._obdictive_parents) == 0
+    pet.age = 2  # dropped parents are skipped
+    second = SlottedChild(name='b', pets=OList[Pet]([pet]))
+    dump(second)
+    pet.age = 3
+    assert dump(second)['pets'][0]['age'] == 3
+
+
+def test_invalidate():
+    child = load(Child, _CHILD)
+    dump(child)
+    child.toys[0].name = 'kite'  # neither the list nor the toy is tracked
+    assert dump(child)['toys'] == [{'name': 'ball'}]
+    invalidate(child)
+    assert dump(child)['toys'] == [{'name': 'kite'}]
+
+
+def test_untracked_paths():
+    box = Box(pet=Pet(name='Rex'), pets=OList[Pet]([Pet(name='Bob')]))
+    holder = Holder(pets=[Pet(name='Tiger')], box=box)
+    dump(holder)
+    holder.pets[0].age = 9  # through a plain list
+    assert dump(holder)['pets'] == [{'name': 'Tiger', 'age': 9}]
+    holder.box.pet.age = 5  # through an object that is not tracked
+    assert dump(holder)['box']['pet'] == {'name': 'Rex', 'age': 5}
+    holder.box.pets[0].age = 3  # through an `OList` of an object that is not tracked
+    assert dump(holder)['box']['pets'] == [{'name': 'Bob', 'age': 3}]
+    holder.box.pets.append(Pet(name='Spot'))  # the `OList` itself is not tracked
+    assert len(dump(holder)['box']['pets']) == 1
+    invalidate(holder)
+    assert [pet['name'] for pet in dump(holder)['box']['pets']] == ['Bob', 'Spot']
+
+
+def test_tracked_containers_only():
+    assert OList[Pet].append is list.append and ODict[str, Pet].__setitem__ is dict.__setitem__
+    pets = OList[Pet]([Pet(name='Tiger')])
+    child = Child(name='a', pets=pets)
+    assert child.pets is pets and type(pets).append is not list.append  # tracked in place
+    dump(child)
+    pets.append(Pet(name='Bob'))
+    assert len(dump(child)['pets']) == 2
+    copied = pickle.loads(pickle.dumps(child))
+    dump(copied)
+    copied.pets.pop()
+    assert len(dump(copied)['pets']) == 1
+
+
+def test_slots_and_copies():
+    child = load(SlottedChild, {'name': 'Sarah', 'pets': _CHILD['pets'], 'nickname': 'S'})
+    assert not hasattr(child, '__dict__')
+    assert dump(child) is dump(child)
+    child.nickname = 'T'
+    assert dump(child)['nickname'] == 'T'
+
+    for c in (load(Child, _CHILD), child):
+        dump(c)
+        copied = pickle.loads(pickle.dumps(c))
+        assert copied == c and dump(copied) == dump(c)
+        copied = copy.copy(c)
+        copied.name = 'other'
+        assert dump(c)['name'] != 'other'
@@ -0,0 +1,81 @@
+from typing import Dict, List, Tuple
+
+import pytest
+
+from obdictive import Obdictive, OList, load, dump, config, set_serializer
+from obdictive.serialization import echo
+
+
+class Telemetry(Obdictive):
+    samples: List[float]
+    counters: Dict[str, int]
+    tags: Tuple[str, ...] = ()
+
+
+@pytest.fixture
+def trusted():
+    config.trusted_input = True
+    try:
+        yield
+    finally:
+        config.trusted_input = False
+        config.check_trusted_input = True
+
+
+def test_load_passthrough(trusted):
+    samples, counters, tags = [0.5, 1.5], {'a': 1, 'b': 2}, ('x', 'y')
+    telemetry = load(Telemetry, {'samples': samples, 'counters': counters, 'tags': tags})
+    assert telemetry.samples is samples and telemetry.counters is counters and telemetry.tags is tags
+    assert load(OList[int], [1, 2]) == [1, 2]
+
+
+def test_load_converts_mismatches(trusted):
+    samples, counters = [1, 1.5], {'a': True}
+    telemetry = load(Telemetry, {'samples': samples, 'counters': counters, 'tags': ['x']})
+    assert telemetry.samples == [1.0, 1.5] and telemetry.samples is not samples
+    assert type(telemetry.samples[0]) is float and type(telemetry.counters['a']) is int
+    assert telemetry.tags == ('x',)
+
+
+def test_load_unchecked(trusted):
+    config.check_trusted_input = False
+    samples = [1, 2]
+    assert load(List[float], samples) is samples  # not checked, so not converted
+
+
+def test_dump_by_reference(trusted):
+    samples, counters = [0.5, 1.5], {'a': 1}
+    telemetry = Telemetry(samples=samples, counters=counters)
+    dumped = dump(telemetry)
+    assert dumped['samples'] is samples and dumped['counters'] is counters
+    mixed = [1, 'a', 2.5, True]
+    assert dump(mixed) is mixed
+    nested = [[1], [2]]
+    assert dump(nested) == nested and dump(nested) is not nested
+    assert dump([Telemetry(samples=[], counters={})]) == [{'samples': [], 'counters': {}, 'tags': ()}]
+
+
+def test_replaced_serializer(trusted):
+    set_serializer(float, str)
+    try:
+        assert dump([0.5, 1]) == ['0.5', 1]
+    finally:
+        set_serializer(float, echo)
+    values = [0.5]
+    assert dump(values) is values
+
+
+def test_disabled():
+    samples = [0.5]
+    assert load(List[float], samples) is not samples and dump(samples) is not samples
+
+
+def test_compiled_by_reference(trusted):
+    samples = [0.5]
+    config.compile_serializers = True
+    try:
+        assert dump(Telemetry(samples=samples, counters={}))['samples'] is samples
+        config.trusted_input = False
+        assert dump(Telemetry(samples=samples, counters={}))['samples'] is not samples
+    finally:
+        config.compile_serializers = False
@@ -0,0 +1,131 @@
+from typing import Dict, List, Literal, Optional, Tuple, Union
+
+import pytest
+
+from obdictive import Obdictive, serializable, serializer, deserializer, load, dump, json_dumps, json_loads, \
+    binary_dumps, binary_loads
+from obdictive.obdictive_exceptions import ObdictiveDeserializationException
+
+
+class Circle(Obdictive):
+    kind: Literal['circle'] = 'circle'
+    radius: float
+
+
+class Square(Obdictive):
+    kind: Literal['square', 'box'] = 'square'
+    side: float
+
+
+class Cat(Obdictive, slots=True):
+    _tag = 'cat'
+    name: str
+
+
+class Dog(Obdictive):
+    _tag = 'dog'
+    name: str
+    good: bool = True
+
+
+class Puppy(Dog):
+    _tag = 'puppy'
+
+
+class Point(Obdictive):
+    x: int
+    y: int
+
+
+class Label(Obdictive):
+    text: str
+    size: int = 10
+
+
+@serializable
+class Money:
+    def __init__(self, cents: int):
+        self.cents = cents
+
+    @serializer
+    def _serializer(self):
+        return F"{self.cents}c"
+
+    @classmethod
+    @deserializer
+    def _deserializer(cls, value):
+        return cls(int(value[:-1]))
+
+
+class Drawing(Obdictive):
+    shapes: List[Union[Circle, Square]]
+    pets: Dict[str, Union[Cat, Dog, Puppy]] = {}
+    anchor: Optional[Point] = None
+    marks: List[Union[Point, Label, None]] = []
+
+
+def test_optional():
+    assert load(Optional[int], None) is None and load(Optional[int], 3) == 3
+    assert load(Optional[Point], {'x': 1, 'y': 2}) == Point(x=1, y=2)
+    assert load(List[Optional[str]], ['a', None]) == ['a', None]
+    assert load(Optional[Money], "5c").cents == 5 and load(Optional[Money], None) is None
+    with pytest.raises(ObdictiveDeserializationException):
+        load(Optional[int], "3")
+
+
+def test_primitives():
+    assert load(Union[int, str], 1) == 1 and load(Union[int, str], 'a') == 'a'
+    assert load(Union[float, str], 1) == 1.0 and type(load(Union[float, str], 1)) is float
+    assert load(Union[int, List[int]], [1, 2]) == [1, 2]
+    assert load(Union[str, Tuple[int, int]], (1, 2)) == (1, 2)
+    with pytest.raises(ObdictiveDeserializationException):
+        load(Union[int, str], True)
+
+
+def test_literal():
+    assert load(Literal['a', 'b'], 'b') == 'b'
+    with pytest.raises(ObdictiveDeserializationException):
+        load(Literal['a', 'b'], 'c')
+
+
+def test_discriminator_field():
+    drawing = load(Drawing, {'shapes': [{'kind': 'circle', 'radius': 1}, {'kind': 'box', 'side': 2},
+                                        {'radius': 3}]})
+    assert drawing.shapes == [Circle(radius=1.0), Square(kind='box', side=2.0), Circle(radius=3.0)]
+    assert dump(drawing.shapes[0]) == {'kind': 'circle', 'radius': 1.0}
+    with pytest.raises(ObdictiveDeserializationException, match="triangle"):
+        load(Drawing, {'shapes': [{'kind': 'triangle'}]})
+
+
+def test_class_tag():
+    assert dump(Cat(name='Tom')) == {'type': 'cat', 'name': 'Tom'}
+    assert dump(Puppy(name='Rex')) == {'type': 'puppy', 'name': 'Rex', 'good': True}
+    pets = {'a': {'type': 'cat', 'name': 'Tom'}, 'b': {'type': 'puppy', 'name': 'Rex'},
+            'c': {'type': 'dog', 'name': 'Max'}}
+    drawing = load(Drawing, {'shapes': [], 'pets': pets})
+    assert [type(pet) for pet in drawing.pets.values()] == [Cat, Puppy, Dog]
+    assert dump(drawing)['pets'] == {'a': {'type': 'cat', 'name': 'Tom'},
+                                     'b': {'type': 'puppy', 'name': 'Rex', 'good': True},
+                                     'c': {'type': 'dog', 'name': 'Max', 'good': True}}
+    with pytest.raises(ObdictiveDeserializationException):
+        load(Cat, {'type': 'dog', 'name': 'Tom'})
+
+
+def test_structural():
+    union = Union[Point, Label]
+    assert load(union, {'x': 1, 'y': 2}) == Point(x=1, y=2)
+    assert load(union, {'text': 'a'}) == Label(text='a')
+    assert load(union, {'text': 'a', 'size': 3}) == Label(text='a', size=3)
+    assert load(List[Union[Point, Label, None]], [None, {'x': 0, 'y': 0}]) == [None, Point(x=0, y=0)]
+    assert load(Union[Point, Dict[str, int]], {'a': 1}) == {'a': 1}
+    assert load(Union[Point, Dict[str, int]], {'x': 1}) == Point(x=1)
+
+
+def test_formats():
+    drawing = Drawing(shapes=[Circle(radius=1.0), Square(side=2.0)],
+                      pets={'a': Cat(name='Tom'), 'b': Puppy(name='Rex')}, anchor=Point(x=1, y=2),
+                      marks=[Label(text='a'), None])
+    assert load(Drawing, dump(drawing)) == drawing
+    assert json_loads(Drawing, json_dumps(drawing)) == drawing
+    assert json_loads(Drawing, json_dumps(drawing, direct=True)) == drawing
+    assert binary_loads(Drawing, binary_dumps(drawing)) == drawing